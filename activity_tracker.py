@@ -1,68 +1,215 @@
+import time
+# Başlangıç ölçümü için modülün yüklenmeye başladığı an
+STARTUP_T0 = time.perf_counter()
+
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, simpledialog
 import sqlite3
 import json
 import datetime
 from datetime import timedelta
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import pandas as pd # type: ignore
 from collections import defaultdict
 import os
+import sys
 import hashlib
 
+import data_io
+import database
+import instrumentation
+import partitions
+import report_engine
+from database import ChangeSet
+from stats import StatsTracker
+from suggestions import ActivityIndex
+from result_cache import ResultCache
+from background import BackgroundTask, QueryExecutor
+from connections import ConnectionManager
+from write_queue import WriteQueue
+
+# Kayıtlar sekmesinde bellekte tutulan pencere: sayfa boyutu ve en fazla sayfa sayısı
+RECORDS_PAGE_SIZE = 200
+RECORDS_MAX_PAGES = 3
+
+# Etkinlik alanında yazarken gösterilen öneri sayısı
+SUGGESTION_LIMIT = 15
+
+# Kaydırıcılarla seçilen özel rapor aralığı ve başlangıçtaki uzunluğu (gün)
+CUSTOM_PERIOD = "Özel Aralık"
+CUSTOM_RANGE_DAYS = 30
+
+# Önbellekte tutulan rapor metni ve grafik verisi sayısı
+RESULT_CACHE_SIZE = 32
+
+# Aramanın başlaması için son tuş vuruşundan sonra beklenecek süre (ms)
+SEARCH_DEBOUNCE_MS = 250
+
+# Otomatik yedeklemenin açılıştan ne kadar sonra başlayacağı (ms)
+AUTO_BACKUP_DELAY_MS = 2000
+
+# Yazma grubu penceresi: ilk değişiklikten bu kadar sonra ya da bu kadar
+# değişiklik birikince tek bir işlemle onaylanır
+WRITE_BATCH_MS = 200
+WRITE_BATCH_SIZE = 50
+
+# Grafik türlerinin kapsadığı gün sayısı (zaman serisininki seçilen aralıktır)
+CHART_DAYS = {'pie': 30, 'trend': 365, 'heatmap': 7 * 53}
+
+# Zaman serisi grafiğinin aralıkları (gün; None tüm geçmiş) ve çözünürlükleri
+LINE_CHART_RANGES = {"Son 7 Gün": 7, "Son 30 Gün": 30, "Son 90 Gün": 90, "Son 1 Yıl": 365,
+                     "Son 5 Yıl": 5 * 365, "Tüm Zamanlar": None}
+LINE_CHART_RESOLUTIONS = {"Otomatik": None, "Gün": 'day', "Hafta": 'week', "Ay": 'month'}
+ALL_ACTIVITIES = "Tüm Etkinlikler"
+
+# Haftalık ve aylık kovalar kovadaki günlerin ortalamasını gösterir
+LINE_CHART_AXIS_LABELS = {'day': 'Süre (dakika)', 'week': 'Haftalık ortalama (dakika/gün)',
+                          'month': 'Aylık ortalama (dakika/gün)'}
+
+# Etkinlik seçiminde listelenen (en çok kullanılan) etkinlik sayısı
+CHART_ACTIVITY_CHOICES = 50
+
+# Bu kadar noktaya kadar çizgide nokta işaretleri gösterilir
+LINE_MARKER_LIMIT = 60
+
+# Grafik alanı henüz çizilmemişse varsayılan genişlik (piksel)
+DEFAULT_CHART_WIDTH = 1000
+
+# Açılışta yüklenmemesi gereken ağır bağımlılıklar (ilk kullanımda yüklenir)
+DEFERRED_MODULES = ('matplotlib', 'pandas')
+
+# Modül içe aktarmalarının bittiği an
+IMPORTS_DONE = time.perf_counter()
+
 class ActivityTracker:
-    def __init__(self):
+    def __init__(self, startup_profile=False, column_store=False, instrument=False):
+        self.startup_profile = startup_profile
+        self.use_column_store = column_store
+        self.startup_marks = {}
+        instrumentation.recorder.enabled = instrument
+        
         self.root = tk.Tk()
         self.root.title("📊 Günlük Aktivite Takibi")
         self.root.geometry("1200x800")
         self.root.configure(bg='#f0f0f0')
         
         # Veritabanı başlatma
-        self.init_database()
+        if not self.init_database():
+            self.root.destroy()
+            return
         
-        # Parola kontrolü
+        # Parola kontrolü (kullanıcıyı beklerken geçen süre ölçümden düşülür)
+        prompt_start = time.perf_counter()
         if not self.check_password():
             self.root.destroy()
             return
+        self.startup_marks['password_wait'] = time.perf_counter() - prompt_start
             
         # Ana arayüz oluşturma
         self.create_interface()
+        self.startup_marks['interface'] = time.perf_counter()
         
-        # Verileri yükle
-        self.refresh_data()
+        # Veriler pencere ilk kez çizildikten sonra yüklenir
+        self.root.bind('<Map>', self.on_first_map, add='+')
     
-    def init_database(self):
-        """SQLite veritabanını başlat"""
-        self.conn = sqlite3.connect('activities.db')
-        self.cursor = self.conn.cursor()
-        
-        # Tablolar oluştur
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS activities (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date TEXT NOT NULL,
-                activity TEXT NOT NULL,
-                duration INTEGER NOT NULL,
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+    def on_first_map(self, event):
+        """Pencere ilk kez göründüğünde verileri yükle"""
+        if event.widget is not self.root or 'first_paint' in self.startup_marks:
+            return
         
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS settings (
-                key TEXT PRIMARY KEY,
-                value TEXT
-            )
-        ''')
+        self.root.update_idletasks()
+        self.startup_marks['first_paint'] = time.perf_counter()
+        
+        # Gizli sekmeler (rapor, grafik) seçildiklerinde hesaplanır
+        self.refresh_data()
         
-        self.conn.commit()
+        if self.startup_profile:
+            self.report_startup_profile()
+            self.root.after(0, self.on_closing)
+    
+    def report_startup_profile(self):
+        """Açılış süresi ölçümlerini tek satır JSON olarak yazdır"""
+        marks = self.startup_marks
+        waited = marks.get('password_wait', 0)
+        
+        def elapsed_ms(mark):
+            return round((marks[mark] - STARTUP_T0 - waited) * 1000, 1)
+        
+        profile = {
+            'import_ms': round((IMPORTS_DONE - STARTUP_T0) * 1000, 1),
+            'interface_ms': elapsed_ms('interface'),
+            'first_paint_ms': elapsed_ms('first_paint'),
+            'password_wait_ms': round(waited * 1000, 1),
+            'deferred_loaded': [name for name in DEFERRED_MODULES if name in sys.modules],
+        }
+        print(json.dumps(profile))
+    
+    def init_database(self):
+        """SQLite veritabanını başlat (eski şema taşınamazsa False)"""
+        # Eski şemadaki veritabanı taşınırken ilerleme gösterilir
+        window = progress = None
+        if database.needs_migration(database.DB_PATH):
+            window, progress = self.migration_progress()
+        try:
+            # Tek yazma bağlantısı ve arka plan okumaları için bağlantı havuzu
+            self.connections = ConnectionManager(database.DB_PATH, progress=progress)
+        except (database.MigrationError, sqlite3.Error) as e:
+            messagebox.showerror("❌ Hata", f"Veritabanı güncellenemedi: {str(e)}")
+            return False
+        finally:
+            if window is not None:
+                window.destroy()
+        
+        # Tüm yazmalar gruplanarak onaylanır
+        self.writes = WriteQueue(self.root, self.connections, WRITE_BATCH_MS, WRITE_BATCH_SIZE)
+        # Bellekteki istatistikler ve öneri indeksi ilk kullanımda arka planda yüklenir
+        self.stats = StatsTracker()
+        self.activity_index = ActivityIndex()
+        self.index_loading = set()
+        # Uygulamanın kendi yazmalarıyla artan veri nesli
+        self.data_generation = 0
+        # Özel aralık indeksi ilk kullanımda arka planda yüklenir (NumPy gerektirir)
+        self.range_index = None
+        self.range_index_loading = False
+        self.result_cache = ResultCache(RESULT_CACHE_SIZE)
+        self.column_store = None
+        if self.use_column_store:
+            from columnar import ColumnStore
+            self.column_store = ColumnStore()
+        
+        # Okuma sorguları havuzdan bağlantı alan arka plan iş parçacıklarında çalışır
+        self.executor = QueryExecutor(self.root, self.connections, on_busy=self.show_busy)
+        
+        # Sorguların indeksleri kullandığını doğrula
+        for name, (uses_index, plan) in database.check_query_plans(self.conn).items():
+            if not uses_index:
+                print(f"Uyarı: '{name}' sorgusu tüm tabloyu tarıyor: {'; '.join(plan)}")
+        return True
+    
+    @property
+    def conn(self):
+        """Yazma bağlantısı (Tk iş parçacığındaki okumalar da bunu kullanır)"""
+        return self.connections.writer
+    
+    def migration_progress(self):
+        """Şema geçişi için ilerleme penceresi: (pencere, progress(yapılan, toplam))"""
+        window = tk.Toplevel(self.root)
+        window.title("🔄 Veritabanı Güncelleniyor")
+        window.geometry("320x90")
+        tk.Label(window, text="Kayıtlar yeni biçime taşınıyor...").pack(pady=(15, 5))
+        progress_bar = ttk.Progressbar(window, mode='determinate', length=280)
+        progress_bar.pack(padx=20)
+        window.update()
+        
+        def report(done, total):
+            # Geçiş ana iş parçacığında çalışır; pencere her parçadan sonra çizilir
+            progress_bar.config(maximum=max(total, 1), value=done)
+            window.update()
+        return window, report
     
     def check_password(self):
         """Parola kontrolü yap"""
         # Kayıtlı parola var mı kontrol et
-        self.cursor.execute("SELECT value FROM settings WHERE key = 'password'")
-        stored_password = self.cursor.fetchone()
+        stored_password = self.conn.execute(
+            "SELECT value FROM settings WHERE key = 'password'").fetchone()
         
         if stored_password is None:
             # İlk kurulum - parola belirle
@@ -71,9 +218,9 @@ class ActivityTracker:
                                             show='*')
             if password:
                 hashed = hashlib.sha256(password.encode()).hexdigest()
-                self.cursor.execute("INSERT INTO settings (key, value) VALUES ('password', ?)", (hashed,))
-                self.conn.commit()
-                return True
+                self.writes.execute("INSERT INTO settings (key, value) VALUES ('password', ?)", 
+                                    (hashed,))
+                return self.writes.flush()
             return False
         else:
             # Parola kontrolü
@@ -87,6 +234,14 @@ class ActivityTracker:
     
     def create_interface(self):
         """Ana arayüzü oluştur"""
+        # Durum çubuğu: uzun süren arka plan işlerinde ilerleme göstergesi
+        status_frame = ttk.Frame(self.root)
+        status_frame.pack(side='bottom', fill='x', padx=10)
+        self.busy_bar = ttk.Progressbar(status_frame, mode='indeterminate', length=150)
+        self.task_label = ttk.Label(status_frame, text="")
+        self.task_bar = ttk.Progressbar(status_frame, mode='determinate', length=200)
+        self.task_cancel_btn = ttk.Button(status_frame, text="✖ İptal")
+        
         # Notebook (sekmeli arayüz) oluştur
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill='both', expand=True, padx=10, pady=10)
@@ -97,10 +252,62 @@ class ActivityTracker:
         self.create_reports_tab()
         self.create_charts_tab()
         self.create_settings_tab()
+        
+        # Görünümler, bulundukları sekmeler ve yenileme fonksiyonları
+        self.views = {
+            'records': (self.records_frame, self.refresh_records),
+            'daily_summary': (self.input_frame, self.update_daily_summary),
+            'report': (self.reports_frame, self.generate_report),
+            'chart': (self.charts_frame, self.update_chart),
+            'stats': (self.settings_frame, self.update_stats),
+        }
+        self.dirty_views = set()
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+    
+    def on_tab_changed(self, event):
+        """Seçilen sekmenin kirli görünümlerini ve performans panelini yenile"""
+        self.render_visible_views()
+        if self.notebook.select() == str(self.settings_frame):
+            self.update_performance_panel()
+    
+    def show_busy(self, busy):
+        """Arka plan işleri uzun sürdüğünde ilerleme göstergesini aç/kapat"""
+        if not hasattr(self, 'busy_bar'):
+            return
+        if busy:
+            self.busy_bar.pack(side='right', pady=(0, 5))
+            self.busy_bar.start(10)
+        else:
+            self.busy_bar.stop()
+            self.busy_bar.pack_forget()
+    
+    def show_task_progress(self, text, done, total, cancel=None):
+        """Yedekleme gibi uzun işlerin ilerlemesini durum çubuğunda göster
+        
+        cancel verilirse işi iptal eden bir düğme de gösterilir.
+        """
+        if not hasattr(self, 'task_bar'):
+            return
+        if not self.task_bar.winfo_manager():
+            self.task_label.pack(side='left', pady=(0, 5))
+            self.task_bar.pack(side='left', padx=5, pady=(0, 5))
+            if cancel is not None:
+                self.task_cancel_btn.config(command=cancel)
+                self.task_cancel_btn.pack(side='left', pady=(0, 5))
+        self.task_label.config(text=text)
+        self.task_bar.config(maximum=max(total, 1), value=done)
+    
+    def hide_task_progress(self):
+        """Durum çubuğundaki iş ilerlemesini gizle"""
+        if hasattr(self, 'task_bar'):
+            self.task_label.pack_forget()
+            self.task_bar.pack_forget()
+            self.task_cancel_btn.pack_forget()
     
     def create_input_tab(self):
         """Veri girişi sekmesi"""
         input_frame = ttk.Frame(self.notebook)
+        self.input_frame = input_frame
         self.notebook.add(input_frame, text="📝 Etkinlik Ekle")
         
         # Ana başlık
@@ -123,6 +330,7 @@ class ActivityTracker:
         self.activity_var = tk.StringVar()
         self.activity_combo = ttk.Combobox(form_frame, textvariable=self.activity_var, width=30)
         self.activity_combo.grid(row=1, column=1, sticky='w', padx=(10, 0))
+        self.activity_combo.bind('<KeyRelease>', self.on_activity_typed)
         self.load_activity_suggestions()
         
         # Süre girişi
@@ -156,17 +364,19 @@ class ActivityTracker:
     def create_records_tab(self):
         """Kayıtlar sekmesi"""
         records_frame = ttk.Frame(self.notebook)
+        self.records_frame = records_frame
         self.notebook.add(records_frame, text="📋 Kayıtlar")
         
         # Arama ve filtre
         search_frame = ttk.LabelFrame(records_frame, text="🔍 Arama ve Filtre", padding="10")
         search_frame.pack(fill='x', padx=10, pady=5)
         
-        ttk.Label(search_frame, text="Etkinlik Ara:").pack(side='left')
+        ttk.Label(search_frame, text="Etkinlik / Not Ara:").pack(side='left')
         self.search_var = tk.StringVar()
         search_entry = ttk.Entry(search_frame, textvariable=self.search_var, width=30)
         search_entry.pack(side='left', padx=5)
-        search_entry.bind('<KeyRelease>', lambda e: self.filter_records())
+        search_entry.bind('<KeyRelease>', lambda e: self.schedule_search())
+        self.search_after_id = None
         
         ttk.Button(search_frame, text="🔄 Yenile", 
                   command=self.refresh_records).pack(side='right', padx=5)
@@ -185,11 +395,17 @@ class ActivityTracker:
             self.records_tree.column(col, width=150)
         
         # Scrollbar ekle
-        scrollbar = ttk.Scrollbar(tree_frame, orient='vertical', command=self.records_tree.yview)
-        self.records_tree.configure(yscrollcommand=scrollbar.set)
+        self.records_scrollbar = ttk.Scrollbar(tree_frame, orient='vertical', 
+                                               command=self.records_tree.yview)
+        self.records_tree.configure(yscrollcommand=self.on_records_scroll)
         
         self.records_tree.pack(side='left', fill='both', expand=True)
-        scrollbar.pack(side='right', fill='y')
+        self.records_scrollbar.pack(side='right', fill='y')
+        
+        # Görünür pencerenin durumu (anahtar kümesi sayfalaması)
+        self.records_more_before = False
+        self.records_more_after = False
+        self.records_loading = False
         
         # Kayıt işlemleri butonları
         buttons_frame = ttk.Frame(records_frame)
@@ -201,10 +417,13 @@ class ActivityTracker:
                   command=self.delete_record).pack(side='left', padx=5)
         ttk.Button(buttons_frame, text="📤 CSV Dışa Aktar", 
                   command=self.export_csv).pack(side='right', padx=5)
+        ttk.Button(buttons_frame, text="📥 İçe Aktar", 
+                  command=self.import_records).pack(side='right', padx=5)
     
     def create_reports_tab(self):
         """Raporlar sekmesi"""
         reports_frame = ttk.Frame(self.notebook)
+        self.reports_frame = reports_frame
         self.notebook.add(reports_frame, text="📊 Raporlar")
         
         # Filtre seçenekleri
@@ -212,12 +431,34 @@ class ActivityTracker:
         filter_frame.pack(fill='x', padx=10, pady=5)
         
         self.report_period = tk.StringVar(value="Bu Ay")
-        periods = ["Son 7 Gün", "Bu Ay", "Son 30 Gün", "Tüm Zamanlar"]
-        
-        for period in periods:
+        for period in report_engine.PERIODS + (CUSTOM_PERIOD,):
             ttk.Radiobutton(filter_frame, text=period, variable=self.report_period, 
                            value=period, command=self.generate_report).pack(side='left', padx=10)
         
+        # Özel aralık: kaydırıcılar ya da tarih alanları; toplamlar bellekteki indeksten gelir
+        range_frame = ttk.LabelFrame(reports_frame, text="🎚️ Özel Aralık", padding="10")
+        range_frame.pack(fill='x', padx=10, pady=5)
+        range_frame.columnconfigure(1, weight=1)
+        
+        self.range_start_var = tk.StringVar()
+        self.range_end_var = tk.StringVar()
+        self.range_scales = []
+        self.range_updating = False
+        for row, (label, variable) in enumerate((("Başlangıç:", self.range_start_var), 
+                                                 ("Bitiş:", self.range_end_var))):
+            ttk.Label(range_frame, text=label).grid(row=row, column=0, sticky='w')
+            scale = ttk.Scale(range_frame, from_=0, to=1, orient='horizontal',
+                              command=lambda value, row=row: self.on_range_slider(row))
+            # İndeks yüklenene kadar kaydırıcıların gösterecek tarihi yok
+            scale.state(['disabled'])
+            scale.grid(row=row, column=1, sticky='ew', padx=10, pady=2)
+            self.range_scales.append(scale)
+            entry = ttk.Entry(range_frame, textvariable=variable, width=12)
+            entry.grid(row=row, column=2, sticky='w')
+            entry.bind('<Return>', lambda event: self.apply_range_entries())
+        ttk.Button(range_frame, text="✅ Uygula", 
+                  command=self.apply_range_entries).grid(row=0, column=3, rowspan=2, padx=10)
+        
         # Rapor içeriği
         self.report_text = tk.Text(reports_frame, wrap='word', height=25, font=('Courier', 11))
         self.report_text.pack(fill='both', expand=True, padx=10, pady=5)
@@ -236,6 +477,7 @@ class ActivityTracker:
     def create_charts_tab(self):
         """Grafikler sekmesi"""
         charts_frame = ttk.Frame(self.notebook)
+        self.charts_frame = charts_frame
         self.notebook.add(charts_frame, text="📈 Grafikler")
         
         # Grafik türü seçimi
@@ -243,20 +485,61 @@ class ActivityTracker:
         chart_control_frame.pack(fill='x', padx=10, pady=5)
         
         self.chart_type = tk.StringVar(value="line")
-        ttk.Radiobutton(chart_control_frame, text="📈 Çizgi Grafik (Son 30 Gün)", 
+        ttk.Radiobutton(chart_control_frame, text="📈 Zaman Serisi", 
                        variable=self.chart_type, value="line", 
                        command=self.update_chart).pack(side='left', padx=10)
         ttk.Radiobutton(chart_control_frame, text="🥧 Pasta Grafik (Etkinlik Dağılımı)", 
                        variable=self.chart_type, value="pie", 
                        command=self.update_chart).pack(side='left', padx=10)
+        ttk.Radiobutton(chart_control_frame, text="📉 Hareketli Ortalama (Son 1 Yıl)", 
+                       variable=self.chart_type, value="trend", 
+                       command=self.update_chart).pack(side='left', padx=10)
+        ttk.Radiobutton(chart_control_frame, text="🗓️ Takvim Isı Haritası", 
+                       variable=self.chart_type, value="heatmap", 
+                       command=self.update_chart).pack(side='left', padx=10)
+        
+        # Zaman serisinin aralığı, çözünürlüğü ve etkinliği
+        series_frame = ttk.LabelFrame(charts_frame, text="📅 Zaman Serisi", padding="10")
+        series_frame.pack(fill='x', padx=10, pady=5)
+        
+        ttk.Label(series_frame, text="Aralık:").pack(side='left')
+        self.line_range = tk.StringVar(value="Son 30 Gün")
+        range_combo = ttk.Combobox(series_frame, textvariable=self.line_range, width=14,
+                                   values=list(LINE_CHART_RANGES), state='readonly')
+        range_combo.pack(side='left', padx=(5, 15))
+        
+        ttk.Label(series_frame, text="Çözünürlük:").pack(side='left')
+        self.line_resolution = tk.StringVar(value="Otomatik")
+        resolution_combo = ttk.Combobox(series_frame, textvariable=self.line_resolution, width=10,
+                                        values=list(LINE_CHART_RESOLUTIONS), state='readonly')
+        resolution_combo.pack(side='left', padx=(5, 15))
+        
+        ttk.Label(series_frame, text="Etkinlik:").pack(side='left')
+        self.line_activity = tk.StringVar(value=ALL_ACTIVITIES)
+        activity_combo = ttk.Combobox(series_frame, textvariable=self.line_activity, width=25,
+                                      state='readonly', postcommand=lambda: activity_combo.config(
+                                          values=[ALL_ACTIVITIES] + self.activity_index.complete(
+                                              '', CHART_ACTIVITY_CHOICES)))
+        activity_combo.pack(side='left', padx=5)
+        
+        for combo in (range_combo, resolution_combo, activity_combo):
+            combo.bind('<<ComboboxSelected>>', self.on_line_options_changed)
         
         # Grafik alanı
         self.chart_frame = ttk.Frame(charts_frame)
         self.chart_frame.pack(fill='both', expand=True, padx=10, pady=5)
+        
+        # Grafik türü başına bir kez oluşturulup yeniden kullanılan Figure/tuval
+        self.charts = {}
+        
+        # Analizler için yoğun günlük matris; veri değişince yeniden yüklenir
+        self.analytics_cache = None
+        self.chart_message_label = tk.Label(self.chart_frame, text="", font=('Arial', 12))
     
     def create_settings_tab(self):
         """Ayarlar sekmesi"""
         settings_frame = ttk.Frame(self.notebook)
+        self.settings_frame = settings_frame
         self.notebook.add(settings_frame, text="⚙️ Ayarlar")
         
         # Yedekleme bölümü
@@ -282,33 +565,95 @@ class ActivityTracker:
         self.stats_label = tk.Label(stats_frame, text="", justify='left', font=('Arial', 10))
         self.stats_label.pack()
         
-        self.update_stats()
+        # Performans ölçümü
+        performance_frame = ttk.LabelFrame(settings_frame, text="⏱️ Performans", padding="20")
+        performance_frame.pack(fill='both', expand=True, padx=20, pady=10)
+        
+        controls = ttk.Frame(performance_frame)
+        controls.pack(fill='x', pady=(0, 5))
+        self.instrument_var = tk.BooleanVar(value=instrumentation.recorder.enabled)
+        ttk.Checkbutton(controls, text="Ölçümü aç", variable=self.instrument_var,
+                        command=self.toggle_instrumentation).pack(side='left', padx=5)
+        ttk.Button(controls, text="🔄 Yenile", 
+                  command=self.update_performance_panel).pack(side='left', padx=5)
+        ttk.Button(controls, text="🧹 Sıfırla", 
+                  command=self.reset_performance).pack(side='left', padx=5)
+        ttk.Label(controls, text=f"Yavaş işlemler (> {instrumentation.recorder.slow_ms} ms): "
+                                 f"{instrumentation.recorder.log_path}").pack(side='left', padx=10)
+        self.cache_label = ttk.Label(controls, text="")
+        self.cache_label.pack(side='right', padx=5)
+        
+        columns = ('calls', 'rows', 'mean', 'p50', 'p95', 'p99', 'max')
+        headings = ('Çağrı', 'Satır', 'Ort. ms', 'p50', 'p95', 'p99', 'En uzun')
+        self.performance_tree = ttk.Treeview(performance_frame, columns=columns, height=8)
+        self.performance_tree.heading('#0', text='İşlem')
+        self.performance_tree.column('#0', width=420)
+        for column, heading in zip(columns, headings):
+            self.performance_tree.heading(column, text=heading)
+            self.performance_tree.column(column, width=70, anchor='e')
+        self.performance_tree.pack(fill='both', expand=True)
+    
+    def toggle_instrumentation(self):
+        """Ölçümü Ayarlar'daki onay kutusuna göre aç veya kapat"""
+        instrumentation.recorder.enabled = self.instrument_var.get()
+        self.update_performance_panel()
+    
+    def reset_performance(self):
+        """Toplanan ölçümleri temizle"""
+        instrumentation.recorder.reset()
+        self.update_performance_panel()
+    
+    def update_performance_panel(self):
+        """Performans tablosunu toplanan ölçümlerle doldur"""
+        self.performance_tree.delete(*self.performance_tree.get_children())
+        for name, calls, rows, mean, p50, p95, p99, longest in instrumentation.recorder.snapshot():
+            self.performance_tree.insert('', 'end', text=name, values=(
+                calls, rows, f"{mean:.1f}", f"{p50:.1f}", f"{p95:.1f}", f"{p99:.1f}", 
+                f"{longest:.1f}"))
+        hits, misses, evictions, size = self.result_cache.stats()
+        self.cache_label.config(text=f"Sonuç önbelleği: {hits} isabet, {misses} ıskalama, "
+                                     f"{evictions} atılan, {size}/{self.result_cache.maxsize} girdi")
     
     def load_activity_suggestions(self):
-        """Önceki etkinliklerden öneriler yükle"""
-        self.cursor.execute("SELECT DISTINCT activity FROM activities ORDER BY activity")
-        activities = [row[0] for row in self.cursor.fetchall()]
-        self.activity_combo['values'] = activities
+        """Önceki etkinliklerden yazılan öneke uyan önerileri göster"""
+        if not self.activity_index.loaded:
+            self.load_index('activity_index', ActivityIndex, self.load_activity_suggestions)
+        self.activity_combo['values'] = self.activity_index.complete(
+            self.activity_var.get(), SUGGESTION_LIMIT)
+    
+    def on_activity_typed(self, event):
+        """Yazdıkça önerileri süz (listede gezinme tuşları hariç)"""
+        if event.keysym in ('Up', 'Down', 'Return', 'Escape', 'Tab'):
+            return
+        self.load_activity_suggestions()
     
     def add_activity(self):
         """Yeni etkinlik ekle"""
         if not self.activity_var.get() or not self.duration_var.get():
             messagebox.showwarning("⚠️ Uyarı", "Etkinlik adı ve süre alanları zorunludur!")
             return
+        if self.writes_held():
+            return
         
         try:
-            self.cursor.execute('''
-                INSERT INTO activities (date, activity, duration, notes)
-                VALUES (?, ?, ?, ?)
-            ''', (self.date_var.get(), self.activity_var.get(), 
-                  self.duration_var.get(), self.notes_text.get('1.0', 'end-1c')))
+            date, activity, duration = (self.date_var.get(), self.activity_var.get(), 
+                                        self.duration_var.get())
+            day = database.day_number(date)
+            date = database.day_string(day)
+            # Görünümler kayıt onaylandıktan sonra yenilenir (diğer bağlantılar
+            # onaylanmamış veriyi göremez)
+            def committed():
+                messagebox.showinfo("✅ Başarılı", "Etkinlik başarıyla kaydedildi!")
+                self.refresh_data(ChangeSet().insert((record_id, date, activity, duration)))
             
-            self.conn.commit()
-            messagebox.showinfo("✅ Başarılı", "Etkinlik başarıyla kaydedildi!")
+            record_id = self.writes.execute('''
+                INSERT INTO activity_entries (day, activity_id, duration, notes)
+                VALUES (?, ?, ?, ?)
+            ''', (day, database.activity_id(self.conn, activity), duration, 
+                  self.notes_text.get('1.0', 'end-1c')),
+                on_commit=committed, on_error=self.show_write_error).lastrowid
             
             self.clear_form()
-            self.refresh_data()
-            self.load_activity_suggestions()
             
         except Exception as e:
             messagebox.showerror("❌ Hata", f"Kayıt sırasında hata oluştu: {str(e)}")
@@ -324,39 +669,222 @@ class ActivityTracker:
     def update_daily_summary(self):
         """Günlük özeti güncelle"""
         today = datetime.date.today().strftime('%Y-%m-%d')
-        self.cursor.execute("SELECT SUM(duration) FROM activities WHERE date = ?", (today,))
-        total = self.cursor.fetchone()[0] or 0
-        
+        self.executor.submit('daily_summary', lambda conn: self.query_daily_total(conn, today),
+                             self.show_daily_summary)
+    
+    def query_daily_total(self, conn, date):
+        """Verilen günün toplam süresi (arka planda çalışır)"""
+        return sum(row[0] or 0 for row in partitions.query(
+            conn, "SELECT SUM(total_minutes) FROM {db}.daily_totals WHERE day = ?", 
+            (database.day_number(date),), start_date=date, end_date=date))
+    
+    def show_daily_summary(self, total):
+        """Günlük özet etiketini güncelle"""
         hours = total // 60
         minutes = total % 60
         self.daily_summary_label.config(text=f"📊 Bugünkü Toplam: {hours}s {minutes}dk")
     
-    def refresh_data(self):
-        """Tüm verileri yenile"""
-        self.refresh_records()
-        self.update_daily_summary()
-        self.generate_report()
-        self.update_chart()
-        self.update_stats()
+    def refresh_data(self, change=None):
+        """Değişiklikten etkilenen görünümleri yenile
+        
+        change verilmezse her şeyin değiştiği varsayılır. Görünür sekmedeki
+        görünümler hemen, gizli sekmelerdekiler seçildiklerinde yenilenir.
+        """
+        if change is None:
+            change = ChangeSet.everything()
+        with instrumentation.timed("refresh_data"):
+            self.stats.apply(change)
+            self.activity_index.apply(change)
+            if self.range_index is not None:
+                self.range_index.apply(change)
+            self.load_activity_suggestions()
+            if change.full:
+                self.result_cache.clear()
+            if self.column_store is not None:
+                self.column_store.apply(change)
+            self.data_generation += 1
+            self.dirty_views.update(self.affected_views(change))
+            self.render_visible_views()
+    
+    def data_version(self):
+        """Önbellek anahtarları için verinin sürümü
+        
+        Uygulamanın kendi yazmaları data_generation'ı, başka bağlantıların
+        (içe aktarma, geri yükleme, diğer süreçler) onayladıkları ise ana
+        bağlantının PRAGMA data_version değerini artırır.
+        """
+        return self.data_generation, self.conn.execute("PRAGMA data_version").fetchone()[0]
+    
+    def affected_views(self, change):
+        """Değişiklikten etkilenen görünümlerin adları"""
+        today = datetime.date.today()
+        today_str = today.strftime('%Y-%m-%d')
+        
+        views = {'records', 'stats'}
+        if change.touches_range(today_str, today_str):
+            views.add('daily_summary')
+        
+        # Rapordaki seri bölümü tüm geçmişe bağlı olduğundan rapor her zaman yenilenir
+        views.add('report')
+        
+        days = self.chart_days(self.chart_type.get())
+        chart_start = None if days is None else today - timedelta(days=days - 1)
+        if chart_start is None or change.touches_range(chart_start.strftime('%Y-%m-%d'), today_str):
+            views.add('chart')
+        return views
+    
+    def render_visible_views(self):
+        """Seçili sekmedeki kirli görünümleri yeniden hesapla"""
+        current = self.notebook.select()
+        for name in list(self.dirty_views):
+            frame, render = self.views[name]
+            if str(frame) == current:
+                self.dirty_views.discard(name)
+                with instrumentation.timed(f"görünüm: {name}"):
+                    render()
     
     def refresh_records(self):
         """Kayıtları yenile"""
-        for item in self.records_tree.get_children():
-            self.records_tree.delete(item)
-        
-        query = "SELECT id, date, activity, duration, notes FROM activities ORDER BY date DESC, id DESC"
-        params = []
+        # Yalnızca ilk sayfa yüklenir, diğerleri kaydırdıkça gelir. Devam eden
+        # bir arama veya sayfa yüklemesi varsa kesilir.
+        self.executor.cancel('records_page')
+        self.records_loading = False
+        search = self.search_var.get()
+        self.executor.submit('records', lambda conn: self.fetch_records_page(conn, search),
+                             self.show_first_records_page)
+    
+    def show_first_records_page(self, rows):
+        """İlk sayfayı Kayıtlar görünümüne yerleştir"""
+        self.records_tree.delete(*self.records_tree.get_children())
+        self.insert_record_rows(rows)
+        self.records_more_before = False
+        self.records_more_after = len(rows) == RECORDS_PAGE_SIZE
+    
+    def fetch_records_page(self, conn, search, key=None, older=True):
+        """Bir sayfa kaydı yeniden eskiye sıralı olarak getir (arka planda çalışır)"""
+        # Aramasız sayfalar sütunlu depodan, aramalar FTS indeksinden gelir
+        store = None if database.fts_query(search) else self.ready_column_store(conn)
+        if store is not None:
+            rows = store.records_page(conn, key, older, RECORDS_PAGE_SIZE)
+        else:
+            rows = partitions.records_page(conn, search, key, older, RECORDS_PAGE_SIZE)
+        return rows if older else rows[::-1]
+    
+    def ready_column_store(self, conn):
+        """Kullanılabilir sütunlu depo ya da None (arka planda çalışır)
+        
+        Depo ilk kullanımda bu işçinin bağlantısıyla yüklenir; başka bir işçi
+        yüklerken veya depo kapalıyken SQLite sorgularına dönülür.
+        """
+        store = self.column_store
+        if store is None:
+            return None
+        if not store.loaded and not store.load(conn):
+            return None
+        return store if store.loaded and store.usable else None
+    
+    def insert_record_rows(self, rows, index='end'):
+        """Satırları Treeview'a kayıt id'si ile ekle"""
+        for offset, row in enumerate(rows):
+            position = index + offset if index != 'end' else 'end'
+            self.records_tree.insert('', position, iid=str(row[0]), values=row)
+    
+    def record_key(self, item):
+        """Treeview öğesinin (tarih, id) sayfalama anahtarı"""
+        values = self.records_tree.item(item, 'values')
+        return values[1], int(values[0])
+    
+    def on_records_scroll(self, first, last):
+        """Kaydırma çubuğunu güncelle, pencere kenarına yaklaşınca sayfa yükle"""
+        self.records_scrollbar.set(first, last)
+        if self.records_loading:
+            return
         
-        if self.search_var.get():
-            query = "SELECT id, date, activity, duration, notes FROM activities WHERE activity LIKE ? ORDER BY date DESC, id DESC"
-            params = [f"%{self.search_var.get()}%"]
+        if float(last) > 0.9 and self.records_more_after:
+            self.request_records_page(older=True)
+        elif float(first) < 0.1 and self.records_more_before:
+            self.request_records_page(older=False)
+    
+    def request_records_page(self, older):
+        """Pencerenin kenarındaki kaydın ötesindeki sayfayı arka planda iste"""
+        children = self.records_tree.get_children()
+        if not children:
+            return
         
-        self.cursor.execute(query, params)
-        for row in self.cursor.fetchall():
-            self.records_tree.insert('', 'end', values=row)
+        self.records_loading = True
+        edge = children[-1] if older else children[0]
+        search, key = self.search_var.get(), self.record_key(edge)
+        if older:
+            callback = self.load_older_records
+        else:
+            callback = self.load_newer_records
+        self.executor.submit('records_page', 
+                             lambda conn: self.fetch_records_page(conn, search, key, older),
+                             callback, on_error=lambda e: setattr(self, 'records_loading', False))
+    
+    def load_older_records(self, rows):
+        """Pencerenin altına bir sonraki (daha eski) sayfayı ekle"""
+        try:
+            children = self.records_tree.get_children()
+            if not children:
+                return
+            self.insert_record_rows(rows)
+            self.records_more_after = len(rows) == RECORDS_PAGE_SIZE
+            
+            # Pencere büyüdüyse baştaki sayfayı bırak
+            excess = len(children) + len(rows) - RECORDS_PAGE_SIZE * RECORDS_MAX_PAGES
+            if excess > 0:
+                self.trim_records(children[:excess])
+                self.records_more_before = True
+        finally:
+            self.records_loading = False
+    
+    def load_newer_records(self, rows):
+        """Pencerenin üstüne bir önceki (daha yeni) sayfayı ekle"""
+        try:
+            children = self.records_tree.get_children()
+            if not children:
+                return
+            anchor = self.top_visible_record(children)
+            self.insert_record_rows(rows, 0)
+            self.records_more_before = len(rows) == RECORDS_PAGE_SIZE
+            self.keep_records_anchor(anchor)
+            
+            # Pencere büyüdüyse sondaki sayfayı bırak
+            excess = len(children) + len(rows) - RECORDS_PAGE_SIZE * RECORDS_MAX_PAGES
+            if excess > 0:
+                self.records_tree.delete(*children[-excess:])
+                self.records_more_after = True
+        finally:
+            self.records_loading = False
+    
+    def trim_records(self, items):
+        """Görünür satırı yerinde tutarak pencerenin başından öğeleri sil"""
+        anchor = self.top_visible_record(self.records_tree.get_children())
+        self.records_tree.delete(*items)
+        if self.records_tree.exists(anchor):
+            self.keep_records_anchor(anchor)
+    
+    def top_visible_record(self, children):
+        """Görünümün en üstündeki öğe"""
+        index = int(self.records_tree.yview()[0] * len(children))
+        return children[min(index, len(children) - 1)]
+    
+    def keep_records_anchor(self, anchor):
+        """Verilen öğeyi görünümün en üstüne kaydır"""
+        total = len(self.records_tree.get_children())
+        if total:
+            self.records_tree.yview_moveto(self.records_tree.index(anchor) / total)
+    
+    def schedule_search(self):
+        """Aramayı yazma duraklayana kadar ertele"""
+        if self.search_after_id is not None:
+            self.root.after_cancel(self.search_after_id)
+        self.search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self.filter_records)
     
     def filter_records(self):
         """Kayıtları filtrele"""
+        self.search_after_id = None
         self.refresh_records()
     
     def edit_record(self):
@@ -365,9 +893,16 @@ class ActivityTracker:
         if not selected:
             messagebox.showwarning("⚠️ Uyarı", "Düzenlemek için bir kayıt seçin!")
             return
+        if self.writes_held():
+            return
         
-        item = self.records_tree.item(selected[0])
-        record_id, date, activity, duration, notes = item['values']
+        # Ağaçtaki değerler ttk'de sayıya dönüşebilir (ör. '007' -> 7); asıl satır veritabanından
+        record_id = self.records_tree.item(selected[0])['values'][0]
+        row = database.entry_row(self.conn, record_id)
+        if row is None:
+            self.show_missing_record(selected[0])
+            return
+        record_id, date, activity, duration, notes = row
         
         # Düzenleme penceresi
         edit_window = tk.Toplevel(self.root)
@@ -390,20 +925,28 @@ class ActivityTracker:
         ttk.Label(edit_window, text="Notlar:").grid(row=3, column=0, sticky='nw', padx=10, pady=5)
         notes_text = tk.Text(edit_window, width=30, height=5)
         notes_text.grid(row=3, column=1, padx=10, pady=5)
-        notes_text.insert('1.0', notes)
+        notes_text.insert('1.0', notes or '')
         
         def save_changes():
+            if self.writes_held():
+                return
             try:
-                self.cursor.execute('''
-                    UPDATE activities SET date=?, activity=?, duration=?, notes=?
-                    WHERE id=?
-                ''', (date_var.get(), activity_var.get(), duration_var.get(),
-                      notes_text.get('1.0', 'end-1c'), record_id))
+                day = database.day_number(date_var.get())
+                change = ChangeSet().update(
+                    (record_id, date, activity, duration),
+                    (record_id, database.day_string(day), activity_var.get(), duration_var.get()))
+                
+                def committed():
+                    messagebox.showinfo("✅ Başarılı", "Kayıt güncellendi!")
+                    self.refresh_data(change)
                 
-                self.conn.commit()
-                messagebox.showinfo("✅ Başarılı", "Kayıt güncellendi!")
+                self.writes.execute('''
+                    UPDATE activity_entries SET day=?, activity_id=?, duration=?, notes=?
+                    WHERE id=?
+                ''', (day, database.activity_id(self.conn, activity_var.get()), duration_var.get(),
+                      notes_text.get('1.0', 'end-1c'), record_id),
+                    on_commit=committed, on_error=self.show_write_error)
                 edit_window.destroy()
-                self.refresh_data()
                 
             except Exception as e:
                 messagebox.showerror("❌ Hata", f"Güncelleme hatası: {str(e)}")
@@ -416,37 +959,158 @@ class ActivityTracker:
         if not selected:
             messagebox.showwarning("⚠️ Uyarı", "Silmek için bir kayıt seçin!")
             return
+        if self.writes_held():
+            return
         
         if messagebox.askyesno("🗑️ Silme Onayı", "Bu kaydı silmek istediğinizden emin misiniz?"):
-            item = self.records_tree.item(selected[0])
-            record_id = item['values'][0]
+            record_id = self.records_tree.item(selected[0])['values'][0]
+            row = database.entry_row(self.conn, record_id)
+            if row is None:
+                self.show_missing_record(selected[0])
+                return
+            change = ChangeSet().delete(row[:4])
             
-            self.cursor.execute("DELETE FROM activities WHERE id=?", (record_id,))
-            self.conn.commit()
+            def committed():
+                messagebox.showinfo("✅ Başarılı", "Kayıt silindi!")
+                self.refresh_data(change)
             
-            messagebox.showinfo("✅ Başarılı", "Kayıt silindi!")
-            self.refresh_data()
+            try:
+                self.writes.execute("DELETE FROM activity_entries WHERE id=?", (record_id,),
+                                    on_commit=committed, on_error=self.show_write_error)
+            except Exception as e:
+                messagebox.showerror("❌ Hata", f"Silme hatası: {str(e)}")
+    
+    def show_missing_record(self, item):
+        """Ana veritabanında olmayan kaydı bildir: arşivlenmiş yılda ya da silinmiş"""
+        year = str(self.records_tree.item(item, 'values')[1])[:4]
+        if year.isdigit() and int(year) in dict(partitions.list_partitions(self.conn)):
+            messagebox.showwarning("⚠️ Uyarı", f"{year} yılı arşivlenmiş; arşivdeki kayıtlar "
+                                   "değiştirilemez. Önce yılı geri alın:\n"
+                                   f"python partitions.py merge {year}")
+            return
+        messagebox.showwarning("⚠️ Uyarı", "Kayıt bulunamadı, liste yenileniyor.")
+        self.refresh_records()
+    
+    def writes_held(self):
+        """Yazmalar bekletiliyorsa (ör. içe aktarma sürerken) uyar ve True döndür"""
+        if self.writes.held is None:
+            return False
+        messagebox.showwarning("⏳ Bekleyin", f"{self.writes.held} sürerken değişiklik "
+                               "kaydedilemez. İşlem bitince tekrar deneyin.")
+        return True
+    
+    def show_write_error(self, error):
+        """Onaylanamayan yazma grubunu bildir"""
+        messagebox.showerror("❌ Hata", f"Değişiklikler kaydedilemedi: {str(error)}")
+        self.refresh_data()
     
     def export_csv(self):
         """Kayıtları CSV olarak dışa aktar"""
-        filename = filedialog.asksaveasfilename(
-            defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv")],
-            title="CSV Dosyasını Kaydet"
+        # Filtre seçenekleri penceresi
+        export_window = tk.Toplevel(self.root)
+        export_window.title("📤 CSV Dışa Aktar")
+        export_window.geometry("380x230")
+        
+        ttk.Label(export_window, text="Başlangıç (YYYY-AA-GG):").grid(row=0, column=0, sticky='w', padx=10, pady=5)
+        start_var = tk.StringVar()
+        ttk.Entry(export_window, textvariable=start_var).grid(row=0, column=1, padx=10, pady=5)
+        
+        ttk.Label(export_window, text="Bitiş (YYYY-AA-GG):").grid(row=1, column=0, sticky='w', padx=10, pady=5)
+        end_var = tk.StringVar()
+        ttk.Entry(export_window, textvariable=end_var).grid(row=1, column=1, padx=10, pady=5)
+        
+        ttk.Label(export_window, text="Etkinlik:").grid(row=2, column=0, sticky='w', padx=10, pady=5)
+        activity_var = tk.StringVar()
+        ttk.Entry(export_window, textvariable=activity_var).grid(row=2, column=1, padx=10, pady=5)
+        
+        compress_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(export_window, text="gzip ile sıkıştır (.csv.gz)", 
+                        variable=compress_var).grid(row=3, column=1, sticky='w', padx=10, pady=5)
+        
+        def start_export():
+            compress = compress_var.get()
+            filename = filedialog.asksaveasfilename(
+                defaultextension=".csv.gz" if compress else ".csv",
+                filetypes=[("CSV files", "*.csv.gz" if compress else "*.csv")],
+                title="CSV Dosyasını Kaydet"
+            )
+            if not filename:
+                return
+            export_window.destroy()
+            
+            filters = dict(start_date=start_var.get().strip() or None, 
+                           end_date=end_var.get().strip() or None,
+                           activity=activity_var.get().strip() or None)
+            
+            def export(report):
+                # Arka plan iş parçacığı havuzdan ödünç aldığı bağlantıyla okur
+                with self.connections.reader() as conn:
+                    return data_io.export_csv(conn, filename, compress=compress, 
+                                              progress=report, **filters)
+            
+            def done(written):
+                self.hide_task_progress()
+                messagebox.showinfo("✅ Başarılı", f"Veriler {filename} dosyasına aktarıldı!")
+            
+            def failed(e):
+                self.hide_task_progress()
+                if isinstance(e, data_io.ExportCancelled):
+                    return
+                messagebox.showerror("❌ Hata", f"Dışa aktarma hatası: {str(e)}")
+            
+            # Bekleyen yazmalar dışa aktarılan anlık görüntüye dahil olsun
+            self.writes.flush()
+            task = BackgroundTask(self.root, export, done, failed,
+                                  lambda done, total: self.show_task_progress(
+                                      "📤 Dışa aktarılıyor", done, total, cancel=task.cancel))
+        
+        ttk.Button(export_window, text="📤 Dışa Aktar", command=start_export).grid(row=4, column=1, pady=15)
+    
+    def import_records(self):
+        """CSV veya JSON Lines dosyasından kayıtları toplu içe aktar"""
+        filename = filedialog.askopenfilename(
+            filetypes=[("CSV / JSON Lines", "*.csv *.csv.gz *.jsonl *.jsonl.gz *.ndjson"),
+                       ("All files", "*.*")],
+            title="İçe Aktarılacak Dosyayı Seç"
         )
+        if not filename:
+            return
         
-        if filename:
+        def import_(report):
+            # Toplu ekleme kendi yazma bağlantısında, tek bir işlem içinde yapılır
+            conn = database.connect(database.DB_PATH)
             try:
-                self.cursor.execute("SELECT date, activity, duration, notes FROM activities ORDER BY date DESC")
-                data = self.cursor.fetchall()
-                
-                df = pd.DataFrame(data, columns=['Tarih', 'Etkinlik', 'Süre (dk)', 'Notlar'])
-                df.to_csv(filename, index=False, encoding='utf-8-sig')
-                
-                messagebox.showinfo("✅ Başarılı", f"Veriler {filename} dosyasına aktarıldı!")
-                
-            except Exception as e:
-                messagebox.showerror("❌ Hata", f"Dışa aktarma hatası: {str(e)}")
+                return data_io.import_file(conn, filename, progress=report)
+            finally:
+                conn.close()
+        
+        def done(result):
+            self.writes.release()
+            self.hide_task_progress()
+            message = f"{result.inserted} kayıt eklendi."
+            if result.rejected:
+                message += f"\n{result.rejected} satır reddedildi:\n"
+                message += "\n".join(f"  Satır {line_no}: {reason}" 
+                                     for line_no, reason in result.rejects[:10])
+                if result.rejected > 10:
+                    message += "\n  ..."
+            messagebox.showinfo("✅ İçe Aktarma Tamamlandı", message)
+            if result.inserted:
+                self.refresh_data()
+        
+        def failed(e):
+            self.writes.release()
+            self.hide_task_progress()
+            if isinstance(e, data_io.ImportCancelled):
+                return
+            messagebox.showerror("❌ Hata", f"İçe aktarma hatası: {str(e)}")
+        
+        # Açık yazma işlemi içe aktarmanın yazma kilidini engellemesin; içe
+        # aktarma kilidi tutarken de Tk'den yazılıp arayüz donmasın
+        self.writes.hold("İçe aktarma")
+        task = BackgroundTask(self.root, import_, done, failed,
+                              lambda done, total: self.show_task_progress(
+                                  "📥 İçe aktarılıyor", done, total, cancel=task.cancel))
     
     def generate_report(self):
         """Rapor oluştur"""
@@ -454,55 +1118,160 @@ class ActivityTracker:
         
         # Tarih aralığını belirle
         today = datetime.date.today()
-        if period == "Son 7 Gün":
-            start_date = today - timedelta(days=7)
-        elif period == "Bu Ay":
-            start_date = today.replace(day=1)
-        elif period == "Son 30 Gün":
-            start_date = today - timedelta(days=30)
-        else:  # Tüm Zamanlar
-            start_date = datetime.date(2000, 1, 1)
-        
-        # Veri çek
-        self.cursor.execute('''
-            SELECT activity, SUM(duration) as total_duration, COUNT(*) as count
-            FROM activities 
-            WHERE date >= ? 
-            GROUP BY activity 
-            ORDER BY total_duration DESC
-        ''', (start_date.strftime('%Y-%m-%d'),))
-        
-        activities_data = self.cursor.fetchall()
-        
-        # Rapor metni oluştur
-        report = f"📊 {period} Aktivite Raporu\n"
-        report += "=" * 50 + "\n\n"
-        
-        if not activities_data:
-            report += "Bu dönemde hiç etkinlik kaydı bulunamadı.\n"
-        else:
-            total_time = sum([row[1] for row in activities_data])
-            total_days = (today - start_date).days + 1
+        start_date = report_engine.period_start(period, today)
+        
+        if period == CUSTOM_PERIOD:
+            self.executor.cancel('report')
+            self.show_range_report()
+            return
+        
+        def show(result):
+            activities_data, summary = result
+            report = report_engine.format_report(period, start_date, today, activities_data)
+            report += report_engine.format_analytics(summary)
+            self.show_report(report)
+        
+        # Veri değişmediyse önceki sorgu sonucu yeniden kullanılır; metin
+        # (rapor tarihi dahil) her seferinde yeniden yazılır
+        key = ('report', period, today, self.data_version())
+        result = self.result_cache.get(key)
+        if result is not None:
+            self.executor.cancel('report')
+            show(result)
+            return
+        
+        # Veri arka planda çekilir, rapor sonuç gelince yazılır
+        def query(conn):
+            store = self.ready_column_store(conn)
+            if store is not None:
+                rows = store.activity_totals(start_date.strftime('%Y-%m-%d'))
+            else:
+                rows = report_engine.query_report(conn, start_date)
+            return rows, report_engine.query_analytics(conn, today)
+        
+        def done(result):
+            self.result_cache.put(key, result)
+            show(result)
+        
+        self.executor.submit('report', query, done)
+    
+    def range_index_ready(self):
+        """Aralık indeksi kullanılabilir mi; değilse arka planda yüklemeyi başlat
+        
+        Yükleme tüm günlük toplamları (arşiv bölümleri dahil) okuduğundan bir
+        okuma bağlantısında yapılır; bu sırada kaydırıcılar kapalıdır.
+        Yükleme sürerken onaylanan yazmalar anlık görüntüye girmiş de
+        olabilir girmemiş de; veri nesli değiştiyse indeks atılıp yeniden
+        yüklenir.
+        """
+        if self.range_index is not None and self.range_index.loaded:
+            return True
+        if not self.range_index_loading:
+            self.range_index_loading = True
+            for scale in self.range_scales:
+                scale.state(['disabled'])
+            generation = self.data_generation
             
-            report += f"📅 Rapor Dönemi: {start_date.strftime('%d.%m.%Y')} - {today.strftime('%d.%m.%Y')}\n"
-            report += f"📊 Toplam Süre: {total_time//60}s {total_time%60}dk\n"
-            report += f"📈 Günlük Ortalama: {total_time//total_days//60}s {(total_time//total_days)%60}dk\n"
-            report += f"🎯 Toplam Etkinlik Türü: {len(activities_data)}\n\n"
+            def load(conn):
+                from range_index import RangeIndex
+                return RangeIndex().load(conn)
             
-            report += "🏆 Etkinlik Detayları:\n"
-            report += "-" * 30 + "\n"
+            def failed(e):
+                self.range_index_loading = False
+                self.show_report(f"Aralık indeksi yüklenemedi: {str(e)}")
             
-            for i, (activity, duration, count) in enumerate(activities_data, 1):
-                percentage = (duration / total_time) * 100
-                avg_session = duration / count
-                report += f"{i:2d}. {activity}\n"
-                report += f"    ⏱️  Toplam: {duration//60}s {duration%60}dk ({percentage:.1f}%)\n"
-                report += f"    📊 Oturum: {count} kez\n"
-                report += f"    📈 Ortalama: {avg_session//60:.0f}s {avg_session%60:.0f}dk\n\n"
-        
-        report += f"\n📝 Rapor Tarihi: {datetime.datetime.now().strftime('%d.%m.%Y %H:%M')}\n"
+            self.executor.submit('range_index', load,
+                                 lambda index: self.on_range_index_loaded(index, generation),
+                                 on_error=failed)
+        return False
+    
+    def on_range_index_loaded(self, index, generation):
+        """Yüklenen indeksi kullanıma al, kaydırıcıların sınırlarını ayarla"""
+        self.range_index_loading = False
+        if generation != self.data_generation:
+            self.range_index_ready()
+            return
+        self.range_index = index
         
-        # Raporu göster
+        today = datetime.date.today()
+        span = max((today - index.first_date).days, 1)
+        for scale in self.range_scales:
+            scale.config(to=span)
+            scale.state(['!disabled'])
+        try:
+            start_date = datetime.date.fromisoformat(self.range_start_var.get().strip())
+            end_date = datetime.date.fromisoformat(self.range_end_var.get().strip())
+        except ValueError:
+            start_date = max(today - timedelta(days=CUSTOM_RANGE_DAYS - 1), index.first_date)
+            end_date = today
+        self.set_custom_range(start_date, end_date)
+        if self.report_period.get() == CUSTOM_PERIOD:
+            self.show_range_report()
+    
+    def set_custom_range(self, start_date, end_date):
+        """Özel aralığı tarih alanlarına ve kaydırıcılara yaz"""
+        first_date = self.range_index.first_date
+        self.range_start_var.set(start_date.strftime('%Y-%m-%d'))
+        self.range_end_var.set(end_date.strftime('%Y-%m-%d'))
+        # Scale.set komutu da çağırır; bu sırada gelen çağrılar yok sayılır
+        self.range_updating = True
+        try:
+            self.range_scales[0].set((start_date - first_date).days)
+            self.range_scales[1].set((end_date - first_date).days)
+        finally:
+            self.range_updating = False
+    
+    def on_range_slider(self, moved):
+        """Kaydırıcı sürüklendikçe aralığı güncelle (başlangıç bitişi geçemez)"""
+        if self.range_updating or not self.range_index_ready():
+            return
+        start, end = (round(float(scale.get())) for scale in self.range_scales)
+        if start > end:
+            # Sürüklenen kaydırıcı diğerini de iter
+            start, end = (start, start) if moved == 0 else (end, end)
+        first_date = self.range_index.first_date
+        self.set_custom_range(first_date + timedelta(days=start), first_date + timedelta(days=end))
+        self.report_period.set(CUSTOM_PERIOD)
+        self.show_range_report()
+    
+    def read_range_entries(self):
+        """Tarih alanlarındaki aralık; geçersizse hatayı gösterip None döndür"""
+        try:
+            start_date = datetime.date.fromisoformat(self.range_start_var.get().strip())
+            end_date = datetime.date.fromisoformat(self.range_end_var.get().strip())
+        except ValueError:
+            messagebox.showerror("❌ Hata", "Tarihler YYYY-AA-GG biçiminde olmalıdır!")
+            return None
+        if start_date > end_date:
+            messagebox.showerror("❌ Hata", "Başlangıç tarihi bitiş tarihinden sonra olamaz!")
+            return None
+        return start_date, end_date
+    
+    def apply_range_entries(self):
+        """Tarih alanlarına yazılan aralığı uygula"""
+        dates = self.read_range_entries()
+        if dates is None:
+            return
+        start_date, end_date = dates
+        self.report_period.set(CUSTOM_PERIOD)
+        if self.range_index_ready():
+            self.set_custom_range(start_date, end_date)
+        self.show_range_report()
+    
+    def show_range_report(self):
+        """Özel aralığın raporunu bellekteki indeksten oluştur ve göster"""
+        if not self.range_index_ready():
+            self.show_report("⏳ Özel aralık için günlük toplamlar yükleniyor...")
+            return
+        dates = self.read_range_entries()
+        if dates is None:
+            return
+        start_date, end_date = dates
+        rows = self.range_index.range_totals(start_date, end_date)
+        self.show_report(report_engine.format_report(CUSTOM_PERIOD, start_date, end_date, rows))
+    
+    def show_report(self, report):
+        """Rapor metnini göster"""
         self.report_text.delete('1.0', 'end')
         self.report_text.insert('1.0', report)
     
@@ -529,84 +1298,165 @@ class ActivityTracker:
             except Exception as e:
                 messagebox.showerror("❌ Hata", f"Kaydetme hatası: {str(e)}")
     
+    def chart_days(self, chart_type):
+        """Grafiğin kapsadığı gün sayısı; tüm geçmişse None"""
+        if chart_type == "line":
+            return LINE_CHART_RANGES[self.line_range.get()]
+        return CHART_DAYS[chart_type]
+    
+    def line_chart_options(self):
+        """Zaman serisi sorgusunun seçenekleri: (etkinlik, çözünürlük, en fazla nokta)"""
+        activity = self.line_activity.get()
+        width = self.chart_frame.winfo_width()
+        return (None if activity == ALL_ACTIVITIES else activity,
+                LINE_CHART_RESOLUTIONS[self.line_resolution.get()],
+                width if width > 1 else DEFAULT_CHART_WIDTH)
+    
+    def on_line_options_changed(self, event=None):
+        """Zaman serisi seçeneği değişince grafiği zaman serisine çevir ve yenile"""
+        self.chart_type.set("line")
+        self.update_chart()
+    
     def update_chart(self):
         """Grafikleri güncelle"""
-        # Önceki grafikleri temizle
-        for widget in self.chart_frame.winfo_children():
-            widget.destroy()
+        chart_type = self.chart_type.get()
         
-        try:
-            if self.chart_type.get() == "line":
-                self.create_line_chart()
-            else:
-                self.create_pie_chart()
-        except Exception as e:
-            error_label = tk.Label(self.chart_frame, text=f"Grafik yüklenirken hata: {str(e)}")
-            error_label.pack()
-    
-    def create_line_chart(self):
-        """Son 30 günün çizgi grafiği"""
-        end_date = datetime.date.today()
-        start_date = end_date - timedelta(days=29)
-        
-        # Günlük toplam süreleri al
-        self.cursor.execute('''
-            SELECT date, SUM(duration) 
-            FROM activities 
-            WHERE date >= ? AND date <= ?
-            GROUP BY date
-            ORDER BY date
-        ''', (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')))
-        
-        data = dict(self.cursor.fetchall())
-        
-        # Tüm günleri dahil et (boş günler için 0)
-        dates = []
-        durations = []
-        current_date = start_date
-        
-        while current_date <= end_date:
-            dates.append(current_date)
-            durations.append(data.get(current_date.strftime('%Y-%m-%d'), 0))
-            current_date += timedelta(days=1)
-        
-        # Grafik oluştur
-        fig, ax = plt.subplots(figsize=(12, 6))
-        ax.plot(dates, durations, marker='o', linewidth=2, markersize=4)
-        ax.set_title('📈 Son 30 Günün Aktivite Süresi', fontsize=14, fontweight='bold')
-        ax.set_xlabel('Tarih')
-        ax.set_ylabel('Süre (dakika)')
-        ax.grid(True, alpha=0.3)
-        
-        # Tarihleri döndür
-        plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
-        plt.tight_layout()
-        
-        # Tkinter'a entegre et
-        canvas = FigureCanvasTkAgg(fig, self.chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
-    
-    def create_pie_chart(self):
-        """Etkinlik dağılımının pasta grafiği"""
-        # Son 30 günün verilerini al
-        end_date = datetime.date.today()
-        start_date = end_date - timedelta(days=29)
+        # Diğer türün tuvalini gizle (silinmez, tekrar seçilince kullanılır)
+        for name, chart in self.charts.items():
+            if name != chart_type:
+                chart['widget'].pack_forget()
+        self.chart_message_label.pack_forget()
         
-        self.cursor.execute('''
-            SELECT activity, SUM(duration) 
-            FROM activities 
-            WHERE date >= ? AND date <= ?
-            GROUP BY activity
-            ORDER BY SUM(duration) DESC
-        ''', (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')))
+        end_date = datetime.date.today()
+        days = self.chart_days(chart_type)
+        start_date = None if days is None else end_date - timedelta(days=days - 1)
+        options = self.line_chart_options() if chart_type == "line" else ()
+        query, draw = {
+            "line": (self.query_line_chart, self.create_line_chart),
+            "pie": (self.query_pie_chart, self.create_pie_chart),
+            "trend": (self.query_analytics, self.create_trend_chart),
+            "heatmap": (self.query_analytics, self.create_heatmap_chart),
+        }[chart_type]
+        
+        def render(data):
+            try:
+                draw(data)
+            except Exception as e:
+                self.show_chart_message(f"Grafik yüklenirken hata: {str(e)}")
+        
+        # Veri değişmediyse önceki veri kümesi yeniden çizilir
+        key = ('chart', chart_type, start_date, end_date, options, self.data_version())
+        data = self.result_cache.get(key, ResultCache.MISSING)
+        if data is not ResultCache.MISSING:
+            self.executor.cancel('chart')
+            render(data)
+            return
         
-        data = self.cursor.fetchall()
+        def done(data):
+            self.result_cache.put(key, data)
+            render(data)
         
+        self.executor.submit('chart', lambda conn: query(conn, start_date, end_date, *options), done,
+                             on_error=lambda e: self.show_chart_message(
+                                 f"Grafik yüklenirken hata: {str(e)}"))
+    
+    def show_chart_message(self, text):
+        """Grafiğin yerine bir bilgi mesajı göster"""
+        for chart in self.charts.values():
+            chart['widget'].pack_forget()
+        self.chart_message_label.config(text=text)
+        self.chart_message_label.pack(expand=True)
+    
+    def get_chart(self, chart_type):
+        """Grafik türünün kalıcı Figure ve tuvalini döndür, yoksa oluştur"""
+        chart = self.charts.get(chart_type)
+        if chart is None:
+            # matplotlib ilk grafikte yüklenir; pyplot kullanılmaz, böylece
+            # figürler pyplot yöneticisinde birikmez
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            figsize = (10, 8) if chart_type == "pie" else (12, 6)
+            figure = Figure(figsize=figsize, tight_layout=True)
+            ax = figure.add_subplot()
+            canvas = FigureCanvasTkAgg(figure, self.chart_frame)
+            chart = {'figure': figure, 'ax': ax, 'canvas': canvas, 
+                     'widget': canvas.get_tk_widget()}
+            
+            if chart_type == "line":
+                ax.xaxis_date()
+                chart['line'], = ax.plot([], [], marker='o', linewidth=2, markersize=4)
+                ax.set_xlabel('Tarih')
+                ax.grid(True, alpha=0.3)
+                ax.tick_params(axis='x', labelrotation=45)
+            elif chart_type == "trend":
+                ax.xaxis_date()
+                chart['daily'], = ax.plot([], [], color='lightgray', linewidth=1, label='Günlük')
+                chart['week'], = ax.plot([], [], linewidth=2, label='7 günlük ortalama')
+                chart['month'], = ax.plot([], [], linewidth=2, label='30 günlük ortalama')
+                ax.set_title('📉 Son 1 Yılın Hareketli Ortalamaları', fontsize=14, fontweight='bold')
+                ax.set_ylabel('Süre (dakika)')
+                ax.grid(True, alpha=0.3)
+                ax.legend(loc='upper left')
+            elif chart_type == "heatmap":
+                import numpy as np
+                chart['image'] = ax.imshow(np.zeros((7, 53)), aspect='auto', cmap='Greens',
+                                           interpolation='nearest')
+                figure.colorbar(chart['image'], ax=ax, label='Süre (dakika)')
+                ax.set_yticks(range(7), ['Pzt', 'Sal', 'Çar', 'Per', 'Cum', 'Cmt', 'Paz'])
+                ax.set_title('🗓️ Son 53 Haftanın Takvimi', fontsize=14, fontweight='bold')
+            self.charts[chart_type] = chart
+        
+        if not chart['widget'].winfo_manager():
+            chart['widget'].pack(fill='both', expand=True)
+        return chart
+    
+    def query_line_chart(self, conn, start_date, end_date, activity=None, resolution=None,
+                         max_points=None):
+        """Aralığın kovalanmış ve seyreltilmiş süre serisi (arka planda çalışır)
+        
+        start_date None ise seri ilk kayıttan başlar. Nokta sayısı grafiğin
+        piksel genişliğini (max_points) aşmaz.
+        """
+        import analytics
+        if start_date is None:
+            start_date = report_engine.query_first_date(conn) or end_date
+        
+        # Günlük toplam süreleri al; sütunlu depo yalnızca tüm etkinliklerin toplamını tutar
+        store = self.ready_column_store(conn) if activity is None else None
+        if store is not None:
+            data = store.daily_totals(start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'))
+        else:
+            data = report_engine.query_daily_totals(conn, start_date, end_date, activity)
+        return analytics.line_series(data, start_date, end_date, resolution, max_points)
+    
+    def create_line_chart(self, data):
+        """Seçilen aralığın ve etkinliğin zaman serisi grafiği"""
+        dates, durations, resolution = data
+        
+        # Mevcut çizgiyi yerinde güncelle; uzun serilerde nokta işaretleri çizilmez
+        chart = self.get_chart("line")
+        ax = chart['ax']
+        chart['line'].set_data(dates, durations)
+        chart['line'].set_marker('o' if len(dates) <= LINE_MARKER_LIMIT else '')
+        activity = self.line_activity.get()
+        ax.set_title(f"📈 {self.line_range.get()}: {activity}", fontsize=14, fontweight='bold')
+        ax.set_ylabel(LINE_CHART_AXIS_LABELS[resolution])
+        ax.relim()
+        ax.autoscale_view()
+        chart['canvas'].draw_idle()
+    
+    def query_pie_chart(self, conn, start_date, end_date):
+        """Aralıktaki etkinlik toplamları (arka planda çalışır)"""
+        store = self.ready_column_store(conn)
+        if store is not None:
+            start, end = start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
+            return [(activity, minutes) for activity, minutes, _ in store.activity_totals(start, end)]
+        return report_engine.query_activity_totals(conn, start_date, end_date)
+    
+    def create_pie_chart(self, data):
+        """Etkinlik dağılımının pasta grafiği"""
         if not data:
-            no_data_label = tk.Label(self.chart_frame, text="📊 Son 30 günde veri bulunamadı", 
-                                   font=('Arial', 12))
-            no_data_label.pack(expand=True)
+            self.show_chart_message("📊 Son 30 günde veri bulunamadı")
             return
         
         activities = [row[0] for row in data]
@@ -618,9 +1468,12 @@ class ActivityTracker:
             activities = activities[:8] + ['Diğer']
             durations = durations[:8] + [other_duration]
         
-        # Grafik oluştur
-        fig, ax = plt.subplots(figsize=(10, 8))
-        colors = plt.cm.Set3(range(len(activities)))
+        # Dilimleri aynı eksen üzerinde yeniden çiz
+        chart = self.get_chart("pie")
+        ax = chart['ax']
+        ax.clear()
+        import matplotlib
+        colors = matplotlib.colormaps['Set3'](range(len(activities)))
         
         wedges, texts, autotexts = ax.pie(durations, labels=activities, autopct='%1.1f%%',
                                          colors=colors, startangle=90)
@@ -632,12 +1485,61 @@ class ActivityTracker:
             autotext.set_color('white')
             autotext.set_fontweight('bold')
         
-        plt.tight_layout()
-        
-        # Tkinter'a entegre et
-        canvas = FigureCanvasTkAgg(fig, self.chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+        chart['canvas'].draw_idle()
+    
+    def analytics_matrix(self, conn):
+        """Tüm geçmişin günlük matrisi (arka planda çalışır)
+        
+        Matris veri değişene kadar önbellekte tutulur ve analiz grafiklerince
+        paylaşılır; rapor bölümü yalnızca son yılı okur.
+        """
+        import analytics
+        generation = self.data_generation
+        cached = self.analytics_cache
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+        matrix = analytics.DailyMatrix.load(conn)
+        self.analytics_cache = (generation, matrix)
+        return matrix
+    
+    def query_analytics(self, conn, start_date, end_date):
+        """Analiz grafikleri için matris (arka planda çalışır)"""
+        return self.analytics_matrix(conn)
+    
+    def create_trend_chart(self, matrix):
+        """Son bir yılın günlük toplamı ve 7/30 günlük hareketli ortalamaları"""
+        import analytics
+        totals = matrix.daily_totals()
+        days = CHART_DAYS['trend']
+        dates = matrix.day_range()[-days:]
+        
+        chart = self.get_chart("trend")
+        ax = chart['ax']
+        chart['daily'].set_data(dates, totals[-days:])
+        chart['week'].set_data(dates, analytics.rolling_mean(totals, 7)[-days:])
+        chart['month'].set_data(dates, analytics.rolling_mean(totals, 30)[-days:])
+        ax.relim()
+        ax.autoscale_view()
+        chart['canvas'].draw_idle()
+    
+    def create_heatmap_chart(self, matrix):
+        """Son 53 haftanın takvim ısı haritası"""
+        import analytics
+        import numpy as np
+        grid, grid_start = analytics.calendar_heatmap(matrix)
+        
+        chart = self.get_chart("heatmap")
+        ax = chart['ax']
+        image = chart['image']
+        image.set_data(grid)
+        image.set_clim(0, max(float(np.nanmax(grid)) if np.isfinite(grid).any() else 0, 1))
+        
+        # Ayın ilk haftasının sütununa ay etiketi koy
+        mondays = [grid_start + timedelta(weeks=week) for week in range(grid.shape[1])]
+        ticks = [week for week, monday in enumerate(mondays) 
+                 if week == 0 or monday.month != mondays[week - 1].month]
+        ax.set_xticks(ticks, [mondays[week].strftime('%m/%y') for week in ticks])
+        chart['canvas'].draw_idle()
     
     def backup_database(self):
         """Veritabanını yedekle"""
@@ -648,12 +1550,23 @@ class ActivityTracker:
         )
         
         if filename:
-            try:
-                import shutil
-                shutil.copy2('activities.db', filename)
+            def done(result):
+                self.hide_task_progress()
                 messagebox.showinfo("✅ Başarılı", f"Veritabanı {filename} dosyasına yedeklendi!")
-            except Exception as e:
+            
+            def failed(e):
+                self.hide_task_progress()
                 messagebox.showerror("❌ Hata", f"Yedekleme hatası: {str(e)}")
+            
+            # Kopya arka planda, tutarlı bir anlık görüntüden alınır; bekleyen
+            # yazmalar önce onaylanır ki yedeğe dahil olsun
+            self.writes.flush()
+            BackgroundTask(self.root, 
+                           lambda report: database.backup_database(database.DB_PATH, filename, 
+                                                                   progress=report),
+                           done, failed, 
+                           lambda done, total: self.show_task_progress("💾 Yedekleniyor", 
+                                                                       done, total))
     
     def restore_database(self):
         """Veritabanını geri yükle"""
@@ -665,27 +1578,53 @@ class ActivityTracker:
             )
             
             if filename:
-                try:
-                    import shutil
-                    self.conn.close()
-                    shutil.copy2(filename, 'activities.db')
-                    self.conn = sqlite3.connect('activities.db')
-                    self.cursor = self.conn.cursor()
+                # Geri yükleme bitene kadar başka işlem yapılmasın
+                progress_window = tk.Toplevel(self.root)
+                progress_window.title("📥 Geri Yükleniyor")
+                progress_window.geometry("300x80")
+                progress_bar = ttk.Progressbar(progress_window, mode='determinate', length=260)
+                progress_bar.pack(padx=20, pady=25)
+                progress_window.grab_set()
+                
+                def restore(report):
+                    database.restore_database(filename, database.DB_PATH, progress=report)
+                    # Eski şemadaki yedekler aynı çubukta ilerleme göstererek taşınır
+                    database.connect(database.DB_PATH, progress=report).close()
+                
+                def done(result):
+                    progress_window.destroy()
+                    # Yazma bağlantısı yeniden açılır, eski okuma bağlantıları emekliye ayrılır
+                    try:
+                        self.connections.reconnect()
+                    except (database.MigrationError, sqlite3.Error) as e:
+                        messagebox.showerror("❌ Hata", f"Veritabanı yeniden açılamadı: {str(e)}")
+                        return
                     messagebox.showinfo("✅ Başarılı", "Veritabanı geri yüklendi!")
                     self.refresh_data()
-                except Exception as e:
+                
+                def failed(e):
+                    progress_window.destroy()
                     messagebox.showerror("❌ Hata", f"Geri yükleme hatası: {str(e)}")
+                
+                # İçerik backup API ile yerinde değişir, bağlantılar sonra yenilenir.
+                # Bekleyen yazmalar önce onaylanır, açık işlem kilidi tutmasın
+                self.writes.flush()
+                BackgroundTask(self.root, restore, done, failed, 
+                               lambda done, total: progress_bar.config(maximum=max(total, 1), 
+                                                                       value=done))
     
     def change_password(self):
         """Parolayı değiştir"""
+        if self.writes_held():
+            return
         old_password = simpledialog.askstring("🔐 Eski Parola", 
                                              "Mevcut parolanızı girin:", show='*')
         if not old_password:
             return
         
         # Eski parolayı kontrol et
-        self.cursor.execute("SELECT value FROM settings WHERE key = 'password'")
-        stored_password = self.cursor.fetchone()[0]
+        stored_password = self.conn.execute(
+            "SELECT value FROM settings WHERE key = 'password'").fetchone()[0]
         old_hashed = hashlib.sha256(old_password.encode()).hexdigest()
         
         if old_hashed != stored_password:
@@ -699,75 +1638,73 @@ class ActivityTracker:
                                                      "Yeni parolanızı tekrar girin:", show='*')
             if new_password == confirm_password:
                 new_hashed = hashlib.sha256(new_password.encode()).hexdigest()
-                self.cursor.execute("UPDATE settings SET value = ? WHERE key = 'password'", 
-                                  (new_hashed,))
-                self.conn.commit()
-                messagebox.showinfo("✅ Başarılı", "Parola başarıyla değiştirildi!")
+                self.writes.execute("UPDATE settings SET value = ? WHERE key = 'password'", 
+                                    (new_hashed,), 
+                                    on_commit=lambda: messagebox.showinfo(
+                                        "✅ Başarılı", "Parola başarıyla değiştirildi!"),
+                                    on_error=self.show_write_error)
+                self.writes.flush()
             else:
                 messagebox.showerror("❌ Hata", "Parolalar eşleşmiyor!")
     
     def update_stats(self):
         """Genel istatistikleri güncelle"""
+        # Değerler yazmalarla birlikte güncel tutulur; yalnızca ilk açılışta ve
+        # geri yükleme gibi toplu değişikliklerden sonra sıfırdan hesaplanır
+        if not self.stats.loaded:
+            self.stats_label.config(text="İstatistikler yükleniyor...")
+            self.load_index('stats', StatsTracker, self.update_stats)
+            return
+        self.show_stats(self.stats.snapshot())
+    
+    def load_index(self, name, factory, on_loaded):
+        """self.<name> indeksini bir okuma bağlantısında sıfırdan kur, sonra on_loaded()
+        
+        Eski (yüklenmemiş) nesne yükleme boyunca yerinde kalır ve
+        ChangeSet'leri yok sayar. Yükleme sürerken onaylanan yazmalar anlık
+        görüntüye girmiş de olabilir girmemiş de; veri nesli değiştiyse
+        sonuç atılıp yeniden yüklenir.
+        """
+        if name in self.index_loading:
+            return
+        self.index_loading.add(name)
+        generation = self.data_generation
+        
+        def loaded(index):
+            self.index_loading.discard(name)
+            if generation != self.data_generation:
+                self.load_index(name, factory, on_loaded)
+                return
+            setattr(self, name, index)
+            on_loaded()
+        
+        def failed(e):
+            self.index_loading.discard(name)
+            instrumentation.log_error(f"{name} yüklenemedi", e)
+        
+        def load(conn):
+            index = factory()
+            index.load(conn)
+            return index
+        
+        self.executor.submit(name, load, loaded, on_error=failed)
+    
+    def show_stats(self, stats):
+        """İstatistik etiketini güncelle"""
         try:
-            # Toplam kayıt sayısı
-            self.cursor.execute("SELECT COUNT(*) FROM activities")
-            total_records = self.cursor.fetchone()[0]
-            
-            # Toplam süre
-            self.cursor.execute("SELECT SUM(duration) FROM activities")
-            total_duration = self.cursor.fetchone()[0] or 0
-            
-            # Farklı etkinlik sayısı
-            self.cursor.execute("SELECT COUNT(DISTINCT activity) FROM activities")
-            unique_activities = self.cursor.fetchone()[0]
-            
-            # İlk kayıt tarihi
-            self.cursor.execute("SELECT MIN(date) FROM activities")
-            first_record = self.cursor.fetchone()[0]
-            
-            # En aktif gün
-            self.cursor.execute('''
-                SELECT date, SUM(duration) as daily_total 
-                FROM activities 
-                GROUP BY date 
-                ORDER BY daily_total DESC 
-                LIMIT 1
-            ''')
-            most_active_day = self.cursor.fetchone()
-            
-            stats_text = f"📊 Toplam Kayıt: {total_records}\n"
-            stats_text += f"⏱️ Toplam Süre: {total_duration//60}s {total_duration%60}dk\n"
-            stats_text += f"🎯 Farklı Etkinlik: {unique_activities}\n"
-            
-            if first_record:
-                stats_text += f"📅 İlk Kayıt: {first_record}\n"
-            
-            if most_active_day:
-                date, duration = most_active_day
-                stats_text += f"🏆 En Aktif Gün: {date} ({duration//60}s {duration%60}dk)\n"
-            
-            # Ortalama günlük süre
-            if first_record:
-                from datetime import datetime
-                first_date = datetime.strptime(first_record, '%Y-%m-%d').date()
-                days_diff = (datetime.now().date() - first_date).days + 1
-                avg_daily = total_duration / days_diff if days_diff > 0 else 0
-                stats_text += f"📈 Günlük Ortalama: {avg_daily//60:.0f}s {avg_daily%60:.0f}dk"
-            
-            self.stats_label.config(text=stats_text)
-            
+            self.stats_label.config(text=report_engine.format_stats(stats, datetime.date.today()))
         except Exception as e:
             self.stats_label.config(text=f"İstatistik hatası: {str(e)}")
     
     def __del__(self):
         """Uygulama kapanırken veritabanı bağlantısını kapat"""
-        if hasattr(self, 'conn'):
-            self.conn.close()
+        if hasattr(self, 'connections') and not self.connections.closed:
+            self.connections.close()
     
     def run(self):
         """Uygulamayı çalıştır"""
-        # Otomatik yedekleme (günde bir)
-        self.auto_backup()
+        # Otomatik yedekleme (günde bir), açılışı bekletmeden arka planda
+        self.root.after(AUTO_BACKUP_DELAY_MS, self.auto_backup)
         
         # Uygulama kapanırken temizlik
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -784,16 +1721,28 @@ class ActivityTracker:
             today = datetime.date.today().strftime('%Y%m%d')
             backup_file = os.path.join(backup_dir, f"activities_backup_{today}.db")
             
-            # Eğer bugünün yedeği yoksa oluştur
+            # Eğer bugünün yedeği yoksa arka planda oluştur
             if not os.path.exists(backup_file):
-                import shutil
-                shutil.copy2('activities.db', backup_file)
+                def done(result):
+                    self.hide_task_progress()
+                    # Eski yedekleri temizle (30 günden eski)
+                    self.cleanup_old_backups(backup_dir)
+                
+                def failed(e):
+                    self.hide_task_progress()
+                    instrumentation.log_error("Otomatik yedekleme başarısız", e)
                 
-                # Eski yedekleri temizle (30 günden eski)
-                self.cleanup_old_backups(backup_dir)
+                # Bekleyen yazmalar yedeğe dahil olsun
+                self.writes.flush()
+                BackgroundTask(self.root, 
+                               lambda report: database.backup_database(database.DB_PATH, backup_file, 
+                                                                       progress=report),
+                               done, failed, 
+                               lambda done, total: self.show_task_progress("💾 Otomatik yedek", 
+                                                                           done, total))
                 
         except Exception as e:
-            pass  # Sessizce başarısız ol
+            instrumentation.log_error("Otomatik yedekleme başlatılamadı", e)
     
     def cleanup_old_backups(self, backup_dir):
         """30 günden eski yedekleri sil"""
@@ -803,7 +1752,9 @@ class ActivityTracker:
             for filename in os.listdir(backup_dir):
                 if filename.startswith("activities_backup_") and filename.endswith(".db"):
                     try:
+                        # Arşiv bölümlerinin kopyaları: activities_backup_YYYYAAGG_YYYY.db
                         date_str = filename.replace("activities_backup_", "").replace(".db", "")
+                        date_str = date_str.split("_")[0]
                         file_date = datetime.datetime.strptime(date_str, '%Y%m%d').date()
                         
                         if file_date < cutoff_date:
@@ -816,8 +1767,10 @@ class ActivityTracker:
     
     def on_closing(self):
         """Uygulama kapatılırken çalışır"""
+        self.executor.shutdown()
         try:
-            self.conn.close()
+            self.writes.flush()
+            self.connections.close()
         except:
             pass
         self.root.destroy()
@@ -825,7 +1778,12 @@ class ActivityTracker:
 # Uygulamayı başlat
 if __name__ == "__main__":
     try:
-        app = ActivityTracker()
+        # --startup-profile: ilk çizime kadar geçen süreyi yazdır ve çık
+        # --column-store: geçmişi bellekte sütunlu olarak tut (NumPy gerekir)
+        # --instrument: sorgu ve görünüm sürelerini açılıştan itibaren ölç
+        app = ActivityTracker(startup_profile='--startup-profile' in sys.argv,
+                              column_store='--column-store' in sys.argv,
+                              instrument='--instrument' in sys.argv)
         app.run()
     except Exception as e:
         print(f"Uygulama başlatma hatası: {str(e)}")
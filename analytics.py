@@ -0,0 +1,265 @@
+"""Günlük etkinlik toplamları üzerinde NumPy ile vektörel analizler
+
+Günlük toplam tablosu bir kez (etkinlik x gün) boyutlu yoğun bir dakika
+matrisine yüklenir; hareketli ortalamalar, seriler, haftalık değişim ve
+takvim ısı haritası bu matris üzerinde Python döngüsü olmadan hesaplanır.
+"""
+import datetime
+
+import numpy as np
+
+import database
+import partitions
+
+HEATMAP_WEEKS = 53
+
+# Otomatik çözünürlükte günlük ve haftalık kovaların kullanıldığı en uzun aralıklar (gün)
+DAILY_RESOLUTION_DAYS = 120
+WEEKLY_RESOLUTION_DAYS = 3 * 365
+
+RESOLUTIONS = ('day', 'week', 'month')
+
+
+class DailyMatrix:
+    """Etkinlik başına günlük dakikalar: minutes[etkinlik, gün]
+
+    Gün ekseni first_day'den end_day'e (dahil) kadar her günü içerir;
+    kaydı olmayan günler 0'dır.
+    """
+
+    def __init__(self, activities, first_day, minutes):
+        self.activities = activities
+        self.first_day = first_day
+        self.minutes = minutes
+
+    @classmethod
+    def load(cls, conn, end_day=None, start_day=None):
+        """Günlük toplam tablolarından (arşiv bölümleri dahil) matrisi kur"""
+        if end_day is None:
+            end_day = datetime.date.today()
+        sql = """
+            SELECT t.day, n.name, t.total_minutes
+            FROM {db}.daily_totals t JOIN {db}.activity_names n ON n.id = t.activity_id
+        """
+        params = ()
+        if start_day is not None:
+            sql += " WHERE t.day >= ?"
+            params = (database.day_number(start_day),)
+        start = start_day.isoformat() if start_day is not None else None
+        rows = list(partitions.query(conn, sql, params, start_date=start))
+        day_numbers, names, minutes = zip(*rows) if rows else ((), (), ())
+        day_numbers = np.array(day_numbers, dtype=np.int64)
+
+        if start_day is not None:
+            first = database.day_number(start_day)
+        elif len(day_numbers):
+            first = int(day_numbers.min())
+        else:
+            return cls([], end_day, np.zeros((0, 1), dtype=np.int64))
+        days = max(database.day_number(end_day) - first + 1, 1)
+
+        # Etkinlik adlarını ilk görülme sırasıyla satır numaralarına eşle
+        index = {}
+        activity_index = np.fromiter((index.setdefault(name, len(index)) for name in names),
+                                     dtype=np.int64, count=len(names))
+
+        # Gelecek tarihli kayıtlar matrisin dışında kalır
+        offsets = day_numbers - first
+        keep = (offsets >= 0) & (offsets < days)
+        matrix = np.zeros((len(index), days), dtype=np.int64)
+        np.add.at(matrix, (activity_index[keep], offsets[keep]),
+                  np.asarray(minutes, dtype=np.int64)[keep])
+
+        first_day = database.EPOCH + datetime.timedelta(days=first)
+        return cls(list(index), first_day, matrix)
+
+    @property
+    def days(self):
+        return self.minutes.shape[1]
+
+    @property
+    def end_day(self):
+        return self.first_day + datetime.timedelta(days=self.days - 1)
+
+    def day_range(self):
+        """Gün ekseninin tarihleri (datetime64[D] dizisi)"""
+        return np.datetime64(self.first_day, 'D') + np.arange(self.days)
+
+    def daily_totals(self):
+        """Tüm etkinliklerin günlük toplamı"""
+        return self.minutes.sum(axis=0)
+
+
+def rolling_mean(series, window):
+    """Sondaki window günün ortalaması; ilk günlerde mevcut günlere bölünür"""
+    series = np.asarray(series, dtype=np.float64)
+    cumulative = np.cumsum(series)
+    totals = cumulative.copy()
+    totals[window:] = cumulative[window:] - cumulative[:-window]
+    counts = np.minimum(np.arange(1, len(series) + 1), window)
+    return totals / counts
+
+
+def streaks(matrix):
+    """Etkinlik başına (en uzun seri, güncel seri) gün sayıları
+
+    Seri, etkinliğin art arda kaydedildiği günlerdir. Güncel seri bugün veya
+    dün biten seridir; bugün henüz kaydedilmemiş olması seriyi bozmaz.
+    """
+    active = matrix.minutes > 0
+    rows, days = active.shape
+    padded = np.zeros((rows, days + 2), dtype=np.int8)
+    padded[:, 1:-1] = active
+    edges = np.diff(padded, axis=1)
+
+    # np.nonzero satır sırasıyla döndüğü için başlangıç ve bitişler eşleşir
+    start_rows, start_cols = np.nonzero(edges == 1)
+    _, end_cols = np.nonzero(edges == -1)
+    lengths = end_cols - start_cols
+
+    longest = np.zeros(rows, dtype=np.int64)
+    np.maximum.at(longest, start_rows, lengths)
+
+    current = np.zeros(rows, dtype=np.int64)
+    ongoing = end_cols >= days - 1
+    current[start_rows[ongoing]] = lengths[ongoing]
+    return longest, current
+
+
+def week_over_week(matrix):
+    """Etkinlik başına (son 7 gün, önceki 7 gün, fark) dakikaları"""
+    minutes = matrix.minutes
+    this_week = minutes[:, -7:].sum(axis=1)
+    last_week = minutes[:, -14:-7].sum(axis=1) if matrix.days > 7 else np.zeros_like(this_week)
+    return this_week, last_week, this_week - last_week
+
+
+def calendar_heatmap(matrix, weeks=HEATMAP_WEEKS):
+    """Son weeks haftanın günlük toplamları: (7 x weeks) dizi, satırlar Pazartesi..Pazar
+
+    Son sütun bugünün haftasıdır; henüz gelmemiş günler NaN'dır. İlk
+    sütunun Pazartesi tarihini de döndürür.
+    """
+    end_day = matrix.end_day
+    grid_end = end_day + datetime.timedelta(days=6 - end_day.weekday())
+    grid_start = grid_end - datetime.timedelta(days=7 * weeks - 1)
+
+    values = np.full(7 * weeks, np.nan)
+    totals = matrix.daily_totals().astype(np.float64)
+    # Matrisin ızgaraya düşen kısmını kopyala
+    source_start = max((grid_start - matrix.first_day).days, 0)
+    target_start = max((matrix.first_day - grid_start).days, 0)
+    count = min(matrix.days - source_start, 7 * weeks - target_start)
+    if count > 0:
+        values[target_start:target_start + count] = totals[source_start:source_start + count]
+    # Matristen önceki günler 0, bugünden sonraki günler NaN kalır
+    values[:target_start] = 0
+    return values.reshape(weeks, 7).T, grid_start
+
+
+def summary(matrix, limit=10):
+    """Rapor bölümü için etkinlik başına seri ve haftalık değişim özetleri
+
+    Son iki haftada en çok zaman ayrılan limit etkinlik döner:
+    (etkinlik, en uzun seri, güncel seri, bu hafta, geçen hafta, fark).
+    """
+    if not matrix.activities:
+        return []
+    longest, current = streaks(matrix)
+    this_week, last_week, delta = week_over_week(matrix)
+    order = np.lexsort((-longest, -(this_week + last_week)))[:limit]
+    return [(matrix.activities[i], int(longest[i]), int(current[i]),
+             int(this_week[i]), int(last_week[i]), int(delta[i])) for i in order]
+
+
+def series_resolution(days):
+    """Aralık uzunluğuna uygun kova çözünürlüğü: 'day', 'week' veya 'month'"""
+    if days <= DAILY_RESOLUTION_DAYS:
+        return 'day'
+    if days <= WEEKLY_RESOLUTION_DAYS:
+        return 'week'
+    return 'month'
+
+
+def daily_values(totals, start_date, end_date):
+    """{'YYYY-AA-GG': dakika} toplamlarının aralıktaki yoğun günlük dizisi"""
+    first = database.day_number(start_date)
+    values = np.zeros(max(database.day_number(end_date) - first + 1, 0), dtype=np.float64)
+    for date, minutes in totals.items():
+        offset = database.day_number(date) - first
+        if 0 <= offset < len(values):
+            values[offset] = minutes
+    return values
+
+
+def resample(start_date, values, resolution):
+    """Günlük değerleri kovalara topla: (kova başlangıçları, kovanın günlük ortalaması)
+
+    Haftalar Pazartesi, aylar ayın ilk günü başlar. Ortalama kovanın
+    aralığa düşen günlerine bölünür; böylece yarım kalan ilk ve son kova
+    çukur gibi görünmez ve y ekseni her çözünürlükte dakika/gündür.
+    """
+    dates = np.datetime64(start_date, 'D') + np.arange(len(values))
+    if resolution == 'day':
+        return dates, np.asarray(values, dtype=np.float64)
+    if resolution == 'week':
+        # 1970-01-01 Perşembe: gün numarası + 3, Pazartesi'den uzaklığın 7 katlısı
+        starts = dates - (dates.astype(np.int64) + 3) % 7
+    elif resolution == 'month':
+        starts = dates.astype('datetime64[M]').astype('datetime64[D]')
+    else:
+        raise ValueError(f"bilinmeyen çözünürlük: {resolution}")
+    buckets, inverse = np.unique(starts, return_inverse=True)
+    sums = np.bincount(inverse, weights=values, minlength=len(buckets))
+    counts = np.bincount(inverse, minlength=len(buckets))
+    # Aralıktan önce başlayan ilk kova aralığın ilk gününde gösterilir
+    return np.maximum(buckets, dates[:1]), sums / counts
+
+
+def lttb(x, y, threshold):
+    """Largest-Triangle-Three-Buckets ile seçilen en fazla threshold noktanın indeksleri
+
+    İlk ve son nokta korunur; aradaki noktalar threshold - 2 kovaya bölünür
+    ve her kovadan, önceki seçilen nokta ile sonraki kovanın ortalamasıyla
+    en büyük üçgeni kuran nokta seçilir. Böylece tepe ve çukurlar seyreltmede
+    kaybolmaz.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # Kova i, [edges[i], edges[i + 1]) aralığıdır; son kovanın ardından yalnızca son nokta gelir
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    edges = np.append(edges, n)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = edges[i + 1], edges[i + 2]
+        next_x = x[next_start:next_end].mean()
+        next_y = y[next_start:next_end].mean()
+        px, py = x[previous], y[previous]
+        areas = np.abs((px - next_x) * (y[start:end] - py) - (px - x[start:end]) * (next_y - py))
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+    return selected
+
+
+def line_series(totals, start_date, end_date, resolution=None, max_points=None):
+    """Çizgi grafiği için (tarihler, dakika/gün, çözünürlük)
+
+    resolution verilmezse aralık uzunluğuna göre seçilir. Nokta sayısı
+    max_points'i (grafiğin piksel genişliği) aşarsa seri LTTB ile seyreltilir;
+    böylece çizim süresi aralığın uzunluğundan bağımsız kalır.
+    """
+    values = daily_values(totals, start_date, end_date)
+    if resolution is None:
+        resolution = series_resolution(len(values))
+    dates, averages = resample(start_date, values, resolution)
+    if max_points is not None and len(averages) > max_points:
+        keep = lttb(dates.astype(np.int64), averages, max_points)
+        dates, averages = dates[keep], averages[keep]
+    return dates.astype(object), averages, resolution
@@ -0,0 +1,200 @@
+"""Arayüzü kilitlemeden veritabanı sorgularını çalıştıran arka plan işçileri"""
+import queue
+import threading
+import time
+
+import instrumentation
+
+
+class QueryExecutor:
+    """Okuma işlerini bağlantı havuzundan okuyan iş parçacıklarında çalıştır
+
+    Her iş bir anahtarla (ör. 'report') gönderilir ve yalnızca o anahtarın en
+    son işinin sonucu teslim edilir; eskiyen bir iş hâlâ çalışıyorsa sorgusu
+    Connection.interrupt ile kesilir. Sonuçlar Tk iş parçacığına root.after
+    ile yoklanan bir kuyruk üzerinden ulaşır, Tk'ya başka iş parçacığından
+    hiç dokunulmaz.
+    """
+
+    POLL_MS = 20
+
+    def __init__(self, root, connections, workers=2, on_busy=None, busy_delay=0.3):
+        self.root = root
+        self.connections = connections
+        self.on_busy = on_busy
+        self.busy_delay = busy_delay
+
+        self.jobs = queue.Queue()
+        self.results = queue.Queue()
+        self.latest = {}          # anahtar -> en son nesil
+        self.running = {}         # anahtar -> (nesil, bağlantı)
+        self.lock = threading.Lock()
+
+        # Yalnızca Tk iş parçacığında kullanılan durum
+        self.outstanding = 0
+        self.busy_since = None
+        self.busy = False
+        self.poll_id = None
+
+        self.threads = [threading.Thread(target=self.worker, daemon=True)
+                        for _ in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, key, fn, callback, on_error=None):
+        """fn(conn) işini arka planda çalıştır, sonucu callback(result) ile teslim et
+
+        Aynı anahtarla daha önce gönderilmiş ve henüz bitmemiş iş eskimiş
+        sayılır: sonucu atılır ve çalışan sorgusu kesilir.
+        """
+        with self.lock:
+            generation = self.latest.get(key, 0) + 1
+            self.latest[key] = generation
+            running = self.running.get(key)
+            if running is not None:
+                running[1].interrupt()
+
+        self.jobs.put((key, generation, fn, callback, on_error))
+        if self.outstanding == 0:
+            self.busy_since = time.monotonic()
+        self.outstanding += 1
+        self.schedule_poll()
+        return generation
+
+    def cancel(self, key):
+        """Anahtarın bekleyen veya çalışan işini geçersiz kıl"""
+        with self.lock:
+            self.latest[key] = self.latest.get(key, 0) + 1
+            running = self.running.get(key)
+            if running is not None:
+                running[1].interrupt()
+
+    def is_current(self, key, generation):
+        return self.latest.get(key) == generation
+
+    def worker(self):
+        """İşçi döngüsü: her iş havuzdan ödünç alınan bir bağlantıyla çalışır"""
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            key, generation, fn, callback, on_error = job
+
+            result = error = None
+            with self.lock:
+                stale = not self.is_current(key, generation)
+            if not stale:
+                try:
+                    with self.connections.reader() as conn:
+                        with self.lock:
+                            self.running[key] = (generation, conn)
+                        try:
+                            with instrumentation.timed(f"sorgu: {key}"):
+                                result = fn(conn)
+                        finally:
+                            with self.lock:
+                                if self.running.get(key, (None,))[0] == generation:
+                                    del self.running[key]
+                except Exception as e:
+                    error = e
+            self.results.put((key, generation, result, error, callback, on_error))
+
+    def schedule_poll(self):
+        if self.poll_id is None:
+            self.poll_id = self.root.after(self.POLL_MS, self.poll)
+
+    def poll(self):
+        """Tamamlanan işleri Tk iş parçacığında teslim et"""
+        self.poll_id = None
+        while True:
+            try:
+                key, generation, result, error, callback, on_error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.outstanding -= 1
+            if not self.is_current(key, generation):
+                continue  # Eskimiş sonuç
+            if error is not None:
+                if on_error is not None:
+                    on_error(error)
+                else:
+                    print(f"Arka plan sorgu hatası ({key}): {error}")
+            else:
+                with instrumentation.timed(f"çizim: {key}"):
+                    callback(result)
+
+        self.update_busy()
+        if self.outstanding:
+            self.schedule_poll()
+
+    def update_busy(self):
+        """Uzun süren işler için meşgul göstergesini aç veya kapat"""
+        if self.on_busy is None:
+            return
+        if self.outstanding == 0:
+            if self.busy:
+                self.busy = False
+                self.on_busy(False)
+        elif not self.busy and time.monotonic() - self.busy_since > self.busy_delay:
+            self.busy = True
+            self.on_busy(True)
+
+    def shutdown(self):
+        """İşçileri durdur"""
+        for _ in self.threads:
+            self.jobs.put(None)
+
+
+class BackgroundTask:
+    """Uzun süren tek bir işi (ör. yedekleme) ayrı bir iş parçacığında çalıştır
+
+    fn(report) çağrılır; iş report(tamamlanan, toplam) ile ilerlemesini
+    bildirir, report iş iptal edildiyse False döndürür. on_progress, on_done
+    ve on_error Tk iş parçacığında, root.after yoklamasıyla çağrılır.
+    """
+
+    POLL_MS = 100
+
+    def __init__(self, root, fn, on_done, on_error=None, on_progress=None):
+        self.root = root
+        self.fn = fn
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+
+        self.cancelled = False
+        self.progress = None
+        self.outcome = None
+
+        threading.Thread(target=self.run, daemon=True).start()
+        self.root.after(self.POLL_MS, self.poll)
+
+    def report(self, done, total):
+        """İş parçacığından ilerleme bildir; iptal edildiyse False döner"""
+        self.progress = (done, total)
+        return not self.cancelled
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        try:
+            self.outcome = (True, self.fn(self.report))
+        except Exception as e:
+            self.outcome = (False, e)
+
+    def poll(self):
+        if self.progress is not None and self.on_progress is not None:
+            self.on_progress(*self.progress)
+
+        if self.outcome is None:
+            self.root.after(self.POLL_MS, self.poll)
+            return
+
+        ok, value = self.outcome
+        if ok:
+            self.on_done(value)
+        elif self.on_error is not None:
+            self.on_error(value)
+        else:
+            print(f"Arka plan iş hatası: {value}")
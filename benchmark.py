@@ -0,0 +1,243 @@
+"""Uygulama sorgularının ve hesaplarının arayüzsüz kıyaslaması
+
+Her durum, arayüzdeki karşılığının (generate_report, update_stats,
+refresh_records, grafikler, dışa aktarma, yedekleme) çalıştırdığı sorgu ve
+hesapları aynen çağırır. Sonuçların çalıştırmalar arasında karşılaştırılabilir
+olması için "bugün" veritabanındaki son kayıt günü alınır, her durum bir kez
+ısınma için çalıştırılıp sonra tekrar sayısı kadar ölçülür ve ortam bilgileri
+sonuçla birlikte kaydedilir. Sentetik veritabanı synthetic_data ile aynı tohumdan
+üretildiğinde iki çalıştırma aynı veri üzerinde ölçülür.
+
+    python benchmark.py --generate 1000000 --json sonuc.json
+    python benchmark.py --db bench.db --compare sonuc.json
+"""
+import datetime
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+import data_io
+import database
+import partitions
+import report_engine
+
+DEFAULT_REPEAT = 5
+
+# Kayıtlar görünümünün sayfa boyu (activity_tracker.RECORDS_PAGE_SIZE ile aynı)
+RECORDS_PAGE_SIZE = 200
+
+# Derin sayfa ölçümünde ileri gidilen sayfa sayısı
+DEEP_PAGES = 50
+
+# Aramada kullanılan, sentetik notlarda geçen terim
+SEARCH_TEXT = "proje"
+
+# Grafiklerin varsayılan aralığı (gün) ve seyreltmede hedeflenen genişlik (piksel)
+CHART_DAYS = 30
+CHART_WIDTH = 1000
+
+# Karşılaştırmada bu oranı aşan farklar işaretlenir
+SIGNIFICANT_CHANGE = 0.10
+
+
+def data_today(conn):
+    """Veritabanındaki son kayıt günü; boşsa bugün"""
+    day = conn.execute("SELECT MAX(day) FROM daily_totals").fetchone()[0]
+    if day is None:
+        return datetime.date.today()
+    return database.EPOCH + timedelta(days=day)
+
+
+def records_pages(conn, search, pages):
+    """Kayıtlar görünümünün ilk pages sayfasını anahtar sayfalamayla oku"""
+    key = None
+    count = 0
+    for _ in range(pages):
+        rows = partitions.records_page(conn, search, key, True, RECORDS_PAGE_SIZE)
+        count += len(rows)
+        if len(rows) < RECORDS_PAGE_SIZE:
+            break
+        key = (rows[-1][1], rows[-1][0])
+    return count
+
+
+def cases(conn, db_path, today, workdir):
+    """(ad, çağrılabilir) ölçüm durumları"""
+    def report(period):
+        def run():
+            start_date = report_engine.period_start(period, today)
+            rows = report_engine.query_report(conn, start_date)
+            return report_engine.format_report(period, start_date, today, rows, generated_at=today)
+        return run
+
+    def line_chart(start_date, resolution=None):
+        def run():
+            import analytics
+            start = start_date or report_engine.query_first_date(conn)
+            totals = report_engine.query_daily_totals(conn, start, today)
+            return analytics.line_series(totals, start, today, resolution, CHART_WIDTH)
+        return run
+
+    def pie_chart():
+        return report_engine.query_activity_totals(conn, today - timedelta(days=CHART_DAYS), today)
+
+    def export():
+        path = os.path.join(workdir, 'export.csv')
+        try:
+            return data_io.export_csv(conn, path)
+        finally:
+            os.remove(path)
+
+    def backup():
+        path = os.path.join(workdir, 'backup.db')
+        try:
+            database.backup_database(db_path, path)
+        finally:
+            os.remove(path)
+
+    items = [(f"rapor: {period}", report(period)) for period in report_engine.PERIODS]
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        items.append(("rapor: seri ve haftalık değişim",
+                      lambda: report_engine.query_analytics(conn, today)))
+        items.append(("grafik: zaman serisi 30 gün", line_chart(today - timedelta(days=CHART_DAYS))))
+        items.append(("grafik: zaman serisi tüm zamanlar", line_chart(None)))
+        items.append(("grafik: tüm zamanlar günlük (LTTB)", line_chart(None, 'day')))
+    items += [
+        ("istatistikler", lambda: report_engine.query_stats(conn)),
+        ("kayıtlar: ilk sayfa", lambda: records_pages(conn, "", 1)),
+        ("kayıtlar: arama ilk sayfa", lambda: records_pages(conn, SEARCH_TEXT, 1)),
+        (f"kayıtlar: {DEEP_PAGES} sayfa", lambda: records_pages(conn, "", DEEP_PAGES)),
+        (f"kayıtlar: arama {DEEP_PAGES} sayfa", lambda: records_pages(conn, SEARCH_TEXT, DEEP_PAGES)),
+        ("grafik: etkinlik pastası", pie_chart),
+        ("dışa aktarma: csv", export),
+        ("yedekleme", backup),
+    ]
+    return items
+
+
+def measure(fn, repeat):
+    """Bir ısınma çalıştırmasından sonra repeat ölçüm: süreler (ms)"""
+    fn()
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def environment(conn):
+    """Sonuçların hangi ortamda alındığı"""
+    rows = conn.execute("SELECT COUNT(*) FROM activity_entries").fetchone()[0]
+    return {
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'rows': rows,
+        'schema_version': database.schema_version(conn),
+    }
+
+
+def run(db_path, repeat=DEFAULT_REPEAT, only=None, progress=None):
+    """Tüm durumları ölç; JSON'a yazılabilir bir sonuç sözlüğü döndür"""
+    conn = database.connect(db_path)
+    try:
+        today = data_today(conn)
+        result = {'db': db_path, 'today': today.isoformat(), 'repeat': repeat,
+                  'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+                  'environment': environment(conn), 'cases': {}}
+        with tempfile.TemporaryDirectory() as workdir:
+            for name, fn in cases(conn, db_path, today, workdir):
+                if only and not any(part in name for part in only):
+                    continue
+                durations = measure(fn, repeat)
+                ordered = sorted(durations)
+                result['cases'][name] = {
+                    'min_ms': ordered[0],
+                    'median_ms': statistics.median(ordered),
+                    'mean_ms': statistics.fmean(ordered),
+                    'p95_ms': ordered[max(0, -(-len(ordered) * 95 // 100) - 1)],
+                }
+                if progress is not None:
+                    progress(name, result['cases'][name])
+    finally:
+        conn.close()
+    return result
+
+
+def format_case(name, stats, baseline=None):
+    """Bir durumun tek satırlık özeti; baseline varsa ortanca farkıyla"""
+    line = (f"{name:<36} {stats['median_ms']:>10.2f} {stats['min_ms']:>10.2f} "
+            f"{stats['p95_ms']:>10.2f}")
+    if baseline is not None:
+        change = stats['median_ms'] / baseline['median_ms'] - 1 if baseline['median_ms'] else 0.0
+        mark = " ⚠️" if change > SIGNIFICANT_CHANGE else " ✅" if change < -SIGNIFICANT_CHANGE else ""
+        line += f" {baseline['median_ms']:>10.2f} {change:>+8.1%}{mark}"
+    return line
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Uygulama sorgularını ve hesaplarını ölç")
+    parser.add_argument('--db', help="ölçülecek veritabanı (varsayılan: sentetik bench_SATIR_TOHUM.db)")
+    parser.add_argument('--generate', type=int, metavar='SATIR',
+                        help="--db yoksa bu kadar kayıtlık sentetik veritabanı üret")
+    parser.add_argument('--seed', type=int, default=0, help="sentetik veri tohumu")
+    parser.add_argument('--end-date', type=datetime.date.fromisoformat, default=datetime.date(2024, 12, 31),
+                        help="sentetik verinin son günü (sabit tutulursa sonuçlar karşılaştırılabilir)")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--only', action='append', help="yalnızca adı bu metni içeren durumlar")
+    parser.add_argument('--json', dest='json_path', help="sonuçların yazılacağı JSON dosyası")
+    parser.add_argument('--compare', help="karşılaştırılacak önceki JSON sonucu")
+    args = parser.parse_args(argv)
+
+    db_path = args.db
+    if db_path is None:
+        rows = args.generate or 100000
+        db_path = f"bench_{rows}_{args.seed}.db"
+    if not os.path.exists(db_path):
+        if not args.generate and args.db:
+            print(f"Hata: veritabanı bulunamadı: {db_path}", file=sys.stderr)
+            return 1
+        import synthetic_data
+        rows = args.generate or 100000
+        print(f"{rows} kayıtlık sentetik veritabanı üretiliyor: {db_path}")
+        synthetic_data.generate(db_path, rows, args.seed, end_date=args.end_date)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            previous = json.load(f)
+        baseline = previous['cases']
+
+    header = f"{'durum':<36} {'ortanca':>10} {'en kısa':>10} {'p95':>10}"
+    if baseline:
+        header += f" {'önceki':>10} {'fark':>8}"
+    print(header + "  (ms)")
+    result = run(db_path, args.repeat, args.only,
+                 progress=lambda name, stats: print(format_case(name, stats, baseline.get(name))))
+
+    env = result['environment']
+    if args.compare and previous['environment']['rows'] != env['rows']:
+        print("Uyarı: önceki sonuç farklı boyutta bir veritabanında alınmış", file=sys.stderr)
+    print(f"\n{env['rows']} kayıt, bugün={result['today']}, Python {env['python']}, "
+          f"SQLite {env['sqlite']}, {env['platform']}")
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,306 @@
+"""Etkinlik geçmişinin bellekte tutulan sütunlu (columnar) kopyası
+
+Her kayıt sabit genişlikli NumPy dizilerinde tutulur: id, gün numarası
+(1970-01-01'den itibaren), süre ve sözlükle kodlanmış etkinlik adı. Etkinlik
+adları bir kez saklanır; satırlar yalnızca tamsayı kodunu taşır. Notlar
+bellekte tutulmaz, gösterilecek sayfa için SQLite'tan id ile okunur.
+Rapor, grafik ve (aramasız) kayıt görünümünün sorguları maskeler ve
+np.bincount ile satır başına Python nesnesi oluşturmadan yanıtlanır.
+"""
+import datetime
+import sys
+import threading
+
+import numpy as np
+
+import database
+import partitions
+from database import day_number, day_string
+
+LOAD_CHUNK_SIZE = 50000
+
+# Silinmiş satırlar bu oranı aşınca diziler sıkıştırılır
+COMPACT_RATIO = 0.25
+
+
+class ColumnStore:
+    """Yazmalarla eşitlenen sütunlu kayıt deposu
+
+    İş parçacığı güvenlidir: yükleme ve sorgular arka plan işçilerinde,
+    ChangeSet uygulaması Tk iş parçacığında çalışır. Yükleme sürerken gelen
+    değişiklikler biriktirilip yükleme bitince yeniden uygulanır; uygulama id
+    ile mutlak değer yazdığından anlık görüntüde zaten bulunan bir
+    değişikliği tekrar uygulamak zararsızdır.
+    """
+
+    COLUMNS = (('ids', np.int64), ('days', np.int32), ('durations', np.int32),
+               ('codes', np.int32), ('live', np.bool_))
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.loading = False
+        self.backlog = None
+        self.usable = True
+
+        self.names = []            # kod -> etkinlik adı
+        self.name_codes = {}       # etkinlik adı -> kod
+        self.size = 0
+        self.deleted = 0
+        for name, dtype in self.COLUMNS:
+            setattr(self, name, np.zeros(0, dtype=dtype))
+
+    # Yükleme ve eşitleme
+
+    def load(self, conn):
+        """Ana veritabanını ve arşiv bölümlerini sütunlara yükle
+
+        Başka bir yükleme sürüyorsa hemen False döner. Etkinlik id'leri her
+        dosyanın kendi sözlüğüne ait olduğundan kaynak başına ortak kodlara
+        çevrilir.
+        """
+        with self.lock:
+            if self.loading:
+                return False
+            self.loading = True
+            self.backlog = []
+
+        try:
+            name_codes = {}
+            chunks = {name: [] for name, _ in self.COLUMNS}
+            for names, rows in self.read_sources(conn):
+                # Kaynağın etkinlik id'si -> ortak kod tablosu
+                lookup = np.zeros(max(names, default=0) + 1, dtype=np.int32)
+                for source_id, name in names.items():
+                    lookup[source_id] = name_codes.setdefault(name, len(name_codes))
+                while True:
+                    chunk = rows.fetchmany(LOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    ids, days, durations, activity_ids = zip(*chunk)
+                    chunks['ids'].append(np.array(ids, dtype=np.int64))
+                    chunks['days'].append(np.array(days, dtype=np.int32))
+                    chunks['durations'].append(np.array(durations, dtype=np.int32))
+                    chunks['codes'].append(lookup[np.array(activity_ids, dtype=np.int64)])
+                    chunks['live'].append(np.ones(len(chunk), dtype=np.bool_))
+            names = list(name_codes)
+
+            columns = {name: np.concatenate(chunks[name]) if chunks[name] else np.zeros(0, dtype=dtype)
+                       for name, dtype in self.COLUMNS}
+            # Satırlar id'ye göre sıralı tutulur; yeni kayıtların id'si hep büyüktür
+            order = np.argsort(columns['ids'], kind='stable')
+            columns = {name: column[order] for name, column in columns.items()}
+        except BaseException:
+            with self.lock:
+                self.loading = False
+                self.backlog = None
+            raise
+
+        with self.lock:
+            for name, column in columns.items():
+                setattr(self, name, column)
+            self.size = len(columns['ids'])
+            self.deleted = 0
+            self.names, self.name_codes = names, name_codes
+            self.usable = True
+            self.loaded = True
+            self.loading = False
+            backlog, self.backlog = self.backlog, None
+            for change in backlog:
+                self.apply_locked(change)
+        return True
+
+    def read_sources(self, conn):
+        """Her kaynak için ({etkinlik id: ad}, imleç) ikilisi"""
+        for source in partitions.sources(conn):
+            schema = source if source == 'main' else partitions.attach(conn, *source)
+            names = dict(conn.execute(f"SELECT id, name FROM {schema}.activity_names"))
+            yield names, conn.execute(
+                f"SELECT id, day, duration, activity_id FROM {schema}.activity_entries")
+
+    def invalidate(self):
+        with self.lock:
+            self.loaded = False
+
+    def apply(self, change):
+        """Onaylanmış bir yazmanın ChangeSet'ini sütunlara uygula"""
+        with self.lock:
+            if self.backlog is not None:
+                self.backlog.append(change)
+            if self.loaded:
+                self.apply_locked(change)
+
+    def apply_locked(self, change):
+        if change.full:
+            self.loaded = False
+            return
+        for row in change.removed:
+            position = self.position(row[0])
+            if position is not None and self.live[position]:
+                self.live[position] = False
+                self.deleted += 1
+        for record_id, date, activity, duration in change.added:
+            try:
+                day = day_number(str(date))
+            except ValueError:
+                self.usable = False
+                continue
+            code = self.name_codes.setdefault(str(activity), len(self.name_codes))
+            if code == len(self.names):
+                self.names.append(str(activity))
+            position = self.position(record_id)
+            if position is None:
+                position = self.append(record_id)
+            elif not self.live[position]:
+                self.deleted -= 1
+            self.days[position] = day
+            self.durations[position] = int(duration)
+            self.codes[position] = code
+            self.live[position] = True
+
+        if self.deleted > COMPACT_RATIO * max(self.size, 1):
+            self.compact()
+
+    def position(self, record_id):
+        """id'nin dizideki konumu ya da None"""
+        position = int(np.searchsorted(self.ids[:self.size], record_id))
+        if position < self.size and self.ids[position] == record_id:
+            return position
+        return None
+
+    def append(self, record_id):
+        """Sona yeni bir satır ekle (gerekirse kapasiteyi ikiye katla)"""
+        if record_id <= (self.ids[self.size - 1] if self.size else -1):
+            # AUTOINCREMENT sayesinde olmaz; olursa id sırası bozulacağından
+            # depo bir sonraki kullanımda yeniden yüklenir
+            self.loaded = False
+        if self.size == len(self.ids):
+            capacity = max(16, 2 * len(self.ids))
+            for name, _ in self.COLUMNS:
+                column = getattr(self, name)
+                grown = np.zeros(capacity, dtype=column.dtype)
+                grown[:self.size] = column[:self.size]
+                setattr(self, name, grown)
+        position = self.size
+        self.ids[position] = record_id
+        self.size += 1
+        return position
+
+    def compact(self):
+        """Silinmiş satırları dizilerden çıkar"""
+        keep = self.live[:self.size]
+        for name, _ in self.COLUMNS:
+            setattr(self, name, getattr(self, name)[:self.size][keep].copy())
+        self.size = len(self.ids)
+        self.deleted = 0
+
+    # Sorgular
+
+    def mask(self, start=None, end=None):
+        """Canlı ve [start, end] tarih aralığındaki satırlar"""
+        mask = self.live[:self.size].copy()
+        days = self.days[:self.size]
+        if start is not None:
+            mask &= days >= day_number(start)
+        if end is not None:
+            mask &= days <= day_number(end)
+        return mask
+
+    def activity_totals(self, start=None, end=None):
+        """Aralıktaki etkinlik toplamları: (etkinlik, dakika, oturum), süreye göre azalan"""
+        with self.lock:
+            mask = self.mask(start, end)
+            codes = self.codes[:self.size][mask]
+            minutes = np.bincount(codes, weights=self.durations[:self.size][mask],
+                                  minlength=len(self.names))
+            sessions = np.bincount(codes, minlength=len(self.names))
+            names = list(self.names)
+        order = np.argsort(-minutes, kind='stable')
+        return [(names[code], int(minutes[code]), int(sessions[code]))
+                for code in order if sessions[code]]
+
+    def daily_totals(self, start, end):
+        """Aralıktaki günlerin toplam dakikaları: {tarih: dakika}"""
+        with self.lock:
+            mask = self.mask(start, end)
+            offsets = self.days[:self.size][mask] - day_number(start)
+            minutes = np.bincount(offsets, weights=self.durations[:self.size][mask],
+                                  minlength=day_number(end) - day_number(start) + 1)
+        first = datetime.date.fromisoformat(start)
+        return {(first + datetime.timedelta(days=offset)).isoformat(): int(total)
+                for offset, total in enumerate(minutes) if total}
+
+    def records_page(self, conn, key=None, older=True, limit=200):
+        """(tarih, id) sıralamasında key'den önceki/sonraki limit kayıt
+
+        Sıralama yeniden eskiye (older) ya da eskiden yeniye olur. Arşiv
+        bölümlerindeki kayıtlar da döner; notlar sayfa için SQLite'tan okunur.
+        """
+        with self.lock:
+            mask = self.live[:self.size].copy()
+            # (gün, id) çiftini tek bir int64 anahtara sığdır
+            keys = (self.days[:self.size].astype(np.int64) << 32) | self.ids[:self.size]
+            if key is not None:
+                edge = (day_number(str(key[0])) << 32) | int(key[1])
+                mask &= keys < edge if older else keys > edge
+            candidates = np.flatnonzero(mask)
+            candidate_keys = keys[candidates] if older else -keys[candidates]
+            if len(candidates) > limit:
+                top = np.argpartition(-candidate_keys, limit - 1)[:limit]
+                candidates, candidate_keys = candidates[top], candidate_keys[top]
+            selected = candidates[np.argsort(-candidate_keys, kind='stable')]
+            rows = [(int(self.ids[i]), day_string(self.days[i]), self.names[self.codes[i]],
+                     int(self.durations[i])) for i in selected]
+
+        notes = {}
+        if rows:
+            dates = [row[1] for row in rows]
+            notes = dict(partitions.query(
+                conn, f"SELECT id, notes FROM {{db}}.activity_entries "
+                      f"WHERE id IN ({','.join('?' * len(rows))})",
+                [row[0] for row in rows], start_date=min(dates), end_date=max(dates)))
+        return [row + (notes.get(row[0]),) for row in rows]
+
+    # Bellek ölçümü
+
+    def memory_usage(self):
+        """(toplam bayt, satır başına bayt): sütunlar ve etkinlik sözlüğü"""
+        with self.lock:
+            total = sum(getattr(self, name).nbytes for name, _ in self.COLUMNS)
+            total += sys.getsizeof(self.names) + sys.getsizeof(self.name_codes)
+            total += sum(sys.getsizeof(name) for name in self.names)
+            rows = self.size
+        return total, total / max(rows, 1)
+
+
+def tuple_row_bytes(rows):
+    """SQLite'tan gelen satır demetlerinin ortalama bellek maliyeti
+
+    Demetin kendisi ve içindeki her nesne sayılır; küçük tamsayılar gibi
+    paylaşılan nesneler de sayıldığından değer üst sınıra yakındır.
+    """
+    total = 0
+    for row in rows:
+        total += sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+    return total / max(len(rows), 1)
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Sütunlu deponun yükleme süresini ve bellek kullanımını ölç")
+    parser.add_argument('--db', default=database.DB_PATH, help="veritabanı dosyası")
+    args = parser.parse_args()
+
+    conn = database.connect_reader(args.db)
+    store = ColumnStore()
+    started = time.perf_counter()
+    store.load(conn)
+    elapsed = time.perf_counter() - started
+
+    total, per_row = store.memory_usage()
+    sample = conn.execute(f"{database.ENTRY_SELECT.format(db='main')} LIMIT 10000").fetchall()
+    print(f"Satır: {store.size}, yükleme: {elapsed:.2f} sn")
+    print(f"Sütunlu depo: {total / 1e6:.1f} MB, satır başına {per_row:.1f} bayt")
+    print(f"Demet olarak: satır başına {tuple_row_bytes(sample):.1f} bayt")
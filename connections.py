@@ -0,0 +1,98 @@
+"""Uygulamanın tek yazma bağlantısı ve yalnızca okuyan bağlantı havuzu"""
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import database
+
+# Havuzda boşta tutulan en fazla okuma bağlantısı: sorgu işçileri, dışa
+# aktarma ve diğer arka plan işleri aynı anda okuyabilsin
+READ_POOL_SIZE = 4
+
+
+class ConnectionManager:
+    """Bir yazma bağlantısı ve yeniden kullanılan okuma bağlantıları
+
+    Yazma bağlantısı yalnızca Tk iş parçacığında kullanılır. Okuma
+    bağlantıları reader() ile ödünç alınır ve blok bitince havuza döner;
+    havuz boşsa yeni bağlantı açılır, böylece ödünç alma hiç beklemez. WAL
+    kipinde okuyucular yazarı ve birbirini engellemez. Bağlantılar açık
+    kaldığından hazırlanmış ifade önbellekleri işler arasında korunur.
+
+    Geri yüklemeden sonra reconnect() yazma bağlantısını yeniden açar ve
+    eski okuma bağlantılarını emekliye ayırır: boştakiler hemen,
+    kullanımdakiler iade edildiklerinde kapatılır.
+    """
+
+    def __init__(self, path=database.DB_PATH, pool_size=READ_POOL_SIZE, progress=None):
+        self.path = path
+        self.pool_size = pool_size
+        self.lock = threading.Lock()
+        self.idle = []
+        self.epoch = 0
+        self.opened = 0
+        self.closed = False
+        # Eski şema burada, okuyucular açılmadan önce taşınır
+        self.writer = database.connect(path, progress)
+
+    @contextmanager
+    def reader(self):
+        """Havuzdan bir okuma bağlantısı ödünç al: with manager.reader() as conn"""
+        with self.lock:
+            if self.closed:
+                raise sqlite3.ProgrammingError("bağlantı yöneticisi kapatıldı")
+            epoch = self.epoch
+            conn = self.idle.pop() if self.idle else None
+            if conn is None:
+                self.opened += 1
+        if conn is None:
+            # Bağlantı ödünç alındıkça farklı iş parçacıklarında, ama hiçbir
+            # zaman aynı anda iki iş parçacığında kullanılır
+            conn = database.connect_reader(self.path, check_same_thread=False)
+        try:
+            yield conn
+        finally:
+            self.release(conn, epoch)
+
+    def release(self, conn, epoch):
+        """Bağlantıyı havuza geri koy; eskimişse veya havuz doluysa kapat"""
+        if conn.in_transaction:
+            conn.rollback()
+        with self.lock:
+            keep = not self.closed and epoch == self.epoch and len(self.idle) < self.pool_size
+            if keep:
+                self.idle.append(conn)
+        if not keep:
+            conn.close()
+
+    def reconnect(self, progress=None):
+        """Geri yüklemeden sonra bağlantıları yenile
+
+        Yeni yazma bağlantısı açılamazsa eskisi kullanılmaya devam eder.
+        Çağıran bekleyen yazmaları önceden onaylamalıdır.
+        """
+        writer = database.connect(self.path, progress)
+        with self.lock:
+            self.epoch += 1
+            idle, self.idle = self.idle, []
+        for conn in idle:
+            conn.close()
+        self.writer.close()
+        self.writer = writer
+
+    def stats(self):
+        """(boştaki okuma bağlantısı, açılmış toplam okuma bağlantısı)"""
+        with self.lock:
+            return len(self.idle), self.opened
+
+    def close(self):
+        """Tüm bağlantıları kapat; ödünçtekiler iade edilince kapanır"""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            idle, self.idle = self.idle, []
+        for conn in idle:
+            conn.close()
+        self.writer.execute("PRAGMA optimize")
+        self.writer.close()
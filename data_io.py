@@ -0,0 +1,281 @@
+"""Aktivite kayıtlarını dosyalara aktarma ve dosyalardan alma yardımcıları"""
+import csv
+import gzip
+import io
+import json
+import os
+import re
+
+import database
+import partitions
+
+# export_csv'nin yazdığı sütun başlıkları
+CSV_COLUMNS = ['Tarih', 'Etkinlik', 'Süre (dk)', 'Notlar']
+
+# Veritabanından tek seferde okunan satır sayısı
+EXPORT_CHUNK_SIZE = 5000
+
+
+class ExportCancelled(Exception):
+    """Dışa aktarma ilerleme geri çağrısı tarafından iptal edildi"""
+
+
+def export_filter(start_date=None, end_date=None, activity=None):
+    """Dışa aktarma filtrelerinden WHERE koşulu ve parametreleri oluştur"""
+    conditions, params = [], []
+    if start_date:
+        conditions.append("e.day >= ?")
+        params.append(database.day_number(start_date))
+    if end_date:
+        conditions.append("e.day <= ?")
+        params.append(database.day_number(end_date))
+    if activity:
+        conditions.append("n.name = ?")
+        params.append(activity)
+    return ' AND '.join(conditions) or '1', params
+
+
+def export_csv(conn, path, start_date=None, end_date=None, activity=None, compress=False,
+               progress=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """Kayıtları sabit bellekle, parça parça bir CSV dosyasına yaz
+
+    Satırlar imleçten fetchmany ile okunup doğrudan tamponlu yazıcıya
+    aktarılır; tablonun tamamı hiçbir zaman bellekte tutulmaz. Ana
+    veritabanından sonra tarih aralığıyla kesişen arşiv bölümleri yeniden
+    eskiye okunur; satırlar her kaynak içinde tarihe göre azalan sıradadır.
+    compress=True ise dosya gzip ile sıkıştırılır. Her parçadan sonra
+    progress(yazılan, toplam) çağrılır; False döndürürse yarım dosya silinir
+    ve ExportCancelled yükseltilir. Yazılan satır sayısını döndürür.
+    """
+    where, params = export_filter(start_date, end_date, activity)
+    source = "{db}.activity_entries e JOIN {db}.activity_names n ON n.id = e.activity_id"
+    ranges = dict(start_date=start_date or None, end_date=end_date or None)
+    total = sum(count for count, in partitions.query(
+        conn, f"SELECT COUNT(*) FROM {source} WHERE {where}", params, **ranges))
+    # Kaynaklar teker teker okunur (aynı anda tek imleç açık kalır): önce en
+    # yeni kayıtları tutan ana veritabanı, sonra bölümler yeniden eskiye
+    sources = partitions.sources(conn, **ranges)
+    sources = sources[:1] + sources[:0:-1]
+    sql = f'''
+        SELECT date(e.day + {database.UNIX_EPOCH_JULIANDAY}), n.name, e.duration, e.notes
+        FROM {source}
+        WHERE {where}
+        ORDER BY e.day DESC
+    '''
+
+    opener = gzip.open if compress else open
+    written = 0
+    cursor = None
+    try:
+        # Başlık ve kodlama önceki pandas çıktısıyla aynı kalır
+        with opener(path, 'wt', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f, lineterminator=os.linesep)
+            writer.writerow(CSV_COLUMNS)
+            for item in sources:
+                schema = item if item == 'main' else partitions.attach(conn, *item)
+                cursor = conn.execute(sql.format(db=schema), params)
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    writer.writerows(rows)
+                    written += len(rows)
+                    if progress is not None and progress(written, total) is False:
+                        raise ExportCancelled()
+                cursor = None
+    except BaseException:
+        if cursor is not None:
+            cursor.close()
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    return written
+
+
+# İçe aktarmada tek executemany çağrısıyla eklenen satır sayısı
+IMPORT_CHUNK_SIZE = 50000
+
+# Sonuçta ayrıntısı saklanan en fazla reddedilen satır sayısı
+MAX_REPORTED_REJECTS = 1000
+
+# Kabul edilen alan adları: export_csv başlıkları veya İngilizce karşılıkları
+FIELD_ALIASES = {
+    'Tarih': 'date', 'date': 'date',
+    'Etkinlik': 'activity', 'activity': 'activity',
+    'Süre (dk)': 'duration', 'duration': 'duration',
+    'Notlar': 'notes', 'notes': 'notes',
+}
+
+RECORD_FIELDS = ('date', 'activity', 'duration', 'notes')
+
+DATE_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+# Dosya boyutundan satır sayısı tahmini için ortalama satır uzunluğu (bayt)
+IMPORT_BYTES_PER_ROW = 40
+
+
+class ImportCancelled(Exception):
+    """İçe aktarma ilerleme geri çağrısı tarafından iptal edildi"""
+
+
+class ImportResult:
+    """İçe aktarma özeti: eklenen ve reddedilen satırlar"""
+
+    def __init__(self):
+        self.inserted = 0
+        self.rejected = 0
+        self.rejects = []   # (satır numarası, neden), en fazla MAX_REPORTED_REJECTS
+
+    def reject(self, line_no, reason):
+        self.rejected += 1
+        if len(self.rejects) < MAX_REPORTED_REJECTS:
+            self.rejects.append((line_no, reason))
+
+
+def open_text(path):
+    """Dosyayı (gerekirse gzip'ten açarak) metin olarak aç
+
+    İlerleme için okunan bayt sayısını veren ham dosya nesnesini de döndürür.
+    """
+    raw = open(path, 'rb')
+    binary = gzip.GzipFile(fileobj=raw) if path.endswith('.gz') else raw
+    return raw, io.TextIOWrapper(binary, encoding='utf-8-sig', newline='')
+
+
+def read_records(path, text):
+    """Dosyadaki kayıtları (satır numarası, alanlar) olarak akışla oku
+
+    Alanlar RECORD_FIELDS sırasında bir demettir; okunamayan satırlar için
+    None verilir. .jsonl/.ndjson uzantılı dosyalar JSON Lines, diğerleri CSV
+    kabul edilir.
+    """
+    name = path[:-3] if path.endswith('.gz') else path
+    if name.endswith(('.jsonl', '.ndjson')):
+        for line_no, line in enumerate(text, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield line_no, None
+                continue
+            if not isinstance(record, dict):
+                yield line_no, None
+                continue
+            record = {FIELD_ALIASES.get(key, key): value for key, value in record.items()}
+            yield line_no, tuple(record.get(field) for field in RECORD_FIELDS)
+    else:
+        reader = csv.reader(text)
+        header = next(reader, None)
+        if header is None:
+            return
+        fields = [FIELD_ALIASES.get(name.strip(), name.strip()) for name in header]
+        # Her alanın sütun konumu; satır başına sözlük kurmaktan kaçınır
+        positions = [fields.index(field) if field in fields else None
+                     for field in RECORD_FIELDS]
+        for line_no, values in enumerate(reader, 2):
+            if not values:
+                continue
+            width = len(values)
+            yield line_no, tuple(values[i] if i is not None and i < width else None
+                                 for i in positions)
+
+
+def validate_record(fields, valid_dates):
+    """Kaydı doğrula ve eklenecek (gün numarası, etkinlik, süre, notlar) satırını döndür
+
+    Geçersizse ValueError yükseltir. Doğrulanmış tarihler valid_dates
+    sözlüğünde gün numaralarıyla tutulur, böylece tekrarlanan tarihler
+    yeniden ayrıştırılmaz.
+    """
+    if fields is None:
+        raise ValueError("satır okunamadı")
+
+    date, activity, duration, notes = fields
+    if not isinstance(date, str):
+        raise ValueError(f"geçersiz tarih: {date!r}")
+    day = valid_dates.get(date)
+    if day is None:
+        if not DATE_PATTERN.fullmatch(date):
+            raise ValueError(f"geçersiz tarih: {date!r}")
+        day = valid_dates[date] = database.day_number(date)
+
+    if not isinstance(activity, str) or not activity.strip():
+        raise ValueError("etkinlik adı boş")
+
+    # JSON'daki true/false ve 5.5 gibi küsuratlı süreler sessizce int'e çevrilmesin
+    if isinstance(duration, bool) or (isinstance(duration, float) and not duration.is_integer()):
+        raise ValueError(f"geçersiz süre: {duration!r}")
+    try:
+        duration = int(duration)
+    except (TypeError, ValueError):
+        raise ValueError(f"geçersiz süre: {duration!r}")
+    if duration <= 0:
+        raise ValueError(f"süre pozitif olmalı: {duration}")
+
+    if notes is not None and not isinstance(notes, str):
+        notes = str(notes)
+    return day, activity.strip(), duration, notes
+
+
+def import_file(conn, path, progress=None, chunk_size=IMPORT_CHUNK_SIZE):
+    """CSV veya JSON Lines dosyasındaki kayıtları toplu olarak ekle
+
+    Dosya akışla okunur, satırlar doğrulanıp chunk_size'lık parçalar halinde
+    executemany ile tek bir işlem içinde eklenir. Arama indeksi ve günlük
+    toplamlar satır başına tetikleyiciler yerine sonda küme olarak
+    güncellenir. Herhangi bir hata tüm içe aktarmayı geri alır; geçersiz
+    satırlar ise atlanıp ImportResult içinde raporlanır. Dosya mevcut
+    tabloya göre büyükse ikincil indeksler yükleme boyunca kaldırılır.
+    progress(okunan bayt, toplam bayt) her parçadan sonra çağrılır; False
+    döndürürse işlem geri alınır ve ImportCancelled yükseltilir.
+    """
+    result = ImportResult()
+    total_bytes = os.path.getsize(path)
+    valid_dates = {}
+    activity_ids = {}
+    insert_sql = "INSERT INTO activity_entries (day, activity_id, duration, notes) VALUES (?, ?, ?, ?)"
+
+    estimated_rows = total_bytes // IMPORT_BYTES_PER_ROW
+    if path.endswith('.gz'):
+        estimated_rows *= 4
+    existing_rows = conn.execute("SELECT COUNT(*) FROM activity_entries").fetchone()[0]
+
+    raw, text = open_text(path)
+    try:
+        after_id = database.begin_bulk_load(
+            conn, drop_indexes=estimated_rows >= existing_rows)
+        try:
+            chunk = []
+            for line_no, fields in read_records(path, text):
+                try:
+                    day, activity, duration, notes = validate_record(fields, valid_dates)
+                except ValueError as e:
+                    result.reject(line_no, str(e))
+                    continue
+                activity_id = activity_ids.get(activity)
+                if activity_id is None:
+                    activity_id = activity_ids[activity] = database.activity_id(conn, activity)
+                chunk.append((day, activity_id, duration, notes))
+
+                if len(chunk) >= chunk_size:
+                    conn.executemany(insert_sql, chunk)
+                    result.inserted += len(chunk)
+                    chunk = []
+                    if progress is not None and progress(raw.tell(), total_bytes) is False:
+                        raise ImportCancelled()
+
+            if chunk:
+                conn.executemany(insert_sql, chunk)
+                result.inserted += len(chunk)
+            database.finish_bulk_load(conn, after_id)
+        except BaseException:
+            conn.rollback()
+            database.end_bulk_load(conn)
+            raise
+    finally:
+        text.close()
+
+    if progress is not None:
+        progress(total_bytes, total_bytes)
+    return result
@@ -0,0 +1,814 @@
+"""Aktivite veritabanı için SQLite depolama yardımcıları"""
+import datetime
+import os
+import pathlib
+import sqlite3
+
+import instrumentation
+
+DB_PATH = 'activities.db'
+
+# Depolama profili: WAL günlüğü ve okuma ağırlıklı iş yüküne uygun ayarlar
+STORAGE_PRAGMAS = (
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),     # WAL ile güvenli, her commit'te fsync yok
+    ('cache_size', -16000),        # ~16 MB sayfa önbelleği
+    ('mmap_size', 268435456),      # 256 MB bellek eşlemeli okuma
+    ('temp_store', 'MEMORY'),
+)
+
+# Bağlantı başına hazırlanmış ifade önbelleği. Uygulama 70 kadar farklı SQL
+# metni çalıştırır; arşiv bölümlerine giden sorgular her bölüm için ayrı
+# metin olduğundan yıllarca arşivle de hepsi önbellekte kalsın diye
+# sqlite3'ün varsayılanı (128) yerine
+STATEMENT_CACHE_SIZE = 256
+
+# Şema sürümü PRAGMA user_version'da tutulur
+SCHEMA_VERSION = 2
+
+# Şema geçişinde tek işlemde kopyalanan satır sayısı
+MIGRATION_BATCH_SIZE = 50000
+
+# Gün numaraları 1970-01-01'den itibaren sayılır; SQLite'ta
+# julianday - UNIX_EPOCH_JULIANDAY gün numarasını verir
+EPOCH = datetime.date(1970, 1, 1)
+UNIX_EPOCH_JULIANDAY = 2440587.5
+
+# Yedekleme ve geri yüklemede her adımda kopyalanan sayfa sayısı
+BACKUP_PAGES_PER_STEP = 256
+
+# Uygulamanın sorgularını karşılayan kapsayan indeksler
+INDEXES = (
+    ('idx_entries_day_activity_duration', 'activity_entries(day, activity_id, duration)'),
+    ('idx_entries_activity_day', 'activity_entries(activity_id, day, duration)'),
+    ('idx_entries_day_id', 'activity_entries(day, id)'),
+)
+
+# Kayıt satırlarını eski sütun adlarıyla (id, tarih, etkinlik, süre, notlar) okuyan
+# SELECT; {db} ana veritabanı veya arşiv bölümünün şema adıdır (partitions.query)
+ENTRY_SELECT = f'''
+    SELECT e.id, date(e.day + {UNIX_EPOCH_JULIANDAY}), n.name, e.duration, e.notes
+    FROM {{db}}.activity_entries e JOIN {{db}}.activity_names n ON n.id = e.activity_id
+'''
+
+# EXPLAIN QUERY PLAN ile denetlenen uygulama sorguları: (ad, sql, örnek parametreler)
+PLAN_CHECKS = (
+    ('generate_report', '''
+        SELECT n.name, SUM(t.total_minutes), SUM(t.sessions)
+        FROM daily_totals t JOIN activity_names n ON n.id = t.activity_id
+        WHERE t.day >= ? GROUP BY t.activity_id
+    ''', (10957,)),
+    ('create_line_chart', '''
+        SELECT day, SUM(total_minutes) FROM daily_totals
+        WHERE day >= ? AND day <= ? GROUP BY day
+    ''', (10957, 10986)),
+    ('update_daily_summary', "SELECT SUM(total_minutes) FROM daily_totals WHERE day = ?",
+     (10957,)),
+    ('refresh_records', f'''
+        {ENTRY_SELECT}
+        WHERE 1 AND (e.day, e.id) < (?, ?) ORDER BY e.day DESC, e.id DESC LIMIT ?
+    ''', (10957, 0, 200)),
+    ('load_activity_suggestions', '''
+        SELECT n.name, SUM(t.sessions), MAX(t.day)
+        FROM daily_totals t JOIN activity_names n ON n.id = t.activity_id
+        GROUP BY t.activity_id
+    ''', ()),
+    ('rebuild_rollup', '''
+        SELECT day, activity_id, SUM(duration), COUNT(*) FROM activity_entries
+        GROUP BY day, activity_id
+    ''', ()),
+)
+
+# Tüm tabloyu özetleyen, taranması beklenen denetimler; diğerleri gün aralıklıdır
+WHOLE_TABLE_CHECKS = ('load_activity_suggestions', 'rebuild_rollup')
+
+
+def apply_storage_profile(conn):
+    """Bağlantıya depolama profilindeki pragmaları uygula"""
+    for name, value in STORAGE_PRAGMAS:
+        conn.execute(f"PRAGMA {name} = {value}")
+
+
+def init_schema(conn, progress=None):
+    """Şemayı oluştur veya son sürüme taşı, indeksleri ve türetilmiş tabloları hazırla"""
+    migrate(conn, progress)
+    create_indexes(conn)
+    init_search_index(conn)
+    init_rollup(conn)
+    conn.commit()
+
+
+class MigrationError(Exception):
+    """Şema geçişi tamamlanamadı; veritabanı önceki sürümünde kaldı"""
+
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn, progress=None):
+    """PRAGMA user_version'dan sonraki şema geçişlerini sırayla uygula
+
+    Her geçiş yeni sürüm numarasıyla birlikte onaylanır; yarıda kesilen bir
+    geçiş bir sonraki açılışta yeniden çalışır. Uzun geçişler
+    progress(yapılan, toplam) çağırır. Uygulanan geçiş sayısını döndürür.
+    """
+    version = schema_version(conn)
+    if version > SCHEMA_VERSION:
+        raise MigrationError(f"veritabanı bu uygulamadan yeni bir şemada (v{version})")
+
+    applied = 0
+    for target, step in MIGRATIONS:
+        if version < target:
+            step(conn, progress)
+            conn.execute(f"PRAGMA user_version = {target}")
+            conn.commit()
+            version = target
+            applied += 1
+    return applied
+
+
+def needs_migration(path=DB_PATH):
+    """Dosya var ve şeması eski mi (açılışta ilerleme göstermek için)"""
+    if not os.path.exists(path):
+        return False
+    conn = sqlite3.connect(path)
+    try:
+        return schema_version(conn) < SCHEMA_VERSION and conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'activities'"
+        ).fetchone() is not None
+    finally:
+        conn.close()
+
+
+def migrate_v1(conn, progress=None):
+    """Sürüm 1: sürüm numarası öncesi şemanın ayar ve arşiv tabloları"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS settings (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+    ''')
+
+    # Arşivlenmiş yıllar: her yılın kayıtları ayrı bir veritabanı dosyasında
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS partitions (
+            year INTEGER PRIMARY KEY,
+            path TEXT NOT NULL
+        )
+    ''')
+
+
+def migrate_v2(conn, progress=None):
+    """Sürüm 2: tamsayı gün numaraları ve activity_names sözlüğü
+
+    Kayıtlar activity_entries'te gün numarası ve etkinlik id'si ile tutulur.
+    Eski activities tablosu varsa parçalar halinde kopyalanır, ardından tek
+    bir işlemde kaldırılıp yerine aynı adlı uyumluluk görünümü kurulur;
+    böylece eski yedekler geri yüklendiğinde de aynı yoldan taşınır.
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS activity_names (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS activity_entries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            day INTEGER NOT NULL,
+            activity_id INTEGER NOT NULL REFERENCES activity_names(id),
+            duration INTEGER NOT NULL,
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    legacy = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'activities'"
+    ).fetchone()
+    if legacy:
+        copy_legacy_activities(conn, progress)
+        # Arşiv bölümleri de aynı şemaya taşınır
+        import partitions
+        for _, path in partitions.list_partitions(conn):
+            if os.path.exists(path):
+                archive = connect(path)
+                archive.execute("PRAGMA journal_mode = DELETE")
+                archive.close()
+
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    if legacy:
+        # Silinmiş en büyük id'ler yeniden kullanılmasın
+        sequence = conn.execute(
+            "SELECT MAX(seq) FROM sqlite_sequence WHERE name IN ('activities', 'activity_entries')"
+        ).fetchone()[0]
+        conn.execute("DROP TABLE activities")
+        if sequence is not None:
+            conn.execute("DELETE FROM sqlite_sequence WHERE name = 'activity_entries'")
+            conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('activity_entries', ?)",
+                         (sequence,))
+    conn.execute("DROP TABLE IF EXISTS daily_activity_totals")
+    init_rollup(conn)
+    create_compat_views(conn)
+
+
+MIGRATIONS = (
+    (1, migrate_v1),
+    (2, migrate_v2),
+)
+
+
+def legacy_day(date):
+    """Eski şemadaki serbest biçimli tarih metnini gün numarasına çevir ya da None"""
+    for pattern in ('%Y-%m-%d', '%d.%m.%Y'):
+        try:
+            return (datetime.datetime.strptime(str(date).strip(), pattern).date() - EPOCH).days
+        except ValueError:
+            continue
+    return None
+
+
+def copy_legacy_activities(conn, progress=None, batch_size=MIGRATION_BATCH_SIZE):
+    """Eski activities satırlarını id sırasıyla parça parça activity_entries'e kopyala
+
+    Her parça ayrı onaylanır; kopyalama activity_entries'teki en büyük
+    id'den devam eder. Gün numarasına çevrilemeyen tarih varsa hiçbir şey
+    kopyalanmadan MigrationError yükseltilir.
+    """
+    # SQLite'ın okuyamadığı tarihler (ör. '2024-1-5') Python'da ayrıştırılır
+    invalid = [(row_id, date) for row_id, date in conn.execute(
+        "SELECT id, date FROM activities WHERE julianday(date(date)) IS NULL")
+        if legacy_day(date) is None]
+    if invalid:
+        sample = ', '.join(f"#{row_id} {date!r}" for row_id, date in invalid[:10])
+        raise MigrationError(f"{len(invalid)} kaydın tarihi okunamadı: {sample}")
+    conn.create_function('legacy_day', 1, legacy_day, deterministic=True)
+
+    total = conn.execute("SELECT COUNT(*) FROM activities").fetchone()[0]
+    last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM activity_entries").fetchone()[0]
+    done = conn.execute("SELECT COUNT(*) FROM activities WHERE id <= ?", (last_id,)).fetchone()[0]
+    while done < total:
+        row = conn.execute("SELECT id FROM activities WHERE id > ? ORDER BY id LIMIT 1 OFFSET ?",
+                           (last_id, batch_size - 1)).fetchone()
+        upper = row[0] if row else conn.execute("SELECT MAX(id) FROM activities").fetchone()[0]
+
+        conn.execute('''
+            INSERT OR IGNORE INTO activity_names (name)
+            SELECT DISTINCT activity FROM activities WHERE id > ? AND id <= ?
+        ''', (last_id, upper))
+        done += conn.execute(f'''
+            INSERT INTO activity_entries (id, day, activity_id, duration, notes, created_at)
+            SELECT a.id,
+                   COALESCE(CAST(julianday(date(a.date)) - {UNIX_EPOCH_JULIANDAY} AS INTEGER),
+                            legacy_day(a.date)),
+                   n.id, a.duration, a.notes, a.created_at
+            FROM activities a JOIN activity_names n ON n.name = a.activity
+            WHERE a.id > ? AND a.id <= ?
+        ''', (last_id, upper)).rowcount
+        conn.commit()
+        last_id = upper
+        if progress is not None:
+            progress(done, total)
+
+
+def create_compat_views(conn):
+    """Eski tablo adlarıyla okunup yazılabilen uyumluluk görünümleri
+
+    activities ve daily_activity_totals eski sütunları ('YYYY-AA-GG' tarih,
+    etkinlik adı) verir; activities'e yazmalar tetikleyicilerle
+    activity_entries'e aktarılır. Uygulama sorguları doğrudan tamsayı
+    sütunlu tabloları kullanır.
+    """
+    conn.execute(f'''
+        CREATE VIEW IF NOT EXISTS activities AS
+        SELECT e.id AS id, date(e.day + {UNIX_EPOCH_JULIANDAY}) AS date, n.name AS activity,
+               e.duration AS duration, e.notes AS notes, e.created_at AS created_at
+        FROM activity_entries e JOIN activity_names n ON n.id = e.activity_id
+    ''')
+    conn.execute(f'''
+        CREATE VIEW IF NOT EXISTS daily_activity_totals AS
+        SELECT date(t.day + {UNIX_EPOCH_JULIANDAY}) AS date, n.name AS activity,
+               t.total_minutes AS total_minutes, t.sessions AS sessions
+        FROM daily_totals t JOIN activity_names n ON n.id = t.activity_id
+    ''')
+
+    day = f"CAST(julianday(date(new.date)) - {UNIX_EPOCH_JULIANDAY} AS INTEGER)"
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS activities_view_insert INSTEAD OF INSERT ON activities BEGIN
+            SELECT RAISE(ABORT, 'geçersiz tarih') WHERE {day} IS NULL;
+            INSERT OR IGNORE INTO activity_names (name) VALUES (new.activity);
+            INSERT INTO activity_entries (id, day, activity_id, duration, notes, created_at)
+            VALUES (new.id, {day}, (SELECT id FROM activity_names WHERE name = new.activity),
+                    new.duration, new.notes, COALESCE(new.created_at, CURRENT_TIMESTAMP));
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS activities_view_update INSTEAD OF UPDATE ON activities BEGIN
+            SELECT RAISE(ABORT, 'geçersiz tarih') WHERE {day} IS NULL;
+            INSERT OR IGNORE INTO activity_names (name) VALUES (new.activity);
+            UPDATE activity_entries
+            SET day = {day}, activity_id = (SELECT id FROM activity_names WHERE name = new.activity),
+                duration = new.duration, notes = new.notes
+            WHERE id = old.id;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS activities_view_delete INSTEAD OF DELETE ON activities BEGIN
+            DELETE FROM activity_entries WHERE id = old.id;
+        END
+    ''')
+
+
+def day_number(date):
+    """'YYYY-AA-GG' metnini (veya date nesnesini) gün numarasına çevir"""
+    if isinstance(date, str):
+        try:
+            date = datetime.date.fromisoformat(date)
+        except ValueError:
+            raise ValueError(f"geçersiz tarih: {date!r}")
+    return (date - EPOCH).days
+
+
+def day_string(day):
+    """Gün numarasının 'YYYY-AA-GG' metni"""
+    return (EPOCH + datetime.timedelta(days=int(day))).isoformat()
+
+
+def activity_id(conn, name):
+    """Etkinlik adının id'si; sözlükte yoksa eklenir"""
+    conn.execute("INSERT OR IGNORE INTO activity_names (name) VALUES (?)", (name,))
+    return conn.execute("SELECT id FROM activity_names WHERE name = ?", (name,)).fetchone()[0]
+
+
+def init_rollup(conn):
+    """Tetikleyicilerle güncel tutulan günlük toplam tablosunu oluştur
+
+    daily_totals her (gün, etkinlik) çifti için toplam dakikayı ve oturum
+    sayısını tutar; raporlar, grafikler ve istatistikler ham satırlar yerine
+    bu tabloyu okur.
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'daily_totals'"
+    ).fetchone()
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS daily_totals (
+            day INTEGER NOT NULL,
+            activity_id INTEGER NOT NULL,
+            total_minutes INTEGER NOT NULL,
+            sessions INTEGER NOT NULL,
+            PRIMARY KEY (day, activity_id)
+        ) WITHOUT ROWID
+    ''')
+    # Eski sürümlerin (activity_id) indeksi gün aralıklı sorgularda birincil
+    # anahtar araması yerine tüm tabloyu taratıyordu
+    conn.execute("DROP INDEX IF EXISTS idx_daily_totals_activity")
+
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS rollup_insert AFTER INSERT ON activity_entries BEGIN
+            INSERT INTO daily_totals (day, activity_id, total_minutes, sessions)
+            VALUES (new.day, new.activity_id, new.duration, 1)
+            ON CONFLICT (day, activity_id) DO UPDATE SET
+                total_minutes = total_minutes + excluded.total_minutes,
+                sessions = sessions + 1;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS rollup_delete AFTER DELETE ON activity_entries BEGIN
+            UPDATE daily_totals
+            SET total_minutes = total_minutes - old.duration, sessions = sessions - 1
+            WHERE day = old.day AND activity_id = old.activity_id;
+            DELETE FROM daily_totals
+            WHERE day = old.day AND activity_id = old.activity_id AND sessions <= 0;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS rollup_update
+        AFTER UPDATE OF day, activity_id, duration ON activity_entries BEGIN
+            UPDATE daily_totals
+            SET total_minutes = total_minutes - old.duration, sessions = sessions - 1
+            WHERE day = old.day AND activity_id = old.activity_id;
+            DELETE FROM daily_totals
+            WHERE day = old.day AND activity_id = old.activity_id AND sessions <= 0;
+            INSERT INTO daily_totals (day, activity_id, total_minutes, sessions)
+            VALUES (new.day, new.activity_id, new.duration, 1)
+            ON CONFLICT (day, activity_id) DO UPDATE SET
+                total_minutes = total_minutes + excluded.total_minutes,
+                sessions = sessions + 1;
+        END
+    ''')
+
+    # Mevcut veritabanında tabloyu ilk kez doldur
+    if not exists:
+        rebuild_rollup(conn)
+
+
+def rebuild_rollup(conn):
+    """Günlük toplam tablosunu ham kayıtlardan yeniden oluştur"""
+    conn.execute("DELETE FROM daily_totals")
+    conn.execute('''
+        INSERT INTO daily_totals (day, activity_id, total_minutes, sessions)
+        SELECT day, activity_id, SUM(duration), COUNT(*) FROM activity_entries
+        GROUP BY day, activity_id
+    ''')
+
+
+def verify_rollup(conn):
+    """Günlük toplam tablosunu ham kayıtlarla karşılaştır
+
+    Uyuşmayan (gün, etkinlik id, toplam dakika, oturum) satırlarını
+    ('eksik' | 'fazla', satır) olarak döndürür; boş liste tablo doğru demektir.
+    """
+    expected = '''
+        SELECT day, activity_id, SUM(duration), COUNT(*) FROM activity_entries
+        GROUP BY day, activity_id
+    '''
+    actual = "SELECT day, activity_id, total_minutes, sessions FROM daily_totals"
+
+    mismatches = [('eksik', row) for row in conn.execute(f"{expected} EXCEPT {actual}")]
+    mismatches += [('fazla', row) for row in conn.execute(f"{actual} EXCEPT {expected}")]
+    return mismatches
+
+
+def init_search_index(conn):
+    """activity_entries ile tetikleyicilerle eşitlenen FTS5 arama tablosunu oluştur
+
+    İçerik tablosu activities uyumluluk görünümüdür; etkinlik adları
+    değişmediğinden tetikleyiciler adı activity_names'ten okuyabilir.
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'activities_fts'"
+    ).fetchone()
+
+    conn.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS activities_fts USING fts5(
+            activity, notes,
+            content='activities', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+    ''')
+
+    name = "(SELECT name FROM activity_names WHERE id = {}.activity_id)"
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS activities_fts_insert AFTER INSERT ON activity_entries BEGIN
+            INSERT INTO activities_fts(rowid, activity, notes)
+            VALUES (new.id, {name.format('new')}, new.notes);
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS activities_fts_delete AFTER DELETE ON activity_entries BEGIN
+            INSERT INTO activities_fts(activities_fts, rowid, activity, notes)
+            VALUES ('delete', old.id, {name.format('old')}, old.notes);
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS activities_fts_update
+        AFTER UPDATE OF activity_id, notes ON activity_entries BEGIN
+            INSERT INTO activities_fts(activities_fts, rowid, activity, notes)
+            VALUES ('delete', old.id, {name.format('old')}, old.notes);
+            INSERT INTO activities_fts(rowid, activity, notes)
+            VALUES (new.id, {name.format('new')}, new.notes);
+        END
+    ''')
+
+    # Mevcut veritabanında indeksi ilk kez doldur
+    if not exists:
+        conn.execute("INSERT INTO activities_fts(activities_fts) VALUES ('rebuild')")
+
+
+# Toplu eklemede satır başına çalışmayan, yerine küme olarak uygulanan tetikleyiciler
+BULK_LOAD_TRIGGERS = ('activities_fts_insert', 'rollup_insert')
+
+# Toplu yükleme sırasında kullanılan sayfa önbelleği (~256 MB)
+BULK_LOAD_CACHE_SIZE = -262144
+
+
+def create_indexes(conn):
+    """INDEXES içindeki ikincil indeksleri oluştur"""
+    for name, definition in INDEXES:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}")
+
+
+def begin_bulk_load(conn, drop_indexes=False):
+    """Toplu ekleme işlemini başlat ve mevcut en büyük id'yi döndür
+
+    Açık bir yazma işlemi başlatır ve ekleme tetikleyicilerini kaldırır;
+    arama indeksi ve günlük toplamlar finish_bulk_load ile tek seferde
+    güncellenir. drop_indexes=True ise ikincil indeksler de kaldırılır ve
+    sonda sıralı olarak yeniden kurulur; tabloya göre büyük yüklemelerde bu,
+    her satırda üç B-ağacını güncellemekten hızlıdır. Hata olursa
+    conn.rollback() her şeyi geri alır.
+    """
+    conn.execute(f"PRAGMA cache_size = {BULK_LOAD_CACHE_SIZE}")
+    conn.execute("BEGIN IMMEDIATE")
+    for name in BULK_LOAD_TRIGGERS:
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+    if drop_indexes:
+        for name, _ in INDEXES:
+            conn.execute(f"DROP INDEX IF EXISTS {name}")
+    return conn.execute("SELECT COALESCE(MAX(id), 0) FROM activity_entries").fetchone()[0]
+
+
+def finish_bulk_load(conn, after_id):
+    """after_id'den sonra eklenen satırları türetilmiş tablolara işle ve onayla"""
+    conn.execute('''
+        INSERT INTO activities_fts(rowid, activity, notes)
+        SELECT e.id, n.name, e.notes
+        FROM activity_entries e JOIN activity_names n ON n.id = e.activity_id
+        WHERE e.id > ?
+    ''', (after_id,))
+    conn.execute('''
+        INSERT INTO daily_totals (day, activity_id, total_minutes, sessions)
+        SELECT day, activity_id, SUM(duration), COUNT(*) FROM activity_entries
+        WHERE id > ?
+        GROUP BY day, activity_id
+        ON CONFLICT (day, activity_id) DO UPDATE SET
+            total_minutes = total_minutes + excluded.total_minutes,
+            sessions = sessions + excluded.sessions
+    ''', (after_id,))
+
+    # Kaldırılan indeksleri ve tetikleyicileri yeniden oluştur
+    create_indexes(conn)
+    init_search_index(conn)
+    init_rollup(conn)
+    conn.commit()
+    end_bulk_load(conn)
+
+
+def end_bulk_load(conn):
+    """Toplu yükleme için büyütülen önbelleği depolama profiline döndür"""
+    conn.execute(f"PRAGMA cache_size = {dict(STORAGE_PRAGMAS)['cache_size']}")
+
+
+def fts_query(text):
+    """Arama metnini önek eşleşmeli, çok terimli bir FTS5 sorgusuna çevir
+
+    Her terim tırnaklanır ve sonuna * eklenir; terimler VE ile birleşir.
+    """
+    terms = [term.replace('"', '""') for term in text.split()]
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def records_page_query(search, key=None, older=True, limit=200):
+    """Kayıtlar görünümünün bir sayfasının (sql, parametreler) ikilisi
+
+    Satırlar (tarih, id) sırasında key'den öncekiler (older) ya da
+    sonrakilerdir; arama metni varsa FTS indeksiyle süzülür. sql {db}
+    yer tutucusu içerir: her kaynakta partitions.query ile çalıştırılır
+    (bkz. partitions.records_page).
+    """
+    condition, params = "1", []
+    query = fts_query(search)
+    if query:
+        # Tekli + id'nin birincil anahtarla aranmasını engeller: satırlar
+        # (tarih, id) indeksinden sırayla okunup eşleşme listesinde aranır ve
+        # LIMIT dolunca durulur; yoksa her sayfada tüm eşleşmeler okunup
+        # sıralanırdı. FTS rowid'leri tarih sırasında olmadığından eşleşmeler
+        # anahtarla sınırlanamaz.
+        condition = ("+e.id IN (SELECT rowid FROM {db}.activities_fts "
+                     "WHERE activities_fts MATCH ?)")
+        params = [query]
+    if key is not None:
+        condition += " AND (e.day, e.id) < (?, ?)" if older else " AND (e.day, e.id) > (?, ?)"
+        params += [day_number(str(key[0])), key[1]]
+
+    order = "DESC" if older else "ASC"
+    sql = f'''
+        {ENTRY_SELECT}
+        WHERE {condition}
+        ORDER BY e.day {order}, e.id {order}
+        LIMIT ?
+    '''
+    return sql, params + [limit]
+
+
+def entry_row(conn, record_id):
+    """Ana veritabanındaki kaydın (id, tarih, etkinlik, süre, notlar) satırı; yoksa None"""
+    return conn.execute(f"{ENTRY_SELECT.format(db='main')} WHERE e.id = ?",
+                        (record_id,)).fetchone()
+
+
+def connect(path=DB_PATH, progress=None):
+    """Depolama profili uygulanmış ve şeması son sürümde bir bağlantı aç
+
+    Şema eskiyse önce taşınır; progress geçişin ilerlemesini alır.
+    """
+    conn = sqlite3.connect(path, factory=instrumentation.Connection,
+                           cached_statements=STATEMENT_CACHE_SIZE)
+    apply_storage_profile(conn)
+    init_schema(conn, progress)
+    return conn
+
+
+def connect_reader(path=DB_PATH, check_same_thread=True):
+    """Arka plan okumaları için ayrı, yalnızca okuma yapan bir bağlantı aç
+
+    check_same_thread=False, bağlantı havuzundaki gibi sırayla farklı iş
+    parçacıklarında kullanılacak bağlantılar içindir.
+    """
+    conn = sqlite3.connect(path, factory=instrumentation.Connection,
+                           cached_statements=STATEMENT_CACHE_SIZE,
+                           check_same_thread=check_same_thread)
+    apply_storage_profile(conn)
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+def connect_readonly(path):
+    """Dosyayı hiç değiştirmeden okuyan bağlantı aç (toplu raporlar için)
+
+    Şema taşınmaz, türetilmiş tablolar kurulmaz ve günlük kipi değişmez;
+    şeması bu sürümden farklı dosyalar MigrationError ile reddedilir.
+    """
+    uri = pathlib.Path(path).resolve().as_uri() + '?mode=ro'
+    conn = sqlite3.connect(uri, uri=True, factory=instrumentation.Connection,
+                           cached_statements=STATEMENT_CACHE_SIZE)
+    try:
+        conn.execute("PRAGMA query_only = ON")
+        version = schema_version(conn)
+        if version != SCHEMA_VERSION:
+            raise MigrationError(
+                f"şema sürümü v{version}, beklenen v{SCHEMA_VERSION}; önce "
+                f"'python database.py migrate --db {path}' ile taşıyın")
+    except BaseException:
+        conn.close()
+        raise
+    return conn
+
+
+def copy_database(src, dest, pages=BACKUP_PAGES_PER_STEP, progress=None):
+    """SQLite backup API ile src bağlantısının içeriğini dest'e kopyala
+
+    Kaynakta bir okuma işlemi açık tutulur; WAL kipinde bu, kopyanın tek bir
+    anlık görüntüden alınmasını sağlar ve bu sırada yazanlar beklemez.
+    Kopya pages sayfalık adımlarla ilerler, her adımdan sonra
+    progress(kopyalanan, toplam) çağrılır.
+    """
+    def step(status, remaining, total):
+        if progress is not None:
+            progress(total - remaining, total)
+
+    src.execute("BEGIN")
+    try:
+        src.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        src.backup(dest, pages=pages, progress=step)
+    finally:
+        src.rollback()
+
+
+def backup_database(src_path, dest_path, pages=BACKUP_PAGES_PER_STEP, progress=None):
+    """Canlı veritabanının ve arşiv bölümlerinin tutarlı bir yedeğini dest_path'e yaz
+
+    Yedek önce geçici bir dosyaya yazılır ve tamamlanınca yerine taşınır,
+    böylece yarım kalmış bir kopya hiçbir zaman yedek gibi görünmez. Arşiv
+    bölümleri yedeğin yanına partitions.partition_path(dest_path, yıl) adıyla
+    kopyalanır ve yedeğin partitions tablosu bu dosyaları gösterir.
+    """
+    import partitions
+    temp_path = dest_path + '.tmp'
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+
+    src = sqlite3.connect(src_path)
+    dest = sqlite3.connect(temp_path)
+    try:
+        copy_database(src, dest, pages, progress)
+        for year, path in partitions.list_partitions(src):
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"{year} yılının arşiv dosyası bulunamadı: {path}")
+            target = partitions.partition_path(dest_path, year)
+            backup_database(path, target, pages, progress)
+            dest.execute("UPDATE partitions SET path = ? WHERE year = ?",
+                         (os.path.basename(target), year))
+        dest.commit()
+        # Yedek tek dosya olsun: WAL yerine klasik günlük kipine geç
+        dest.execute("PRAGMA journal_mode = DELETE")
+    finally:
+        dest.close()
+        src.close()
+    os.replace(temp_path, dest_path)
+
+
+def restore_database(backup_path, db_path, pages=BACKUP_PAGES_PER_STEP, progress=None):
+    """Yedeği ve arşiv bölümlerini canlı veritabanının üzerine backup API ile yaz
+
+    Kopya ayrı bir bağlantıyla yapılır; uygulamanın açık bağlantıları
+    kapatılmadan yeni içeriği görür. Bölümler ana dosyadan önce
+    veritabanının yanındaki yıl dosyalarına yazılır. Bölüm dosyalarını
+    içermeyen eski yedeklerde, yanında aynı yılın arşivi bulunuyorsa o
+    kullanılır (arşivler değişmez).
+    """
+    import partitions
+    src = sqlite3.connect(backup_path)
+    dest = sqlite3.connect(db_path)
+    try:
+        archives = partitions.list_partitions(src)
+        for year, path in archives:
+            target = partitions.partition_path(db_path, year)
+            if os.path.exists(target) and os.path.exists(path) and os.path.samefile(path, target):
+                continue
+            if os.path.exists(path):
+                restore_database(path, target, pages, progress)
+            elif not os.path.exists(target):
+                raise FileNotFoundError(f"{year} yılının arşiv dosyası yedekte yok: {path}")
+        copy_database(src, dest, pages, progress)
+        for year, _ in archives:
+            dest.execute("UPDATE partitions SET path = ? WHERE year = ?",
+                         (os.path.basename(partitions.partition_path(db_path, year)), year))
+        dest.commit()
+    finally:
+        dest.close()
+        src.close()
+
+
+def check_query_plans(conn):
+    """Uygulama sorgularının indeks kullanıp kullanmadığını denetle
+
+    {sorgu adı: (indeks kullanıyor mu, plan satırları)} döndürür. Tabloyu
+    indeks olmadan baştan sona tarayan sorgular False ile işaretlenir. Günlük
+    toplam tablosunun bir indeksle bile taranması da hatadır: gün aralıklı
+    sorgular birincil anahtarda aralık araması yapmalıdır. WHOLE_TABLE_CHECKS
+    zaten tüm tabloyu okur ve denetlenmez.
+    """
+    results = {}
+    for name, sql, params in PLAN_CHECKS:
+        plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql.format(db='main')}",
+                                               params)]
+        scans = [detail.split() for detail in plan if detail.startswith('SCAN')]
+        full_scan = name not in WHOLE_TABLE_CHECKS and any(
+            'INDEX' not in words or words[1] in ('daily_totals', 't') for words in scans)
+        results[name] = (not full_scan, plan)
+    return results
+
+
+class ChangeSet:
+    """Bir yazma işleminin dokunduğu satırların kaydı
+
+    Satırlar (id, tarih, etkinlik, süre) demetleri olarak tutulur; düzenleme
+    eski satırın çıkarılıp yenisinin eklenmesi olarak kaydedilir. full=True
+    tüm verinin değişmiş olabileceğini belirtir (ör. geri yükleme sonrası).
+    """
+
+    def __init__(self, full=False):
+        self.full = full
+        self.added = []
+        self.removed = []
+
+    @classmethod
+    def everything(cls):
+        """Tüm görünümleri etkileyen değişiklik"""
+        return cls(full=True)
+
+    def insert(self, row):
+        self.added.append(row)
+        return self
+
+    def delete(self, row):
+        self.removed.append(row)
+        return self
+
+    def update(self, old_row, new_row):
+        self.removed.append(old_row)
+        self.added.append(new_row)
+        return self
+
+    @property
+    def dates(self):
+        return {row[1] for row in self.added + self.removed}
+
+    @property
+    def activities(self):
+        return {row[2] for row in self.added + self.removed}
+
+    def touches_range(self, start, end=None):
+        """Değişiklik [start, end] tarih aralığına ('YYYY-MM-DD') düşüyor mu"""
+        if self.full:
+            return True
+        return any(start <= date and (end is None or date <= end) for date in self.dates)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Şemayı taşı, günlük toplam tablosunu doğrula veya yeniden oluştur")
+    parser.add_argument('command', choices=['migrate', 'verify', 'rebuild'])
+    parser.add_argument('--db', default=DB_PATH, help="veritabanı dosyası")
+    args = parser.parse_args()
+
+    # Bağlantı açılırken eski şema taşınır
+    conn = connect(args.db, progress=lambda done, total: print(f"{done}/{total} kayıt taşındı"))
+    if args.command == 'migrate':
+        print(f"Şema sürümü: {schema_version(conn)}")
+    elif args.command == 'rebuild':
+        with conn:
+            rebuild_rollup(conn)
+        print("Günlük toplam tablosu yeniden oluşturuldu.")
+    else:
+        mismatches = verify_rollup(conn)
+        for kind, row in mismatches:
+            print(f"{kind}: {row}")
+        print(f"{len(mismatches)} uyuşmazlık bulundu.")
+        raise SystemExit(1 if mismatches else 0)
@@ -0,0 +1,224 @@
+"""SQL ifadelerinin ve arayüz işlemlerinin süre ölçümü
+
+Ölçüm kapalıyken her çağrı yalnızca bir bayrak denetimine mal olur. Açıkken
+her işlem adı için çağrı ve satır sayıları ile son RING_SIZE sürenin halka
+tamponu tutulur; SLOW_THRESHOLD_MS'i aşan işlemler yavaş işlem günlüğüne
+yazılır. SQL ifadeleri, database.connect'in kullandığı Connection sınıfı
+üzerinden ölçülür; süre ifadenin ilk satıra kadar çalışmasıdır, satırlar
+okundukça sayılır.
+"""
+import collections
+import functools
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+# İşlem başına saklanan en son süre sayısı
+RING_SIZE = 512
+
+# Bu süreyi (ms) aşan işlemler günlüğe yazılır
+SLOW_THRESHOLD_MS = 100
+
+SLOW_LOG_PATH = 'slow_operations.log'
+
+# Günlükte ve panelde SQL ifadesinin gösterilen uzunluğu
+SQL_LABEL_LENGTH = 100
+
+logger = logging.getLogger('activity_tracker')
+
+
+class Metric:
+    """Tek bir işlemin sayaçları ve son sürelerinin halka tamponu (ms)"""
+
+    __slots__ = ('calls', 'rows', 'total_ms', 'max_ms', 'durations')
+
+    def __init__(self):
+        self.calls = 0
+        self.rows = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.durations = collections.deque(maxlen=RING_SIZE)
+
+
+class Recorder:
+    """İşlem adına göre süre, satır ve çağrı sayısı toplayıcı (iş parçacığı güvenli)"""
+
+    def __init__(self, enabled=False, slow_ms=SLOW_THRESHOLD_MS, log_path=SLOW_LOG_PATH):
+        self.enabled = enabled
+        self.slow_ms = slow_ms
+        self.log_path = log_path
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def record(self, name, seconds, rows=None):
+        """Bir işlemin süresini (saniye) ve varsa satır sayısını kaydet"""
+        ms = seconds * 1000
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = Metric()
+            metric.calls += 1
+            metric.total_ms += ms
+            metric.max_ms = max(metric.max_ms, ms)
+            metric.durations.append(ms)
+            if rows:
+                metric.rows += rows
+        if ms >= self.slow_ms:
+            log_handler(self.log_path)
+            logger.warning("yavaş işlem: %.1f ms%s: %s", ms,
+                           f", {rows} satır" if rows else "", name)
+
+    def add_rows(self, name, rows):
+        """Daha önce kaydedilmiş bir işlemin okunan satırlarını ekle"""
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is not None:
+                metric.rows += rows
+
+    def reset(self):
+        with self.lock:
+            self.metrics.clear()
+
+    def snapshot(self):
+        """[(ad, çağrı, satır, ortalama, p50, p95, p99, en uzun)], toplam süreye göre azalan"""
+        with self.lock:
+            items = [(name, metric.calls, metric.rows, metric.total_ms, metric.max_ms,
+                      sorted(metric.durations)) for name, metric in self.metrics.items()]
+        items.sort(key=lambda item: item[3], reverse=True)
+        return [(name, calls, rows, total / calls, percentile(durations, 50),
+                 percentile(durations, 95), percentile(durations, 99), longest)
+                for name, calls, rows, total, longest, durations in items]
+
+
+def percentile(sorted_values, p):
+    """Sıralı değerlerin en yakın sıra yöntemiyle p. yüzdebirliği"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(rank) - 1]
+
+
+recorder = Recorder()
+
+
+# Günlük dosyası yolu -> işleyici; dosya ilk kayıtta açılır
+log_handlers = {}
+
+
+def log_handler(path):
+    """Günlüğü path dosyasına yazan işleyiciyi (bir kez) ekle"""
+    handler = log_handlers.get(path)
+    if handler is None:
+        handler = log_handlers[path] = logging.FileHandler(path, encoding='utf-8', delay=True)
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+        logger.addHandler(handler)
+    return handler
+
+
+def log_error(message, error):
+    """Arka plan işinin hatasını yavaş işlem günlüğüne yaz"""
+    log_handler(recorder.log_path)
+    logger.error("%s: %s", message, error, exc_info=error)
+
+
+@contextmanager
+def timed(name):
+    """Bloğun süresini name adıyla kaydet"""
+    if not recorder.enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.record(name, time.perf_counter() - start)
+
+
+@functools.lru_cache(maxsize=1024)
+def sql_label(sql):
+    """SQL ifadesinin tek satırlık, kısaltılmış adı"""
+    label = ' '.join(sql.split())
+    return label if len(label) <= SQL_LABEL_LENGTH else label[:SQL_LABEL_LENGTH - 1] + '…'
+
+
+class Cursor(sqlite3.Cursor):
+    """Çalıştırma süresini ve okunan satırları kaydeden imleç"""
+
+    label = None
+
+    def execute(self, sql, parameters=()):
+        if not recorder.enabled:
+            return super().execute(sql, parameters)
+        self.label = sql_label(sql)
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            recorder.record(self.label, time.perf_counter() - start,
+                            self.rowcount if self.rowcount > 0 else None)
+
+    def executemany(self, sql, seq_of_parameters):
+        if not recorder.enabled:
+            return super().executemany(sql, seq_of_parameters)
+        self.label = sql_label(sql)
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            recorder.record(self.label, time.perf_counter() - start,
+                            self.rowcount if self.rowcount > 0 else None)
+
+    def fetchone(self):
+        row = super().fetchone()
+        if self.label is not None and row is not None and recorder.enabled:
+            recorder.add_rows(self.label, 1)
+        return row
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        if self.label is not None and rows and recorder.enabled:
+            recorder.add_rows(self.label, len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        if self.label is not None and rows and recorder.enabled:
+            recorder.add_rows(self.label, len(rows))
+        return rows
+
+    def __iter__(self):
+        if self.label is None or not recorder.enabled:
+            return self
+        return self.counted_rows()
+
+    def counted_rows(self):
+        count = 0
+        try:
+            while True:
+                try:
+                    row = sqlite3.Cursor.__next__(self)
+                except StopIteration:
+                    return
+                count += 1
+                yield row
+        finally:
+            recorder.add_rows(self.label, count)
+
+
+class Connection(sqlite3.Connection):
+    """execute/executemany ifadelerini ölçülen imleçlerle çalıştıran bağlantı
+
+    Ölçüm kapalıyken doğrudan sqlite3'ün kendi imleçleri kullanılır.
+    """
+
+    def execute(self, sql, parameters=()):
+        if not recorder.enabled:
+            return super().execute(sql, parameters)
+        return self.cursor(Cursor).execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        if not recorder.enabled:
+            return super().executemany(sql, seq_of_parameters)
+        return self.cursor(Cursor).executemany(sql, seq_of_parameters)
@@ -0,0 +1,237 @@
+"""Geçmiş yılların kayıtlarını yıllık veritabanı dosyalarına bölümleme
+
+Bölümleme isteğe bağlıdır: bir yıl arşivlenene kadar tüm kayıtlar ana
+veritabanında kalır. Arşivlenen yılın kayıtları activities_YYYY.db gibi ayrı
+bir dosyaya taşınır ve ana veritabanındaki partitions tablosuna yazılır.
+Ana veritabanı her tarihi tutabilir (ör. geçmiş bir güne sonradan eklenen
+kayıt); sorgular her zaman ana veritabanını ve tarih aralığıyla kesişen
+bölümleri okur. Bölümler yalnızca gerektiğinde ATTACH edilir ve her birinin
+kendi toplamları ayrı hesaplanıp birleştirilir.
+"""
+import datetime
+import os
+import sqlite3
+
+import database
+
+# Aynı anda bağlı tutulan en fazla bölüm sayısı (SQLite varsayılan sınırı 10)
+MAX_ATTACHED_PARTITIONS = 8
+
+
+def schema_name(year):
+    return f"part_{year}"
+
+
+def partition_path(db_path, year):
+    """Ana veritabanının yanındaki yıl dosyasının yolu"""
+    base, extension = os.path.splitext(db_path)
+    return f"{base}_{year}{extension or '.db'}"
+
+
+def main_path(conn):
+    """Bağlantının ana veritabanı dosyasının yolu"""
+    for _, name, path in conn.execute("PRAGMA database_list"):
+        if name == 'main':
+            return path
+
+
+def list_partitions(conn):
+    """Arşivlenmiş yıllar: [(yıl, dosya yolu)], yola göre ana dosyanın dizininden"""
+    try:
+        rows = conn.execute("SELECT year, path FROM main.partitions ORDER BY year").fetchall()
+    except sqlite3.OperationalError:
+        return []  # Bölümleme öncesi şema
+    if not rows:
+        return []
+    directory = os.path.dirname(main_path(conn) or '')
+    return [(year, os.path.join(directory, path)) for year, path in rows]
+
+
+def attached_schemas(conn):
+    return {name for _, name, _ in conn.execute("PRAGMA database_list")}
+
+
+def attach(conn, year, path):
+    """Bölümü (bağlı değilse) bağla ve şema adını döndür
+
+    ATTACH eksik dosyayı boş bir veritabanı olarak oluştururdu ve sonraki
+    sorgular "no such table" ile düşerdi; bu yüzden dosya önce denetlenir.
+    """
+    name = schema_name(year)
+    attached = attached_schemas(conn)
+    if name not in attached:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{year} yılının arşiv dosyası bulunamadı: {path}")
+        parts = sorted(schema for schema in attached if schema.startswith('part_'))
+        if len(parts) >= MAX_ATTACHED_PARTITIONS:
+            conn.execute(f"DETACH DATABASE {parts[0]}")
+        conn.execute(f"ATTACH DATABASE ? AS {name}", (path,))
+    return name
+
+
+def sources(conn, start_date=None, end_date=None):
+    """[start_date, end_date] aralığını okumak için kaynaklar: 'main' ve (yıl, yol)
+
+    Tarihler 'YYYY-AA-GG' metinleridir; None sınırsız demektir. Aralığın
+    dışındaki yılların dosyalarına hiç dokunulmaz.
+    """
+    schemas = ['main']
+    for year, path in list_partitions(conn):
+        if start_date is not None and year < int(start_date[:4]):
+            continue
+        if end_date is not None and year > int(end_date[:4]):
+            continue
+        schemas.append((year, path))
+    return schemas
+
+
+def query(conn, sql, params=(), start_date=None, end_date=None):
+    """sql'i ana veritabanında ve aralıktaki her bölümde ayrı ayrı çalıştır
+
+    sql, tablo adlarının önüne şema adı için {db} yer tutucusu koyar
+    (ör. {db}.daily_totals). Her kaynağın satırları sırayla
+    üretilir; birleştirmek (toplamları toplamak) çağıranın işidir.
+    """
+    for source in sources(conn, start_date, end_date):
+        schema = source if source == 'main' else attach(conn, *source)
+        yield from conn.execute(sql.format(db=schema), params)
+
+
+def records_page(conn, search, key=None, older=True, limit=200):
+    """Kayıtlar görünümünün bir sayfası: ana veritabanı ve bölümlerden birleştirilir
+
+    Her kaynaktan en fazla limit satır okunur, (tarih, id) sırasıyla
+    birleştirilip ilk limit satır döner; key'in ötesindeki yıllara ait
+    bölümlere dokunulmaz. Kayıt id'leri arşivlenirken korunduğundan
+    kaynaklar arasında çakışmaz.
+    """
+    sql, params = database.records_page_query(search, key, older, limit)
+    start_date = end_date = None
+    if key is not None:
+        if older:
+            end_date = str(key[0])
+        else:
+            start_date = str(key[0])
+    rows = list(query(conn, sql, params, start_date, end_date))
+    rows.sort(key=lambda row: (row[1], row[0]), reverse=older)
+    return rows[:limit]
+
+
+def sum_by_key(rows):
+    """(anahtar, sayı, ...) satırlarını anahtara göre toplayarak birleştir"""
+    totals = {}
+    for key, *values in rows:
+        current = totals.get(key)
+        if current is None:
+            totals[key] = [value or 0 for value in values]
+        else:
+            for i, value in enumerate(values):
+                current[i] += value or 0
+    return totals
+
+
+def copy_entries(conn, source, target, condition='1', params=()):
+    """source şemasındaki kayıtları target şemasına id'leriyle kopyala
+
+    Etkinlik id'leri her dosyanın kendi sözlüğüne ait olduğundan adlar
+    üzerinden eşlenir; hedefte zaten bulunan id'ler atlanır.
+    """
+    conn.execute(f'''
+        INSERT OR IGNORE INTO {target}.activity_names (name)
+        SELECT DISTINCT n.name
+        FROM {source}.activity_entries e JOIN {source}.activity_names n ON n.id = e.activity_id
+        WHERE {condition}
+    ''', params)
+    conn.execute(f'''
+        INSERT OR IGNORE INTO {target}.activity_entries
+            (id, day, activity_id, duration, notes, created_at)
+        SELECT e.id, e.day, t.id, e.duration, e.notes, e.created_at
+        FROM {source}.activity_entries e
+        JOIN {source}.activity_names n ON n.id = e.activity_id
+        JOIN {target}.activity_names t ON t.name = n.name
+        WHERE {condition}
+    ''', params)
+
+
+def archive_year(conn, year):
+    """Yılın kayıtlarını ana veritabanından yıl dosyasına taşı
+
+    Önce kayıtlar bölüm dosyasına kopyalanıp onaylanır, sonra ana
+    veritabanından silinip bölüm tek bir işlemde kaydedilir. Arada kesilirse
+    bölüm henüz kayıtlı olmadığından hiçbir şey iki kez sayılmaz; işlemi
+    yeniden çalıştırmak kaldığı yerden tamamlar. Taşınan kayıt sayısını
+    döndürür.
+    """
+    if year >= datetime.date.today().year:
+        raise ValueError("yalnızca geçmiş yıllar arşivlenebilir")
+
+    db_path = main_path(conn)
+    path = partition_path(db_path, year)
+    database.connect(path).close()   # Şemayı oluştur
+
+    start = database.day_number(datetime.date(year, 1, 1))
+    end = database.day_number(datetime.date(year + 1, 1, 1))
+    name = attach(conn, year, path)
+    copy_entries(conn, 'main', name, "e.day >= ? AND e.day < ?", (start, end))
+    conn.commit()
+
+    # Arşiv artık değişmez: tek dosya olsun diye WAL yerine klasik günlüğe geç
+    conn.execute(f"DETACH DATABASE {name}")
+    archive = sqlite3.connect(path)
+    archive.execute("PRAGMA journal_mode = DELETE")
+    archive.close()
+
+    moved = conn.execute("DELETE FROM main.activity_entries WHERE day >= ? AND day < ?",
+                         (start, end)).rowcount
+    conn.execute("INSERT OR REPLACE INTO main.partitions (year, path) VALUES (?, ?)",
+                 (year, os.path.relpath(path, os.path.dirname(db_path))))
+    conn.commit()
+    return moved
+
+
+def merge_year(conn, year):
+    """Arşivlenmiş yılı ana veritabanına geri taşı ve dosyasını sil"""
+    paths = dict(list_partitions(conn))
+    if year not in paths:
+        raise ValueError(f"{year} yılı arşivlenmemiş")
+
+    name = attach(conn, year, paths[year])
+    copy_entries(conn, name, 'main')
+    conn.execute("DELETE FROM main.partitions WHERE year = ?", (year,))
+    conn.commit()
+    conn.execute(f"DETACH DATABASE {name}")
+
+    for suffix in ('', '-wal', '-shm'):
+        try:
+            os.remove(paths[year] + suffix)
+        except FileNotFoundError:
+            pass
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Geçmiş yılları ayrı dosyalara arşivle")
+    parser.add_argument('command', choices=['list', 'archive', 'merge'])
+    parser.add_argument('years', nargs='*', type=int, help="arşivlenecek veya geri alınacak yıllar")
+    parser.add_argument('--before', type=int, help="bu yıldan önceki tüm yılları arşivle")
+    parser.add_argument('--db', default=database.DB_PATH, help="veritabanı dosyası")
+    args = parser.parse_args()
+
+    conn = database.connect(args.db)
+    if args.command == 'list':
+        for year, path in list_partitions(conn):
+            print(f"{year}: {path}")
+    elif args.command == 'archive':
+        years = set(args.years)
+        if args.before is not None:
+            years.update(int(database.day_string(row[0])[:4]) for row in conn.execute(
+                "SELECT DISTINCT day FROM daily_totals WHERE day < ?",
+                (database.day_number(datetime.date(args.before, 1, 1)),)))
+        for year in sorted(years):
+            print(f"{year}: {archive_year(conn, year)} kayıt taşındı")
+    else:
+        for year in args.years:
+            merge_year(conn, year)
+            print(f"{year}: ana veritabanına geri taşındı")
+    conn.close()
@@ -0,0 +1,322 @@
+"""Arayüzden bağımsız rapor ve istatistik üretimi, çoklu veritabanı için komut satırı"""
+import datetime
+import json
+import os
+import sys
+from datetime import timedelta
+
+import database
+import partitions
+from stats import StatsTracker
+
+PERIODS = ("Son 7 Gün", "Bu Ay", "Son 30 Gün", "Tüm Zamanlar")
+
+# Komut satırında dönemler için kısa adlar
+PERIOD_NAMES = {'week': "Son 7 Gün", 'month': "Bu Ay", '30days': "Son 30 Gün", 'all': "Tüm Zamanlar"}
+
+# Seri ve haftalık değişim bölümünün baktığı gün sayısı (bugün dahil)
+ANALYTICS_DAYS = 365
+
+
+def period_start(period, today):
+    """Rapor döneminin başlangıç tarihi"""
+    if period == "Son 7 Gün":
+        return today - timedelta(days=7)
+    elif period == "Bu Ay":
+        return today.replace(day=1)
+    elif period == "Son 30 Gün":
+        return today - timedelta(days=30)
+    else:  # Tüm Zamanlar
+        return datetime.date(2000, 1, 1)
+
+
+def query_report(conn, start_date):
+    """Dönemdeki etkinlik toplamları: (etkinlik, toplam süre, oturum) satırları"""
+    start = start_date.strftime('%Y-%m-%d')
+    # Her bölüm kendi toplamını hesaplar; etkinlik id'leri dosyaya özgü
+    # olduğundan sonuçlar burada adlara göre birleştirilir
+    totals = partitions.sum_by_key(partitions.query(conn, '''
+        SELECT n.name, SUM(t.total_minutes) as total_duration, SUM(t.sessions) as count
+        FROM {db}.daily_totals t JOIN {db}.activity_names n ON n.id = t.activity_id
+        WHERE t.day >= ?
+        GROUP BY t.activity_id
+    ''', (database.day_number(start_date),), start_date=start))
+    rows = [(activity, duration, count) for activity, (duration, count) in totals.items()]
+    rows.sort(key=lambda row: row[1], reverse=True)
+    return rows
+
+
+def query_daily_totals(conn, start_date, end_date, activity=None):
+    """Aralıktaki günlerin toplam dakikaları: {'YYYY-AA-GG': dakika}
+
+    activity verilirse yalnızca o etkinliğin süreleri toplanır.
+    """
+    start, end = start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
+    condition = ""
+    params = [database.day_number(start_date), database.day_number(end_date)]
+    if activity is not None:
+        condition = "AND activity_id = (SELECT id FROM {db}.activity_names WHERE name = ?)"
+        params.append(activity)
+    totals = partitions.sum_by_key(partitions.query(conn, f'''
+        SELECT day, SUM(total_minutes)
+        FROM {{db}}.daily_totals
+        WHERE day >= ? AND day <= ? {condition}
+        GROUP BY day
+    ''', params, start_date=start, end_date=end))
+    return {database.day_string(day): minutes for day, (minutes,) in totals.items()}
+
+
+def query_first_date(conn):
+    """Arşiv bölümleri dahil kaydı olan ilk gün ya da None"""
+    days = [day for day, in partitions.query(conn, "SELECT MIN(day) FROM {db}.daily_totals")
+            if day is not None]
+    return database.EPOCH + timedelta(days=min(days)) if days else None
+
+
+def query_activity_totals(conn, start_date, end_date):
+    """Aralıktaki etkinlik toplamları: (etkinlik, dakika), süreye göre azalan"""
+    start, end = start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
+    totals = partitions.sum_by_key(partitions.query(conn, '''
+        SELECT n.name, SUM(t.total_minutes)
+        FROM {db}.daily_totals t JOIN {db}.activity_names n ON n.id = t.activity_id
+        WHERE t.day >= ? AND t.day <= ?
+        GROUP BY t.activity_id
+    ''', (database.day_number(start_date), database.day_number(end_date)),
+        start_date=start, end_date=end))
+    return sorted(((activity, minutes) for activity, (minutes,) in totals.items()),
+                  key=lambda row: row[1], reverse=True)
+
+
+def query_stats(conn):
+    """Genel istatistikler: (kayıt, toplam süre, farklı etkinlik, ilk tarih, en aktif gün)"""
+    tracker = StatsTracker()
+    tracker.load(conn)
+    return tracker.snapshot()
+
+
+def query_analytics(conn, today):
+    """Etkinlik başına seri ve haftalık değişim özeti (NumPy gerektirir)
+
+    Yalnızca son ANALYTICS_DAYS günün toplamları okunur; maliyet geçmişin
+    uzunluğundan bağımsızdır.
+    """
+    import analytics
+    start_day = today - timedelta(days=ANALYTICS_DAYS - 1)
+    return analytics.summary(analytics.DailyMatrix.load(conn, end_day=today, start_day=start_day))
+
+
+def format_report(period, start_date, today, activities_data, generated_at=None):
+    """Dönem raporunun metni"""
+    if generated_at is None:
+        generated_at = datetime.datetime.now()
+
+    report = f"📊 {period} Aktivite Raporu\n"
+    report += "=" * 50 + "\n\n"
+
+    if not activities_data:
+        report += "Bu dönemde hiç etkinlik kaydı bulunamadı.\n"
+    else:
+        total_time = sum([row[1] for row in activities_data])
+        total_days = (today - start_date).days + 1
+
+        report += f"📅 Rapor Dönemi: {start_date.strftime('%d.%m.%Y')} - {today.strftime('%d.%m.%Y')}\n"
+        report += f"📊 Toplam Süre: {total_time//60}s {total_time%60}dk\n"
+        report += f"📈 Günlük Ortalama: {total_time//total_days//60}s {(total_time//total_days)%60}dk\n"
+        report += f"🎯 Toplam Etkinlik Türü: {len(activities_data)}\n\n"
+
+        report += "🏆 Etkinlik Detayları:\n"
+        report += "-" * 30 + "\n"
+
+        for i, (activity, duration, count) in enumerate(activities_data, 1):
+            percentage = (duration / total_time) * 100
+            avg_session = duration / count
+            report += f"{i:2d}. {activity}\n"
+            report += f"    ⏱️  Toplam: {duration//60}s {duration%60}dk ({percentage:.1f}%)\n"
+            report += f"    📊 Oturum: {count} kez\n"
+            report += f"    📈 Ortalama: {avg_session//60:.0f}s {avg_session%60:.0f}dk\n\n"
+
+    report += f"\n📝 Rapor Tarihi: {generated_at.strftime('%d.%m.%Y %H:%M')}\n"
+    return report
+
+
+def streak_text(days):
+    """Seri uzunluğu; ANALYTICS_DAYS penceresini dolduran seri daha uzun olabilir"""
+    return f"{days}+ gün" if days >= ANALYTICS_DAYS else f"{days} gün"
+
+
+def format_analytics(summary):
+    """Seri ve haftalık değişim bölümünün metni (analytics.summary satırları)"""
+    if not summary:
+        return ""
+    text = "\n🔥 Seriler ve Haftalık Değişim:\n"
+    text += "-" * 30 + "\n"
+    for activity, longest, current, this_week, last_week, delta in summary:
+        sign = "+" if delta >= 0 else "-"
+        text += f"• {activity}\n"
+        text += (f"    🔥 Güncel seri: {streak_text(current)} "
+                 f"(son bir yılda en uzun: {streak_text(longest)})\n")
+        text += (f"    📅 Bu hafta: {this_week//60}s {this_week%60}dk "
+                 f"(geçen hafta: {last_week//60}s {last_week%60}dk, "
+                 f"{sign}{abs(delta)//60}s {abs(delta)%60}dk)\n")
+    return text
+
+
+def format_stats(stats, today):
+    """Genel istatistiklerin metni"""
+    total_records, total_duration, unique_activities, first_record, most_active_day = stats
+
+    stats_text = f"📊 Toplam Kayıt: {total_records}\n"
+    stats_text += f"⏱️ Toplam Süre: {total_duration//60}s {total_duration%60}dk\n"
+    stats_text += f"🎯 Farklı Etkinlik: {unique_activities}\n"
+
+    if first_record:
+        stats_text += f"📅 İlk Kayıt: {first_record}\n"
+
+    if most_active_day:
+        date, duration = most_active_day
+        stats_text += f"🏆 En Aktif Gün: {date} ({duration//60}s {duration%60}dk)\n"
+
+    # Ortalama günlük süre
+    if first_record:
+        first_date = datetime.datetime.strptime(first_record, '%Y-%m-%d').date()
+        days_diff = (today - first_date).days + 1
+        avg_daily = total_duration / days_diff if days_diff > 0 else 0
+        stats_text += f"📈 Günlük Ortalama: {avg_daily//60:.0f}s {avg_daily%60:.0f}dk"
+    return stats_text
+
+
+def build_reports(db_path, periods=PERIODS, today=None):
+    """Bir veritabanının istenen dönem raporlarını ve istatistiklerini hesapla
+
+    Süreç havuzunda çalışabilmesi için yalnızca seçilebilir (picklable)
+    değerler alır ve döndürür.
+    """
+    if today is None:
+        today = datetime.date.today()
+
+    # sqlite3.connect eksik dosyayı boş bir veritabanı olarak oluştururdu
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"veritabanı bulunamadı: {db_path}")
+
+    # Okunan dosyalara yazılmaz; eski şemadaki dosyalar taşınmak yerine reddedilir
+    conn = database.connect_readonly(db_path)
+    try:
+        reports = {}
+        for period in periods:
+            start_date = period_start(period, today)
+            reports[period] = (start_date, query_report(conn, start_date))
+        stats = query_stats(conn)
+        summary = query_analytics(conn, today)
+    finally:
+        conn.close()
+    return {'db': db_path, 'today': today, 'reports': reports, 'stats': stats,
+            'analytics': summary}
+
+
+def render_text(result):
+    """build_reports sonucunu uygulamadaki metin biçiminde yaz"""
+    today = result['today']
+    parts = [f"🗄️ {result['db']}\n"]
+    for period, (start_date, rows) in result['reports'].items():
+        parts.append(format_report(period, start_date, today, rows))
+    parts.append(format_analytics(result['analytics']))
+    parts.append(format_stats(result['stats'], today) + "\n")
+    return "\n".join(parts)
+
+
+def render_json(result):
+    """build_reports sonucunu JSON'a uygun bir sözlüğe çevir"""
+    total_records, total_duration, unique_activities, first_record, most_active_day = result['stats']
+    return {
+        'db': result['db'],
+        'today': result['today'].isoformat(),
+        'reports': {
+            period: {
+                'start_date': start_date.isoformat(),
+                'activities': [{'activity': activity, 'total_minutes': duration, 'sessions': count}
+                               for activity, duration, count in rows],
+            }
+            for period, (start_date, rows) in result['reports'].items()
+        },
+        'stats': {
+            'total_records': total_records,
+            'total_minutes': total_duration,
+            'unique_activities': unique_activities,
+            'first_date': first_record,
+            'most_active_day': most_active_day and {'date': most_active_day[0],
+                                                    'total_minutes': most_active_day[1]},
+        },
+        'analytics': [
+            {'activity': activity, 'longest_streak': longest, 'current_streak': current,
+             'this_week_minutes': this_week, 'last_week_minutes': last_week}
+            for activity, longest, current, this_week, last_week, _ in result['analytics']
+        ],
+    }
+
+
+def run_job(job):
+    """Süreç havuzu işi: (veritabanı, dönemler, biçim) -> (veritabanı, çıktı, hata)"""
+    db_path, periods, output_format = job
+    try:
+        result = build_reports(db_path, periods)
+    except Exception as e:
+        return db_path, None, str(e)
+    if output_format == 'json':
+        return db_path, render_json(result), None
+    return db_path, render_text(result), None
+
+
+def main(argv=None):
+    import argparse
+    from concurrent.futures import ProcessPoolExecutor
+
+    parser = argparse.ArgumentParser(description="Birden çok veritabanı için rapor üret")
+    parser.add_argument('databases', nargs='+', help="activities.db dosyaları")
+    parser.add_argument('--period', action='append', choices=sorted(PERIOD_NAMES),
+                        help="rapor dönemi (tekrarlanabilir, varsayılan: hepsi)")
+    parser.add_argument('--format', choices=['text', 'json'], default='text')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="süreç sayısı (varsayılan: çekirdek sayısı)")
+    parser.add_argument('--output-dir', help="her veritabanı için ayrı dosya yazılacak dizin")
+    args = parser.parse_args(argv)
+
+    periods = tuple(PERIOD_NAMES[name] for name in args.period) if args.period else PERIODS
+    jobs = [(path, periods, args.format) for path in args.databases]
+    workers = max(1, min(args.workers or 1, len(jobs)))
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    failures = 0
+    collected = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Sonuçlar girdi sırasıyla gelir; küçük parçalar süreç geçişlerini azaltır
+        chunksize = max(1, len(jobs) // (workers * 4))
+        for db_path, output, error in pool.map(run_job, jobs, chunksize=chunksize):
+            if error is not None:
+                failures += 1
+                print(f"Hata ({db_path}): {error}", file=sys.stderr)
+                continue
+            if args.output_dir:
+                # Kullanıcı dosyaları genelde aynı adı taşır; yolun tamamı ad olur
+                name = os.path.splitext(os.path.normpath(db_path))[0]
+                name = name.replace(':', '').strip(os.sep).replace(os.sep, '_')
+                extension = 'json' if args.format == 'json' else 'txt'
+                target = os.path.join(args.output_dir, f"{name}.{extension}")
+                with open(target, 'w', encoding='utf-8') as f:
+                    if args.format == 'json':
+                        json.dump(output, f, ensure_ascii=False, indent=2)
+                    else:
+                        f.write(output)
+            elif args.format == 'json':
+                collected.append(output)
+            else:
+                print(output)
+
+    if collected:
+        print(json.dumps(collected, ensure_ascii=False, indent=2))
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
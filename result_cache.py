@@ -0,0 +1,49 @@
+"""Rapor ve grafik sonuçları için boyutu sınırlı LRU önbellek"""
+from collections import OrderedDict
+
+
+class ResultCache:
+    """Anahtara göre sonuç saklayan, en eski kullanılanı atan önbellek
+
+    Anahtarlar çağıranın oluşturduğu demetlerdir; verinin sürümü (yazma
+    sayacı, PRAGMA data_version) anahtara dahil edildiğinden bir yazmadan
+    sonra eski girdiler bir daha istenmez ve zamanla atılır. Yalnızca Tk iş
+    parçacığında kullanılır.
+    """
+
+    MISSING = object()
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """Anahtarın sonucu; yoksa default (isabet/ıskalama sayılır)"""
+        value = self.entries.get(key, self.MISSING)
+        if value is self.MISSING:
+            self.misses += 1
+            return default
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Sonucu sakla, sınır aşılırsa en eski kullanılan girdiyi at"""
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        """(isabet, ıskalama, atılan, girdi sayısı)"""
+        return self.hits, self.misses, self.evictions, len(self.entries)
@@ -0,0 +1,114 @@
+"""Yazmalarla birlikte artımlı güncellenen genel istatistikler"""
+import heapq
+
+import database
+import partitions
+
+
+class StatsTracker:
+    """Toplam kayıt, toplam süre, farklı etkinlik, ilk tarih ve en aktif gün
+
+    Değerler bir kez günlük toplam tablosundan yüklenir, sonra her yazmanın
+    ChangeSet'i ile güncellenir. En aktif gün ve ilk tarih tembel silmeli
+    yığınlarda tutulur: eskimiş girdiler yalnızca yığının tepesine
+    çıktıklarında atılır, böylece snapshot amortize sabit zamanda çalışır.
+    """
+
+    def __init__(self):
+        self.loaded = False
+
+    def load(self, conn):
+        """Değerleri günlük toplam tablolarından (arşiv bölümleri dahil) sıfırdan hesapla"""
+        self.records = 0
+        self.total_minutes = 0
+        self.activity_sessions = {}   # etkinlik -> oturum sayısı
+        self.days = {}                # tarih -> [toplam dakika, oturum sayısı]
+
+        for day, activity, minutes, sessions in partitions.query(conn, '''
+                SELECT t.day, n.name, t.total_minutes, t.sessions
+                FROM {db}.daily_totals t JOIN {db}.activity_names n ON n.id = t.activity_id
+                '''):
+            self.add_totals(database.day_string(day), activity, minutes, sessions)
+
+        self.rebuild_heaps()
+        self.loaded = True
+
+    def invalidate(self):
+        """Bir sonraki kullanımdan önce sıfırdan yüklenmesini iste"""
+        self.loaded = False
+
+    def apply(self, change):
+        """Yazmanın ChangeSet'ini değerlere uygula
+
+        Tüm verinin değiştiği bir değişiklikte (ör. geri yükleme) değerler
+        geçersiz sayılır.
+        """
+        if not self.loaded:
+            return
+        if change.full:
+            self.invalidate()
+            return
+
+        touched = set()
+        for _, date, activity, duration in change.removed:
+            self.add_totals(date, activity, -int(duration), -1)
+            touched.add(date)
+        for _, date, activity, duration in change.added:
+            self.add_totals(date, activity, int(duration), 1)
+            touched.add(date)
+
+        for date in touched:
+            day = self.days.get(date)
+            if day is not None:
+                heapq.heappush(self.busiest, (-day[0], date))
+                heapq.heappush(self.first_dates, date)
+
+        # Tembel silinen girdiler birikirse yığınları sıkıştır
+        if len(self.busiest) > 2 * len(self.days) + 64:
+            self.rebuild_heaps()
+
+    def add_totals(self, date, activity, minutes, sessions):
+        """Bir gün/etkinlik toplamını (negatifse çıkararak) sayaçlara ekle"""
+        self.records += sessions
+        self.total_minutes += minutes
+
+        count = self.activity_sessions.get(activity, 0) + sessions
+        if count > 0:
+            self.activity_sessions[activity] = count
+        else:
+            self.activity_sessions.pop(activity, None)
+
+        day = self.days.setdefault(date, [0, 0])
+        day[0] += minutes
+        day[1] += sessions
+        if day[1] <= 0:
+            del self.days[date]
+
+    def rebuild_heaps(self):
+        self.busiest = [(-minutes, date) for date, (minutes, _) in self.days.items()]
+        heapq.heapify(self.busiest)
+        self.first_dates = list(self.days)
+        heapq.heapify(self.first_dates)
+
+    def most_active_day(self):
+        """En yüksek toplam süreli gün: (tarih, dakika) ya da None"""
+        while self.busiest:
+            minutes, date = self.busiest[0]
+            day = self.days.get(date)
+            if day is not None and day[0] == -minutes:
+                return date, -minutes
+            heapq.heappop(self.busiest)
+        return None
+
+    def first_date(self):
+        """Kaydı olan en eski tarih ya da None"""
+        while self.first_dates:
+            if self.first_dates[0] in self.days:
+                return self.first_dates[0]
+            heapq.heappop(self.first_dates)
+        return None
+
+    def snapshot(self):
+        """(kayıt, toplam süre, farklı etkinlik, ilk tarih, en aktif gün)"""
+        return (self.records, self.total_minutes, len(self.activity_sessions),
+                self.first_date(), self.most_active_day())
@@ -0,0 +1,125 @@
+"""Etkinlik adı tamamlama için sıralı önek indeksi"""
+import bisect
+import heapq
+import math
+
+import database
+
+# Kullanım puanının yarı ömrü (gün): bu kadar eski bir kullanım yarı değerindedir
+HALF_LIFE_DAYS = 30
+
+# Önek aralığı bundan büyükse eşleşmeler sıralama listesinden taranır
+RANGE_SCAN_LIMIT = 512
+
+# Aralık sonu: her önekten sonra sıralanan karakter
+PREFIX_END = '\U0010ffff'
+
+
+def fold(name):
+    """Büyük/küçük harf duyarsız karşılaştırma anahtarı"""
+    return name.casefold()
+
+
+class ActivityIndex:
+    """Kullanım sıklığı ve yakınlığına göre sıralı etkinlik adı indeksi
+
+    Adlar büyük/küçük harf duyarsız anahtarlarına göre sıralı bir dizide
+    tutulur; bir önekle eşleşen adlar iki ikili aramayla bulunan bitişik bir
+    aralıktır. Her adın puanı log(oturum sayısı) + son kullanım günü ×
+    ln 2 / HALF_LIFE_DAYS'tir: tüm puanlar zamanla aynı hızda azaldığından
+    sıralama bugünün tarihine bağlı değildir ve yazmalarla artımlı
+    güncellenebilir. Ayrıca tüm adlar puana göre sıralı ikinci bir dizide
+    tutulur; kısa öneklerde geniş aralığı sıralamak yerine bu dizi baştan
+    taranır ve ilk eşleşmeler alınır.
+    """
+
+    def __init__(self):
+        self.loaded = False
+
+    def load(self, conn):
+        """Adları ve kullanımlarını günlük toplam tablosundan yükle
+
+        Kayıt formunun önceki önerileri gibi yalnızca ana veritabanı okunur.
+        """
+        self.usage = {}     # ad -> [oturum sayısı, son kullanım günü]
+        for name, sessions, last_day in conn.execute('''
+                SELECT n.name, SUM(t.sessions), MAX(t.day)
+                FROM daily_totals t JOIN activity_names n ON n.id = t.activity_id
+                GROUP BY t.activity_id
+                '''):
+            if sessions > 0:
+                self.usage[name] = [sessions, last_day]
+        self.keys = sorted((fold(name), name) for name in self.usage)
+        self.ranked = sorted((-self.score(name), name) for name in self.usage)
+        self.loaded = True
+
+    def invalidate(self):
+        """Bir sonraki kullanımdan önce sıfırdan yüklenmesini iste"""
+        self.loaded = False
+
+    def score(self, name):
+        sessions, last_day = self.usage[name]
+        return math.log(sessions) + last_day * math.log(2) / HALF_LIFE_DAYS
+
+    def apply(self, change):
+        """Yazmanın ChangeSet'ini indekse uygula
+
+        Silinen bir kaydın günü son kullanım gününü geri almaz; puan yalnızca
+        oturum sayısı üzerinden düşer. Tüm verinin değiştiği bir değişiklikte
+        indeks geçersiz sayılır.
+        """
+        if not self.loaded:
+            return
+        if change.full:
+            self.invalidate()
+            return
+        for _, date, activity, _ in change.removed:
+            self.add_usage(activity, database.day_number(date), -1)
+        for _, date, activity, _ in change.added:
+            self.add_usage(activity, database.day_number(date), 1)
+
+    def add_usage(self, name, day, sessions):
+        """Bir adın oturum sayısını değiştir, sıralamadaki yerini güncelle"""
+        usage = self.usage.get(name)
+        if usage is None:
+            if sessions <= 0:
+                return
+            usage = self.usage[name] = [0, day]
+            bisect.insort(self.keys, (fold(name), name))
+        else:
+            self.remove_ranked(name)
+
+        usage[0] += sessions
+        if sessions > 0:
+            usage[1] = max(usage[1], day)
+        if usage[0] <= 0:
+            del self.usage[name]
+            del self.keys[bisect.bisect_left(self.keys, (fold(name), name))]
+            return
+        bisect.insort(self.ranked, (-self.score(name), name))
+
+    def remove_ranked(self, name):
+        entry = (-self.score(name), name)
+        index = bisect.bisect_left(self.ranked, entry)
+        del self.ranked[index]
+
+    def complete(self, prefix, limit=10):
+        """Öneki taşıyan en yüksek puanlı limit ad, puana göre azalan"""
+        if not self.loaded:
+            return []
+        key = fold(prefix.strip())
+        lo = bisect.bisect_left(self.keys, (key,))
+        hi = bisect.bisect_left(self.keys, (key + PREFIX_END,), lo)
+        if hi - lo <= RANGE_SCAN_LIMIT:
+            candidates = (name for _, name in self.keys[lo:hi])
+            return heapq.nsmallest(limit, candidates, key=lambda name: (-self.score(name), name))
+
+        # Geniş aralık: eşleşmeler sıralama listesinde sık olduğundan
+        # baştan tarama birkaç yüz adımda biter
+        matches = []
+        for _, name in self.ranked:
+            if fold(name).startswith(key):
+                matches.append(name)
+                if len(matches) == limit:
+                    break
+        return matches
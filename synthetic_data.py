@@ -0,0 +1,175 @@
+"""Kıyaslama (benchmark) için tekrarlanabilir, gerçekçi sentetik geçmiş üretimi
+
+Aynı tohum (seed), satır sayısı ve tarih aralığı her zaman aynı veritabanını
+üretir. Etkinlikler Zipf benzeri bir dağılımla seçilir (birkaç etkinlik
+kayıtların çoğunu oluşturur), süreler etkinliğe özgü log-normal dağılımdan
+gelir ve 5 dakikaya yuvarlanır. Günlük kayıt sayısı hafta sonları düşer ve
+günden güne dalgalanır; notların bir kısmı boştur, geri kalanının uzunluğu
+birkaç kelimeden birkaç cümleye kadar değişir. Kayıtlar tarih sırasıyla
+eklenir, böylece id'ler gerçek kullanımdaki gibi tarihle birlikte artar.
+"""
+import datetime
+import math
+import os
+import random
+
+import database
+
+MIN_ROWS = 1000
+MAX_ROWS = 10_000_000
+
+# Tek executemany çağrısıyla eklenen satır sayısı
+CHUNK_SIZE = 50000
+
+# Etkinlikler ve tipik süreleri (dakika); sıra yaygınlığı belirler
+ACTIVITIES = (
+    ('Kodlama', 90), ('Okuma', 40), ('Yürüyüş', 35), ('Spor', 60), ('Toplantı', 45),
+    ('Ders çalışma', 75), ('E-posta', 20), ('Yemek yapma', 40), ('Meditasyon', 15),
+    ('Müzik', 30), ('Koşu', 40), ('Dil öğrenme', 30), ('Temizlik', 35), ('Alışveriş', 45),
+    ('Proje planlama', 50), ('Yoga', 45), ('Bisiklet', 60), ('Resim', 70), ('Yazı yazma', 55),
+    ('Podcast', 40), ('Film', 110), ('Oyun', 80), ('Bahçe işleri', 60), ('Gitar', 30),
+    ('Satranç', 40), ('Yüzme', 50), ('Fotoğrafçılık', 65), ('Gönüllü çalışma', 120),
+    ('Ev ödevi', 60), ('Aile ziyareti', 150),
+)
+
+# Zipf üssü: 1'e yakın değerler uzun kuyruklu bir dağılım verir
+ZIPF_EXPONENT = 1.1
+
+# Notsuz kayıtların oranı
+EMPTY_NOTES_RATIO = 0.45
+
+# Önceden üretilen farklı not metni sayısı
+NOTE_POOL_SIZE = 5000
+
+NOTE_WORDS = (
+    'bugün', 'yarın', 'hafta', 'proje', 'bölüm', 'kitap', 'antrenman', 'hedef', 'tekrar',
+    'yeni', 'zor', 'kolay', 'güzel', 'uzun', 'kısa', 'park', 'ev', 'ofis', 'arkadaş',
+    'aile', 'plan', 'not', 'hata', 'düzeltme', 'sunum', 'rapor', 'makale', 'ders', 'sınav',
+    'tempo', 'mesafe', 'kilometre', 'sayfa', 'konu', 'çalışma', 'mola', 'akşam', 'sabah',
+    'öğle', 'yorgun', 'verimli', 'odaklı', 'dağınık', 'başarılı', 'devam', 'bitti',
+)
+
+# Haftanın günlerine göre (Pazartesi..Pazar) kayıt yoğunluğu
+WEEKDAY_WEIGHTS = (1.0, 1.0, 1.0, 1.0, 0.9, 0.7, 0.65)
+
+
+def activity_weights(count):
+    """İlk count etkinliğin Zipf ağırlıkları"""
+    return [1 / rank ** ZIPF_EXPONENT for rank in range(1, count + 1)]
+
+
+def note_pool(rng, size=NOTE_POOL_SIZE):
+    """Log-normal uzunluklu (çoğu kısa, bazıları uzun) not metinleri"""
+    notes = []
+    for _ in range(size):
+        words = max(1, min(80, round(rng.lognormvariate(1.8, 0.8))))
+        text = ' '.join(rng.choices(NOTE_WORDS, k=words))
+        notes.append(text[0].upper() + text[1:] + '.')
+    return notes
+
+
+def day_counts(rng, rows, days, first_day):
+    """rows kaydı days güne hafta içi/sonu ağırlıkları ve günlük dalgalanmayla dağıt"""
+    weights = [WEEKDAY_WEIGHTS[(first_day + datetime.timedelta(days=offset)).weekday()]
+               * rng.uniform(0.5, 1.5) for offset in range(days)]
+    scale = rows / sum(weights)
+    counts = [int(weight * scale) for weight in weights]
+    # Yuvarlamadan kalan kayıtlar en büyük kesirli paylara verilir
+    remainder = rows - sum(counts)
+    order = sorted(range(days), key=lambda i: weights[i] * scale - counts[i], reverse=True)
+    for i in order[:remainder]:
+        counts[i] += 1
+    return counts
+
+
+def generate(path, rows, seed=0, days=None, end_date=None, activities=len(ACTIVITIES),
+             progress=None):
+    """path'e rows kayıtlık sentetik bir veritabanı yaz
+
+    days verilmezse geçmiş günde ortalama 8 kayıt olacak şekilde (en az 30
+    gün, en çok 20 yıl) seçilir; son gün end_date'tir (varsayılan bugün).
+    Dosya zaten varsa FileExistsError yükseltilir. progress(eklenen, toplam)
+    her parçadan sonra çağrılır. Eklenen satır sayısını döndürür.
+    """
+    if not MIN_ROWS <= rows <= MAX_ROWS:
+        raise ValueError(f"satır sayısı {MIN_ROWS} ile {MAX_ROWS} arasında olmalı")
+    if os.path.exists(path):
+        raise FileExistsError(f"dosya zaten var: {path}")
+    if days is None:
+        days = max(30, min(rows // 8, 20 * 365))
+    if end_date is None:
+        end_date = datetime.date.today()
+    first_day = end_date - datetime.timedelta(days=days - 1)
+
+    rng = random.Random(seed)
+    catalog = ACTIVITIES[:activities]
+    weights = list(activity_weights(len(catalog)))
+    cumulative = [sum(weights[:i + 1]) for i in range(len(weights))]
+    notes = note_pool(rng)
+    counts = day_counts(rng, rows, days, first_day)
+
+    conn = database.connect(path)
+    try:
+        after_id = database.begin_bulk_load(conn, drop_indexes=True)
+        ids = [database.activity_id(conn, name) for name, _ in catalog]
+        # Her etkinliğin log-normal süre dağılımı: (log ortalama, sapma)
+        shapes = [(math.log(minutes), 0.45) for _, minutes in catalog]
+
+        insert_sql = '''
+            INSERT INTO activity_entries (day, activity_id, duration, notes, created_at)
+            VALUES (?, ?, ?, ?, ?)
+        '''
+        chunk = []
+        inserted = 0
+        first_number = database.day_number(first_day)
+        for offset, count in enumerate(counts):
+            if not count:
+                continue
+            created_at = f"{database.day_string(first_number + offset)} 21:00:00"
+            for index in rng.choices(range(len(catalog)), cum_weights=cumulative, k=count):
+                mu, sigma = shapes[index]
+                duration = max(5, 5 * round(rng.lognormvariate(mu, sigma) / 5))
+                note = None if rng.random() < EMPTY_NOTES_RATIO else rng.choice(notes)
+                chunk.append((first_number + offset, ids[index], duration, note, created_at))
+            if len(chunk) >= CHUNK_SIZE:
+                conn.executemany(insert_sql, chunk)
+                inserted += len(chunk)
+                chunk = []
+                if progress is not None:
+                    progress(inserted, rows)
+        if chunk:
+            conn.executemany(insert_sql, chunk)
+            inserted += len(chunk)
+        database.finish_bulk_load(conn, after_id)
+        if progress is not None:
+            progress(inserted, rows)
+    except BaseException:
+        conn.close()
+        os.remove(path)
+        raise
+    conn.execute("PRAGMA optimize")
+    conn.close()
+    return inserted
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Kıyaslama için sentetik etkinlik veritabanı üret")
+    parser.add_argument('path', help="oluşturulacak veritabanı dosyası")
+    parser.add_argument('--rows', type=int, default=100000,
+                        help=f"kayıt sayısı ({MIN_ROWS}-{MAX_ROWS})")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--days', type=int, help="geçmişin gün sayısı (varsayılan: satır/8)")
+    parser.add_argument('--end-date', type=datetime.date.fromisoformat,
+                        help="son kaydın tarihi, YYYY-AA-GG (varsayılan: bugün)")
+    parser.add_argument('--activities', type=int, default=len(ACTIVITIES),
+                        choices=range(1, len(ACTIVITIES) + 1), metavar=f"1-{len(ACTIVITIES)}",
+                        help="farklı etkinlik sayısı")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    count = generate(args.path, args.rows, args.seed, args.days, args.end_date, args.activities,
+                     progress=lambda done, total: print(f"\r{done}/{total}", end='', flush=True))
+    print(f"\n{count} kayıt {time.perf_counter() - started:.1f} sn'de yazıldı: {args.path}")
@@ -0,0 +1,29 @@
+"""Testler için ortak düzen: modüller depo kökünden içe aktarılır"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database  # noqa: E402
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'activities.db')
+
+
+@pytest.fixture
+def conn(db_path):
+    conn = database.connect(db_path)
+    yield conn
+    conn.close()
+
+
+def add_entry(conn, date, activity, duration, notes=None):
+    """activity_entries'e bir kayıt ekle ve id'sini döndür"""
+    return conn.execute(
+        "INSERT INTO activity_entries (day, activity_id, duration, notes) VALUES (?, ?, ?, ?)",
+        (database.day_number(date), database.activity_id(conn, activity), duration, notes)
+    ).lastrowid
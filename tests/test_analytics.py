@@ -0,0 +1,51 @@
+import datetime
+
+import numpy as np
+import pytest
+
+import analytics
+import database
+from conftest import add_entry
+
+
+@pytest.mark.parametrize('n, threshold', [(10, 3), (100, 10), (1000, 37), (5000, 1000)])
+def test_lttb_keeps_endpoints_and_picks_one_point_per_bucket(n, threshold):
+    rng = np.random.default_rng(n)
+    x = np.arange(n)
+    y = rng.normal(size=n)
+    selected = analytics.lttb(x, y, threshold)
+    assert len(selected) == threshold
+    assert selected[0] == 0 and selected[-1] == n - 1
+    assert (np.diff(selected) > 0).all()
+
+
+def test_lttb_keeps_peaks():
+    y = np.zeros(500)
+    y[123], y[377] = 50, -40
+    selected = analytics.lttb(np.arange(500), y, 20)
+    assert 123 in selected and 377 in selected
+
+
+@pytest.mark.parametrize('threshold', [2, 10, 11])
+def test_lttb_returns_everything_when_not_reducing(threshold):
+    assert analytics.lttb(np.arange(10), np.ones(10), threshold).tolist() == list(range(10))
+
+
+def test_line_series_is_limited_to_max_points():
+    totals = {database.day_string(day): day % 90 for day in range(18000, 19000)}
+    dates, values, resolution = analytics.line_series(
+        totals, '2019-04-14', '2022-01-07', resolution='day', max_points=200)
+    assert resolution == 'day' and len(dates) == len(values) == 200
+    assert dates[0] == datetime.date(2019, 4, 14) and dates[-1] == datetime.date(2022, 1, 7)
+
+
+def test_summary_streaks_and_weekly_change(conn):
+    today = datetime.date(2024, 3, 20)
+    for offset in range(10):   # bugüne kadar 10 günlük seri
+        add_entry(conn, today - datetime.timedelta(days=offset), 'Okuma', 10)
+    for offset in (30, 31, 32, 33):
+        add_entry(conn, today - datetime.timedelta(days=offset), 'Koşu', 60)
+    conn.commit()
+
+    matrix = analytics.DailyMatrix.load(conn, end_day=today)
+    assert analytics.summary(matrix) == [('Okuma', 10, 10, 70, 30, 40), ('Koşu', 4, 0, 0, 0, 0)]
@@ -0,0 +1,110 @@
+import gzip
+import json
+
+import pytest
+
+import data_io
+import database
+from conftest import add_entry
+
+
+@pytest.mark.parametrize('fields, expected', [
+    (('2024-03-01', ' Okuma ', '30', 'not'), (database.day_number('2024-03-01'), 'Okuma', 30, 'not')),
+    (('2024-03-01', 'Okuma', 30.0, None), (database.day_number('2024-03-01'), 'Okuma', 30, None)),
+    (('2024-03-01', 'Okuma', 30, 12), (database.day_number('2024-03-01'), 'Okuma', 30, '12')),
+])
+def test_validate_record_accepts(fields, expected):
+    assert data_io.validate_record(fields, {}) == expected
+
+
+@pytest.mark.parametrize('fields', [
+    None,
+    ('2024-3-1', 'Okuma', 30, None),
+    ('2024-02-30', 'Okuma', 30, None),
+    (20240301, 'Okuma', 30, None),
+    ('2024-03-01', '  ', 30, None),
+    ('2024-03-01', None, 30, None),
+    ('2024-03-01', 'Okuma', 'otuz', None),
+    ('2024-03-01', 'Okuma', 0, None),
+    ('2024-03-01', 'Okuma', -5, None),
+    ('2024-03-01', 'Okuma', 5.5, None),
+    ('2024-03-01', 'Okuma', True, None),
+    ('2024-03-01', 'Okuma', None, None),
+])
+def test_validate_record_rejects(fields):
+    with pytest.raises(ValueError):
+        data_io.validate_record(fields, {})
+
+
+def imported(conn):
+    return conn.execute("SELECT date, activity, duration, notes FROM activities ORDER BY id").fetchall()
+
+
+def test_import_csv_skips_invalid_rows(conn, tmp_path):
+    path = tmp_path / 'kayitlar.csv'
+    path.write_text('Tarih,Etkinlik,Süre (dk),Notlar\n'
+                    '2024-03-01,Okuma,30,"roman, bölüm 2"\n'
+                    '2024-03-02,Koşu,-5,\n'
+                    '\n'
+                    'dün,Okuma,10,\n'
+                    '2024-03-03,Koşu,20\n', encoding='utf-8-sig')
+    add_entry(conn, '2024-01-01', 'Okuma', 15)
+    conn.commit()
+
+    result = data_io.import_file(conn, str(path), chunk_size=1)
+    assert (result.inserted, result.rejected) == (2, 2)
+    assert [line for line, _ in result.rejects] == [3, 5]
+    assert imported(conn)[1:] == [('2024-03-01', 'Okuma', 30, 'roman, bölüm 2'),
+                                  ('2024-03-03', 'Koşu', 20, None)]
+    assert database.verify_rollup(conn) == []
+    assert conn.execute("SELECT rowid FROM activities_fts WHERE activities_fts MATCH 'roman'"
+                        ).fetchall() == [(2,)]
+
+
+def test_import_gzipped_jsonl(conn, tmp_path):
+    path = tmp_path / 'kayitlar.jsonl.gz'
+    lines = [json.dumps({'date': '2024-03-01', 'activity': 'Okuma', 'duration': 30}),
+             '{bozuk',
+             json.dumps(['2024-03-01', 'Okuma', 30]),
+             json.dumps({'Tarih': '2024-03-02', 'Etkinlik': 'Yüzme', 'Süre (dk)': 40,
+                         'Notlar': 'havuz'}),
+             json.dumps({'date': '2024-03-03', 'activity': 'Yüzme', 'duration': 12.5})]
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+
+    progress = []
+    result = data_io.import_file(conn, str(path), progress=lambda done, total: progress.append(done))
+    assert (result.inserted, result.rejected) == (2, 3)
+    assert [line for line, _ in result.rejects] == [2, 3, 5]
+    assert imported(conn) == [('2024-03-01', 'Okuma', 30, None), ('2024-03-02', 'Yüzme', 40, 'havuz')]
+    assert progress and progress[-1] == path.stat().st_size
+
+
+def test_cancelled_import_rolls_back(conn, tmp_path):
+    path = tmp_path / 'kayitlar.csv'
+    path.write_text('date,activity,duration\n' + '2024-03-01,Okuma,30\n' * 5, encoding='utf-8')
+    with pytest.raises(data_io.ImportCancelled):
+        data_io.import_file(conn, str(path), progress=lambda done, total: False, chunk_size=2)
+    assert imported(conn) == []
+    assert database.verify_rollup(conn) == []
+    # Toplu yükleme için kaldırılan tetikleyiciler geri gelmiş olmalı
+    add_entry(conn, '2024-03-01', 'Okuma', 30)
+    assert database.verify_rollup(conn) == []
+
+
+def test_export_round_trips_through_import(conn, tmp_path):
+    add_entry(conn, '2024-03-01', 'Okuma', 30, 'satır\nsonu')
+    add_entry(conn, '2024-03-02', 'Koşu', 20)
+    conn.commit()
+    path = str(tmp_path / 'disari.csv.gz')
+    assert data_io.export_csv(conn, path, compress=True) == 2
+
+    other = database.connect(str(tmp_path / 'other.db'))
+    result = data_io.import_file(other, path)
+    assert (result.inserted, result.rejected) == (2, 0)
+    # CSV boş notu yokla ayırt edemez
+    def normalized(conn):
+        return sorted((date, activity, duration, notes or None)
+                      for date, activity, duration, notes in imported(conn))
+    assert normalized(other) == normalized(conn)
+    other.close()
@@ -0,0 +1,102 @@
+import sqlite3
+
+import pytest
+
+import database
+from conftest import add_entry
+
+
+def search(conn, text):
+    return sorted(row[0] for row in conn.execute(
+        "SELECT rowid FROM activities_fts WHERE activities_fts MATCH ?",
+        (database.fts_query(text),)))
+
+
+def test_triggers_keep_rollup_and_search_index_in_sync(conn):
+    first = add_entry(conn, '2024-03-01', 'Okuma', 30, 'roman bölümü')
+    second = add_entry(conn, '2024-03-01', 'Okuma', 45)
+    third = add_entry(conn, '2024-03-02', 'Koşu', 20, 'park turu')
+    conn.execute("UPDATE activity_entries SET duration = 50, notes = 'deneme yazısı' WHERE id = ?",
+                 (second,))
+    conn.execute("UPDATE activity_entries SET day = ? WHERE id = ?",
+                 (database.day_number('2024-03-03'), third))
+    conn.execute("DELETE FROM activity_entries WHERE id = ?", (first,))
+    conn.commit()
+
+    assert database.verify_rollup(conn) == []
+    assert conn.execute(
+        "SELECT date, activity, total_minutes, sessions FROM daily_activity_totals ORDER BY date"
+    ).fetchall() == [('2024-03-01', 'Okuma', 50, 1), ('2024-03-03', 'Koşu', 20, 1)]
+    assert search(conn, 'roman') == []
+    assert search(conn, 'deneme') == [second]
+    assert search(conn, 'kos') == [third]   # aksanlar yok sayılır, önek eşleşir
+    conn.execute("INSERT INTO activities_fts(activities_fts) VALUES ('integrity-check')")
+
+
+def test_verify_rollup_reports_drift(conn):
+    add_entry(conn, '2024-03-01', 'Okuma', 30)
+    conn.execute("UPDATE daily_totals SET total_minutes = 99")
+    assert [kind for kind, _ in database.verify_rollup(conn)] == ['eksik', 'fazla']
+    database.rebuild_rollup(conn)
+    assert database.verify_rollup(conn) == []
+
+
+def legacy_database(path, rows):
+    """Sürüm numarası öncesi şemada bir veritabanı oluştur"""
+    conn = sqlite3.connect(path)
+    conn.execute('''
+        CREATE TABLE activities (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT NOT NULL,
+            activity TEXT NOT NULL,
+            duration INTEGER NOT NULL,
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.executemany("INSERT INTO activities (date, activity, duration, notes) VALUES (?, ?, ?, ?)",
+                     rows)
+    conn.commit()
+    conn.close()
+
+
+def test_migration_from_legacy_schema(db_path):
+    legacy_database(db_path, [
+        ('2024-01-05', 'Okuma', 30, 'ilk gün'),
+        ('06.01.2024', 'Okuma', 15, None),
+        ('2024-01-06', 'Koşu', 40, 'sabah koşusu'),
+        ('2024-01-07', 'Koşu', 10, None),
+    ])
+    raw = sqlite3.connect(db_path)
+    raw.execute("DELETE FROM activities WHERE id = 4")   # silinen id yeniden kullanılmamalı
+    raw.commit()
+    raw.close()
+    assert database.needs_migration(db_path)
+
+    progress = []
+    conn = database.connect(db_path, progress=lambda done, total: progress.append((done, total)))
+    assert database.schema_version(conn) == database.SCHEMA_VERSION
+    assert progress[-1] == (3, 3)
+    assert conn.execute("SELECT id, date, activity, duration, notes FROM activities ORDER BY id"
+                        ).fetchall() == [(1, '2024-01-05', 'Okuma', 30, 'ilk gün'),
+                                         (2, '2024-01-06', 'Okuma', 15, None),
+                                         (3, '2024-01-06', 'Koşu', 40, 'sabah koşusu')]
+    assert database.verify_rollup(conn) == []
+    assert search(conn, 'sabah') == [3]
+
+    # Uyumluluk görünümüne yazmalar yeni tablolara aktarılır
+    conn.execute("INSERT INTO activities (date, activity, duration) VALUES ('2024-01-08', 'Yüzme', 25)")
+    assert conn.execute("SELECT MAX(id) FROM activity_entries").fetchone()[0] == 5
+    assert database.verify_rollup(conn) == []
+    conn.close()
+    assert not database.needs_migration(db_path)
+
+
+def test_migration_rejects_unreadable_dates(db_path):
+    legacy_database(db_path, [('2024-01-05', 'Okuma', 30, None), ('dün', 'Okuma', 15, None)])
+    with pytest.raises(database.MigrationError):
+        database.connect(db_path)
+    conn = sqlite3.connect(db_path)
+    assert database.schema_version(conn) == 1
+    assert conn.execute("SELECT COUNT(*) FROM activities").fetchone()[0] == 2
+    conn.close()
@@ -0,0 +1,97 @@
+import datetime
+import os
+
+import pytest
+
+import database
+import partitions
+from conftest import add_entry
+
+ROWS = [
+    ('2021-05-01', 'Okuma', 30, 'eski roman'),
+    ('2021-12-31', 'Koşu', 20, None),
+    ('2022-02-10', 'Okuma', 45, 'roman devamı'),
+    ('2022-07-04', 'Yüzme', 60, None),
+    ('2023-03-15', 'Okuma', 25, 'yeni roman'),
+]
+
+
+@pytest.fixture
+def filled(conn):
+    ids = [add_entry(conn, *row) for row in ROWS]
+    conn.commit()
+    return ids
+
+
+def totals(conn):
+    return partitions.sum_by_key(partitions.query(conn, '''
+        SELECT n.name, t.total_minutes, t.sessions
+        FROM {db}.daily_totals t JOIN {db}.activity_names n ON n.id = t.activity_id
+    '''))
+
+
+def all_records(conn, search=''):
+    return partitions.records_page(conn, search, limit=100)
+
+
+def test_archive_moves_a_year_and_queries_still_cover_it(conn, filled, db_path):
+    before = all_records(conn)
+    expected_totals = totals(conn)
+
+    assert partitions.archive_year(conn, 2021) == 2
+    assert partitions.archive_year(conn, 2022) == 2
+    path = partitions.partition_path(db_path, 2021)
+    assert partitions.list_partitions(conn) == [(2021, path),
+                                                (2022, partitions.partition_path(db_path, 2022))]
+    assert os.path.exists(path)
+    assert conn.execute("SELECT COUNT(*) FROM main.activity_entries").fetchone()[0] == 1
+
+    assert all_records(conn) == before
+    assert totals(conn) == expected_totals
+    assert [row[0] for row in all_records(conn, 'roman')] == [filled[4], filled[2], filled[0]]
+    # Tarih aralığının dışındaki bölümlere dokunulmaz
+    assert partitions.sources(conn, start_date='2022-01-01') == [
+        'main', (2022, partitions.partition_path(db_path, 2022))]
+
+
+def test_keyset_pages_span_main_and_partitions(conn, filled):
+    partitions.archive_year(conn, 2021)
+    pages, key = [], None
+    while True:
+        rows = partitions.records_page(conn, '', key, True, 2)
+        if not rows:
+            break
+        pages.append([row[0] for row in rows])
+        key = (rows[-1][1], rows[-1][0])
+    assert pages == [[filled[4], filled[3]], [filled[2], filled[1]], [filled[0]]]
+
+
+def test_merge_restores_the_year(conn, filled, db_path):
+    before = all_records(conn)
+    partitions.archive_year(conn, 2021)
+    path = partitions.partition_path(db_path, 2021)
+
+    partitions.merge_year(conn, 2021)
+    assert partitions.list_partitions(conn) == []
+    assert not os.path.exists(path)
+    assert all_records(conn) == before
+    assert database.verify_rollup(conn) == []
+    assert [row[0] for row in all_records(conn, 'eski')] == [filled[0]]
+
+
+def test_archive_is_resumable_and_rejects_the_current_year(conn, filled):
+    partitions.archive_year(conn, 2021)
+    # Yeniden çalıştırmak kopyalanmış kayıtları çoğaltmaz
+    assert partitions.archive_year(conn, 2021) == 0
+    assert len(all_records(conn)) == len(ROWS)
+    with pytest.raises(ValueError):
+        partitions.archive_year(conn, datetime.date.today().year)
+    with pytest.raises(ValueError):
+        partitions.merge_year(conn, 2020)
+
+
+def test_missing_partition_file_is_an_error(conn, filled, db_path):
+    partitions.archive_year(conn, 2021)
+    os.remove(partitions.partition_path(db_path, 2021))
+    with pytest.raises(FileNotFoundError):
+        all_records(conn)
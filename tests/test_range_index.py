@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+import database
+import partitions
+from conftest import add_entry
+from database import ChangeSet
+from range_index import FenwickTree, RangeIndex
+
+
+def test_fenwick_range_sums_match_brute_force():
+    rng = np.random.default_rng(7)
+    values = rng.integers(0, 100, size=(3, 37))
+    tree = FenwickTree(values)
+    for start in range(-2, 39):
+        for end in range(start - 1, 40):
+            expected = values[:, max(start, 0):max(end + 1, 0)].sum(axis=1)
+            assert (tree.range_sums(start, end) == expected).all(), (start, end)
+
+
+def test_fenwick_point_updates_and_row_growth():
+    rng = np.random.default_rng(11)
+    values = rng.integers(0, 10, size=(2, 20))
+    spare = np.zeros((1, 20), dtype=np.int64)
+    tree = FenwickTree(np.vstack((values, spare)), rows=2)
+    expected = values.copy()
+    assert len(tree.tree) == 2
+
+    for _ in range(5):
+        row = tree.add_row()
+        assert row == len(expected)
+        expected = np.vstack((expected, np.zeros((1, 20), dtype=np.int64)))
+        for _ in range(10):
+            row, index, delta = rng.integers(len(expected)), rng.integers(20), rng.integers(-5, 10)
+            tree.add(row, index, delta)
+            expected[row, index] += delta
+    # Kapasite satır başına değil katlanarak büyür: 3 -> 6 -> 12
+    assert len(tree.storage) == 12
+    for start in range(20):
+        for end in range(start, 20):
+            assert (tree.range_sums(start, end) == expected[:, start:end + 1].sum(axis=1)).all()
+
+
+def sql_totals(conn, start_date, end_date):
+    return sorted((name, minutes, sessions) for name, (minutes, sessions) in partitions.sum_by_key(
+        partitions.query(conn, '''
+        SELECT n.name, SUM(t.total_minutes), SUM(t.sessions)
+        FROM {db}.daily_totals t JOIN {db}.activity_names n ON n.id = t.activity_id
+        WHERE t.day BETWEEN ? AND ? GROUP BY n.name
+    ''', (database.day_number(start_date), database.day_number(end_date)))).items())
+
+
+@pytest.mark.parametrize('start_date, end_date', [
+    ('2021-01-01', '2024-12-31'), ('2021-06-01', '2022-06-30'), ('2023-01-01', '2023-01-01'),
+    ('2019-01-01', '2020-12-31'),
+])
+def test_range_index_matches_daily_totals_across_partitions(conn, start_date, end_date):
+    rng = np.random.default_rng(3)
+    names = ['Okuma', 'Koşu', 'Yüzme']
+    first = database.day_number('2021-01-01')
+    for _ in range(300):
+        day = database.day_string(first + int(rng.integers(0, 4 * 365)))
+        add_entry(conn, day, names[rng.integers(len(names))], int(rng.integers(5, 120)))
+    conn.commit()
+    partitions.archive_year(conn, 2021)
+
+    index = RangeIndex().load(conn, today=database.EPOCH)
+    assert index.first_date >= database.EPOCH
+    assert sorted(index.range_totals(start_date, end_date)) == sql_totals(conn, start_date, end_date)
+
+
+def test_range_index_applies_changes(conn):
+    record = add_entry(conn, '2024-03-01', 'Okuma', 30)
+    conn.commit()
+    index = RangeIndex().load(conn, today='2024-03-10')
+
+    index.apply(ChangeSet().insert((99, '2024-03-05', 'Yeni', 40)))
+    index.apply(ChangeSet().delete((record, '2024-03-01', 'Okuma', 30)))
+    assert index.range_totals('2024-03-01', '2024-03-31') == [('Yeni', 40, 1)]
+
+    # Yüklenen aralıktan önceki bir tarih indeksi geçersiz kılar
+    index.apply(ChangeSet().insert((100, '2020-01-01', 'Okuma', 10)))
+    assert not index.loaded
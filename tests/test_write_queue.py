@@ -0,0 +1,135 @@
+import sqlite3
+
+import pytest
+
+from conftest import add_entry
+from write_queue import WriteQueue, WritesHeld
+
+
+class FakeRoot:
+    """Tk'nin after/after_cancel'ı: zamanlayıcılar run() ile elle çalıştırılır"""
+
+    def __init__(self):
+        self.timers = {}
+        self.next_id = 0
+
+    def after(self, delay, callback):
+        self.next_id += 1
+        self.timers[self.next_id] = (delay, callback)
+        return self.next_id
+
+    def after_cancel(self, timer_id):
+        self.timers.pop(timer_id, None)
+
+    def run(self):
+        timers, self.timers = self.timers, {}
+        for _, callback in timers.values():
+            callback()
+
+
+class Connections:
+    def __init__(self, writer):
+        self.writer = writer
+
+
+@pytest.fixture
+def queue(conn):
+    return WriteQueue(FakeRoot(), Connections(conn), delay_ms=200, max_pending=3)
+
+
+def count(db_path):
+    reader = sqlite3.connect(db_path)
+    try:
+        return reader.execute("SELECT COUNT(*) FROM activity_entries").fetchone()[0]
+    finally:
+        reader.close()
+
+
+def insert(queue, duration, **callbacks):
+    return queue.execute("INSERT INTO activity_entries (day, activity_id, duration) VALUES (1, 1, ?)",
+                         (duration,), **callbacks)
+
+
+def test_writes_are_committed_together_by_the_timer(queue, conn, db_path):
+    add_entry(conn, '2024-01-01', 'Okuma', 10)
+    conn.commit()
+    committed = []
+    insert(queue, 5, on_commit=lambda: committed.append(1))
+    insert(queue, 6, on_commit=lambda: committed.append(2))
+    assert count(db_path) == 1 and committed == []
+    assert [delay for delay, _ in queue.root.timers.values()] == [200]
+
+    queue.root.run()
+    assert count(db_path) == 3
+    assert committed == [1, 2]
+    assert queue.commits == 1 and not queue.has_pending
+
+
+def test_size_limit_flushes_on_the_next_event_loop_turn(queue, conn, db_path):
+    add_entry(conn, '2024-01-01', 'Okuma', 10)
+    conn.commit()
+    committed = []
+    insert(queue, 5)
+    insert(queue, 6)
+    cursor = insert(queue, 7, on_commit=lambda: committed.append(cursor.lastrowid))
+    # Geri çağrı execute içinde çalışmaz; çağıran önce imleci kullanabilir
+    assert committed == [] and cursor.lastrowid == 4
+    assert [delay for delay, _ in queue.root.timers.values()] == [0]
+
+    queue.root.run()
+    assert count(db_path) == 4
+    assert committed == [4]
+
+
+def test_failing_commit_callback_does_not_drop_the_others(queue, monkeypatch):
+    errors = []
+    monkeypatch.setattr('instrumentation.log_error', lambda message, error: errors.append(error))
+    committed = []
+
+    def broken():
+        raise RuntimeError("görünüm yenilenemedi")
+
+    insert(queue, 5, on_commit=broken)
+    insert(queue, 6, on_commit=lambda: committed.append(6))
+    assert queue.flush() is True
+    assert committed == [6]
+    assert [str(e) for e in errors] == ["görünüm yenilenemedi"]
+
+
+def test_failed_statement_rolls_back_only_itself(queue, db_path):
+    insert(queue, 5)
+    with pytest.raises(sqlite3.IntegrityError):
+        insert(queue, None)
+    assert queue.flush() is True
+    assert count(db_path) == 1
+
+
+def test_failed_commit_rolls_back_and_reports_each_handler_once(queue, conn, db_path):
+    reported = []
+    other = []
+    conn.execute("CREATE TABLE checks (value INTEGER "
+                 "REFERENCES activity_entries(id) DEFERRABLE INITIALLY DEFERRED)")
+    conn.commit()
+    conn.execute("PRAGMA foreign_keys = ON")
+    add_entry(conn, '2024-01-01', 'Okuma', 10)
+    conn.commit()
+    insert(queue, 5, on_error=reported.append)
+    queue.execute("INSERT INTO checks (value) VALUES (999)", on_error=reported.append)
+    queue.execute("INSERT INTO checks (value) VALUES (998)", on_error=other.append)
+
+    assert queue.flush() is False
+    assert len(reported) == 1 and isinstance(reported[0], sqlite3.IntegrityError)
+    assert len(other) == 1
+    assert count(db_path) == 1 and not conn.in_transaction
+
+
+def test_held_queue_rejects_writes(queue, db_path):
+    insert(queue, 5)
+    queue.hold("içe aktarma")
+    assert count(db_path) == 1
+    with pytest.raises(WritesHeld):
+        insert(queue, 6)
+    queue.release()
+    insert(queue, 6)
+    assert queue.flush() is True
+    assert count(db_path) == 2
@@ -0,0 +1,128 @@
+"""Yazma işlemlerini gruplayarak onaylayan (group commit) yazma kuyruğu"""
+import instrumentation
+
+
+class WritesHeld(Exception):
+    """Başka bir bağlantı yazma kilidini tuttuğu için yazmalar bekletiliyor"""
+
+
+class WriteQueue:
+    """Değişiklikleri yazma bağlantısında toplayıp zaman/boyut penceresiyle onayla
+
+    Her ifade hemen, açık tutulan bir işlem içinde kendi SAVEPOINT'i ile
+    çalıştırılır; böylece hatalar (kısıt ihlali, kilit) çağırana anında
+    yükseltilir ve yalnızca o ifade geri alınır. İşlem, ilk bekleyen
+    değişiklikten delay_ms sonra ya da max_pending ifade birikince (bir
+    sonraki olay döngüsü turunda) tek bir COMMIT ile onaylanır; geri
+    çağrılar hiçbir zaman execute içinden, çağıran imleci kullanmadan önce
+    çalışmaz. Her ifadenin on_commit geri çağrısı bu onaydan sonra
+    çağrılır; diğer bağlantılardan okuyan görünümler ancak o zaman yeni
+    veriyi görebildiğinden yenilemeler oraya bağlanmalıdır.
+
+    Bağlantı her seferinde ConnectionManager'dan alınır; geri yüklemeden
+    sonra yeniden açılan yazma bağlantısı böylece kendiliğinden kullanılır.
+
+    Arka plandaki toplu içe aktarma kendi bağlantısında yazma kilidini
+    baştan sona tutar; bu sırada Tk iş parçacığından yazmak meşgul zaman
+    aşımı boyunca arayüzü dondurup sonra hata verirdi. hold() ile yazmalar
+    o süre için bekletilir ve execute hemen WritesHeld yükseltir.
+    """
+
+    def __init__(self, root, connections, delay_ms=200, max_pending=50):
+        self.root = root
+        self.connections = connections
+        self.delay_ms = delay_ms
+        self.max_pending = max_pending
+
+        self.pending = []         # (on_commit, on_error)
+        self.timer_id = None
+        self.held = None          # Yazmaları bekleten işin adı
+        self.commits = 0
+        self.statements = 0
+
+    def execute(self, sql, params=(), on_commit=None, on_error=None):
+        """İfadeyi bekleyen işleme ekle ve imlecini döndür
+
+        İfade başarısız olursa yalnızca kendi değişiklikleri geri alınır ve
+        hata yükseltilir; bekleyen diğer ifadeler etkilenmez.
+        """
+        if self.held is not None:
+            raise WritesHeld(f"{self.held} sürerken değişiklik kaydedilemez")
+        if not self.conn.in_transaction:
+            self.conn.execute("BEGIN")
+        self.conn.execute("SAVEPOINT write_queue")
+        try:
+            cursor = self.conn.execute(sql, params)
+        except BaseException:
+            self.conn.execute("ROLLBACK TO write_queue")
+            self.conn.execute("RELEASE write_queue")
+            if not self.pending:
+                self.conn.rollback()
+            raise
+        self.conn.execute("RELEASE write_queue")
+
+        self.pending.append((on_commit, on_error))
+        self.statements += 1
+        if len(self.pending) >= self.max_pending:
+            if self.timer_id is not None:
+                self.root.after_cancel(self.timer_id)
+            self.timer_id = self.root.after(0, self.flush)
+        elif self.timer_id is None:
+            self.timer_id = self.root.after(self.delay_ms, self.flush)
+        return cursor
+
+    def flush(self):
+        """Bekleyen değişiklikleri hemen onayla
+
+        Onay başarılıysa True döner ve on_commit geri çağrıları çalışır;
+        başarısızsa işlem geri alınır, farklı on_error geri çağrılarının her
+        biri hatayla bir kez çağrılır (aynı işleyiciyle kuyruğa giren N yazma
+        için N hata penceresi açılmaz) ve False döner.
+        """
+        if self.timer_id is not None:
+            self.root.after_cancel(self.timer_id)
+            self.timer_id = None
+        if not self.pending:
+            return True
+
+        pending, self.pending = self.pending, []
+        try:
+            with instrumentation.timed("yazma grubu onayı"):
+                self.conn.commit()
+        except Exception as e:
+            self.conn.rollback()
+            handlers = []
+            for _, on_error in pending:
+                if on_error is not None and on_error not in handlers:
+                    handlers.append(on_error)
+            for on_error in handlers:
+                on_error(e)
+            if not handlers:
+                print(f"Yazma onay hatası: {e}")
+            return False
+
+        self.commits += 1
+        # Bir geri çağrının hatası gruptaki diğer görünümlerin yenilenmesini engellemesin
+        for on_commit, _ in pending:
+            if on_commit is not None:
+                try:
+                    on_commit()
+                except Exception as e:
+                    instrumentation.log_error("Yazma onayı geri çağrısı başarısız", e)
+        return True
+
+    def hold(self, reason):
+        """Bekleyenleri onayla ve release() çağrılana kadar yeni yazmaları reddet"""
+        self.flush()
+        self.held = reason
+
+    def release(self):
+        self.held = None
+
+    @property
+    def conn(self):
+        return self.connections.writer
+
+    @property
+    def has_pending(self):
+        return bool(self.pending)